@@ -3,6 +3,18 @@ Created by Analitika at 05/02/2025
 contact@analitika.fr
 """
 
-from aws.aws_storage import S3Manager
+from aws.async_storage import AsyncS3Manager
+from aws.aws_storage import S3Manager, S3Object
+from aws.disk_cache import S3DiskCache
+from aws.range_reader import S3RangeReader
+from aws.transfer import TransferProgress, TransferReport
 
-__all__ = ["S3Manager"]
+__all__ = [
+    "AsyncS3Manager",
+    "S3DiskCache",
+    "S3Manager",
+    "S3Object",
+    "S3RangeReader",
+    "TransferProgress",
+    "TransferReport",
+]
@@ -0,0 +1,247 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Asyncio front-end of S3Manager.
+
+Every call runs the synchronous S3Manager method on a thread pool owned by the manager, so
+the event loop is never blocked, and all coroutines share one boto3 client and therefore one
+connection pool. A semaphore caps the number of S3Manager calls running at once, which makes
+plain ``asyncio.gather`` fan-outs of single-object calls safe: each of them sends one request
+at a time. Bulk calls (folder copies, renames, uploads and deletes, download_large_file) run
+their own pool of ``max_workers`` threads inside that call, so with several of them running
+up to ``max_concurrency * max_workers`` requests can be in flight; pass a smaller
+``max_workers`` to them to stay within a budget. download_folder runs one call per file and
+stays within ``max_concurrency``. Return values and error semantics (0/1 status codes, None
+for missing keys, TransferReport for bulk operations) are those of S3Manager.
+
+    async with AsyncS3Manager() as s3:
+        contents = await s3.download_many(["a.json", "b.json"], "folder")
+"""
+# External imports
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
+
+import pandas as pd
+from botocore.exceptions import BotoCoreError, ClientError
+from loguru import logger
+
+# Internal imports
+from aws.aws_storage import S3Manager
+from aws.transfer import DEFAULT_MAX_WORKERS, ProgressCallback, TransferProgress, TransferReport
+
+T = TypeVar("T")
+
+
+class AsyncS3Manager:
+    def __init__(
+        self, s3_manager: S3Manager | None = None, max_concurrency: int = DEFAULT_MAX_WORKERS
+    ) -> None:
+        """
+        Initialize the AsyncS3Manager.
+        :param s3_manager: The S3Manager to delegate to; a new one is created by default
+        :param max_concurrency: Number of S3Manager calls run at the same time
+        """
+        self.s3_manager = s3_manager or S3Manager()
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="async-s3"
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self) -> AsyncS3Manager:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Wait for running calls to finish and release the threads.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking call on the manager's thread pool, within the concurrency limit.
+        """
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def upload_json_file(self, file_name: str, data: Any, folder: str, **kwargs: Any) -> int:
+        return await self._run(self.s3_manager.upload_json_file, file_name, data, folder, **kwargs)
+
+    async def upload_json_lines(
+        self, file_name: str, records: Iterable[Any], folder: str, **kwargs: Any
+    ) -> int:
+        return await self._run(
+            self.s3_manager.upload_json_lines, file_name, records, folder, **kwargs
+        )
+
+    async def download_json(self, file_name: str, folder: str, **kwargs: Any) -> Any | None:
+        return await self._run(self.s3_manager.download_json, file_name, folder, **kwargs)
+
+    async def upload_dataframe(
+        self, df: pd.DataFrame, file_name: str, folder: str, **kwargs: Any
+    ) -> int:
+        return await self._run(self.s3_manager.upload_dataframe, df, file_name, folder, **kwargs)
+
+    async def download_dataframe(
+        self, file_name: str, folder: str, **kwargs: Any
+    ) -> pd.DataFrame | None:
+        return await self._run(self.s3_manager.download_dataframe, file_name, folder, **kwargs)
+
+    async def read_range(
+        self, file_name: str, folder: str, start: int, end: int | None = None
+    ) -> bytes | None:
+        return await self._run(self.s3_manager.read_range, file_name, folder, start, end)
+
+    async def upload_to_s3(self, file_name: str, data: Any, folder: str, **kwargs: Any) -> int:
+        return await self._run(self.s3_manager.upload_to_s3, file_name, data, folder, **kwargs)
+
+    async def download_from_s3(self, file_name: str, folder: str, **kwargs: Any) -> Any:
+        return await self._run(self.s3_manager.download_from_s3, file_name, folder, **kwargs)
+
+    async def download_many(self, file_names: Iterable[str], folder: str) -> list[Any]:
+        """
+        Download several files of a folder concurrently.
+        :return: The contents in the order of ``file_names``, None for missing files
+        """
+        contents: list[Any] = await asyncio.gather(
+            *(self.download_from_s3(file_name, folder) for file_name in file_names)
+        )
+        return contents
+
+    async def download_to_file(
+        self, file_name: str, folder: str, local_path: str, **kwargs: Any
+    ) -> str | None:
+        return await self._run(
+            self.s3_manager.download_to_file, file_name, folder, local_path, **kwargs
+        )
+
+    async def download_large_file(
+        self, file_name: str, folder: str, local_path: str, **kwargs: Any
+    ) -> str | None:
+        return await self._run(
+            self.s3_manager.download_large_file, file_name, folder, local_path, **kwargs
+        )
+
+    async def delete_object_from_s3(self, file_name: str, folder: str) -> int:
+        return await self._run(self.s3_manager.delete_object_from_s3, file_name, folder)
+
+    async def delete_many(self, keys: Iterable[str], **kwargs: Any) -> TransferReport:
+        return await self._run(self.s3_manager.delete_many, list(keys), **kwargs)
+
+    async def delete_prefix(self, folder: str, **kwargs: Any) -> TransferReport:
+        return await self._run(self.s3_manager.delete_prefix, folder, **kwargs)
+
+    async def check_file_exists(self, key: str) -> bool:
+        return await self._run(self.s3_manager.check_file_exists, key)
+
+    async def check_files_exist(self, keys: Iterable[str], prefix: str | None = None) -> set[str]:
+        return await self._run(self.s3_manager.check_files_exist, list(keys), prefix)
+
+    async def get_available_files(self, folder: str) -> list[str]:
+        return await self._run(self.s3_manager.get_available_files, folder)
+
+    async def iter_files(self, folder: str, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Asynchronously iterate over the files of a folder, one listing page at a time.
+        Accepts the same options as S3Manager.iter_files.
+        """
+        files = self.s3_manager.iter_files(folder, **kwargs)
+        while page := await self._run(lambda: list(itertools.islice(files, 1000))):
+            for file_ in page:
+                yield file_
+
+    async def copy_s3_folder(
+        self, old_folder: str, new_folder: str, **kwargs: Any
+    ) -> TransferReport:
+        return await self._run(self.s3_manager.copy_s3_folder, old_folder, new_folder, **kwargs)
+
+    async def upload_folder(
+        self, folder_path: str, aws_path: str, **kwargs: Any
+    ) -> TransferReport:
+        return await self._run(self.s3_manager.upload_folder, folder_path, aws_path, **kwargs)
+
+    async def rename_s3_folder(
+        self, old_folder: str, new_folder: str, **kwargs: Any
+    ) -> TransferReport:
+        return await self._run(self.s3_manager.rename_s3_folder, old_folder, new_folder, **kwargs)
+
+    async def download_folder(
+        self,
+        folder_path: str,
+        aws_path: str,
+        max_in_flight: int | None = None,
+        progress_callback: ProgressCallback | None = None,
+    ) -> TransferReport:
+        """
+        Download every file of an S3 folder to a local folder, as concurrent tasks.
+        Files are streamed to disk and retried like in S3Manager.download_folder.
+        :param folder_path: The local folder where the files will be saved
+        :param aws_path: The folder within the S3 bucket to download
+        :param max_in_flight: Cap on tasks created but not yet finished
+        :param progress_callback: Called with a TransferProgress after every file
+        :return: TransferReport with downloaded keys and failed keys with their error
+        """
+        max_in_flight = max_in_flight or 2 * self.max_concurrency
+        report = TransferReport()
+        start = time.perf_counter()
+        pending: set[asyncio.Task[int]] = set()
+
+        async def download(file_: str) -> int:
+            try:
+                transferred = await self._run(
+                    self.s3_manager._download_to_local, file_, aws_path, folder_path
+                )
+            except Exception as e:
+                report.failed[file_] = str(e)
+                return 0
+            report.succeeded.append(file_)
+            report.bytes_transferred += transferred
+            return transferred
+
+        def notify(_: asyncio.Task[int]) -> None:
+            if progress_callback is not None:
+                progress_callback(
+                    TransferProgress(
+                        completed=len(report.succeeded),
+                        failed=len(report.failed),
+                        total=None,
+                        bytes_transferred=report.bytes_transferred,
+                        elapsed=time.perf_counter() - start,
+                    )
+                )
+
+        try:
+            async for file_ in self.iter_files(aws_path):
+                if len(pending) >= max_in_flight:
+                    _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                task = asyncio.create_task(download(file_))
+                task.add_done_callback(notify)
+                pending.add(task)
+        except (ClientError, BotoCoreError) as e:  # BotoCoreError: connection errors
+            logger.error(f"Error listing folder {aws_path}: {str(e)}")
+            report.failed[aws_path] = str(e)
+        finally:
+            # Downloads already started finish, whatever stopped the listing
+            if pending:
+                await asyncio.wait(pending)
+
+        report.elapsed = time.perf_counter() - start
+        for file_, error in report.failed.items():
+            logger.error(f"Failed to download '{aws_path}/{file_}': {error}")
+        logger.info(
+            f"Downloaded {len(report.succeeded)}/{len(report.succeeded) + len(report.failed)} "
+            f"files from '{aws_path}' ({report.bytes_transferred} bytes in {report.elapsed:.2f}s)"
+        )
+        return report
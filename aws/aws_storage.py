@@ -6,52 +6,357 @@ contact@analitika.fr
 from __future__ import annotations
 
 import gzip
-import json
+import mimetypes
 import os
 import pickle  # nosec B403 - Used only for internal data, not user input
-from io import BytesIO
-from typing import Any
+import shutil
+import threading
+import zlib
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import closing
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Literal, overload
 
-import boto3  # AWS SDK for Python
 import pandas as pd
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 from loguru import logger
 from PIL import Image
 
 # Internal imports
+from aws import codec_registry
+from aws.client import get_s3_client
+from aws.codec_registry import CodecError
+from aws.dataframe_io import (
+    DATAFRAME_CONTENT_TYPES,
+    DEFAULT_COMPRESSION,
+    DEFAULT_ROW_GROUP_SIZE,
+    Compression,
+    Filters,
+    dataframe_format,
+    dataframe_to_bytes,
+    read_dataframe,
+)
+from aws.disk_cache import S3DiskCache
+from aws.json_io import (
+    JsonDecoder,
+    JsonEncoder,
+    decode_json_lines,
+    encode_json,
+    encode_json_lines,
+    gunzip_if_compressed,
+    iter_lines,
+    json_decoder,
+)
+from aws.listing import DEFAULT_LIST_WORKERS, iter_objects, iter_objects_sharded, list_pages
+from aws.memo_cache import DecodedObjectCache, get_memo_cache
+from aws.metrics import S3Metrics, get_metrics, instrumented
+from aws.multipart import (
+    DEFAULT_MULTIPART_THRESHOLD,
+    DEFAULT_PART_SIZE,
+    DEFAULT_PART_WORKERS,
+    MAX_COPY_SIZE,
+    MultipartUploadError,
+    UploadSource,
+    copy_object,
+    is_upload_source,
+    local_etag,
+    upload_object,
+)
+from aws.range_reader import S3RangeReader
+from aws.ranged_download import (
+    DEFAULT_RANGE_SIZE,
+    DEFAULT_RANGE_WORKERS,
+    RangedDownloadError,
+    download_in_ranges,
+)
+from aws.transfer import (
+    DEFAULT_BACKOFF,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_WORKERS,
+    ProgressCallback,
+    TransferProgress,
+    TransferReport,
+    batched,
+    call_with_retry,
+    run_concurrently,
+)
 from config import settings
 
+DELETE_BATCH_SIZE = 1000  # most keys DeleteObjects accepts in one request
+DEFAULT_DELETE_WORKERS = 4
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson", ".jsonl.gz", ".ndjson.gz")
+RAW_CODECS = ("raw", "memoryview")
+NOT_MODIFIED_ERROR_CODES = ("304", "NotModified")  # how botocore reports a 304 to a GET
+# What download_from_s3 returns with the built-in codecs of aws.codec_registry
+DecodedContent = bytes | memoryview | str | pd.DataFrame | Image.Image
+
+
+@dataclass(frozen=True)
+class S3Object:
+    """
+    A file listed in an S3 folder, with the metadata returned by the listing.
+    """
+
+    name: str  # relative to the listed folder
+    key: str
+    size: int
+    etag: str
+    last_modified: datetime
+
 
 class S3Manager:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        s3_client: Any | None = None,
+        cache: S3DiskCache | None = None,
+        memo_cache: DecodedObjectCache | None = None,
+        metrics: S3Metrics | None = None,
+    ) -> None:
         """
         Initialize the S3Manager with AWS credentials.
+        By default the process-wide client of aws.client is used, so creating many managers
+        reuses one session, one credential lookup and one pool of open connections.
+        :param s3_client: A specific boto3 S3 client to use instead of the shared one
+        :param cache: Local disk cache for download_from_s3; defaults to one in
+            settings.S3_CACHE_DIR when that setting is defined
+        :param memo_cache: In-memory cache of decoded contents; the process-wide one by default
+        :param metrics: Collector of per-operation metrics; the process-wide one when
+            settings.S3_METRICS or settings.S3_SLOW_OPERATION_SECONDS is set, none otherwise
         """
-        self.s3_client = boto3.Session(
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION,
-        ).client("s3")
+        self.s3_client = s3_client if s3_client is not None else get_s3_client()
+        if cache is None and settings.S3_CACHE_DIR:
+            cache = S3DiskCache(settings.S3_CACHE_DIR, settings.S3_CACHE_MAX_BYTES)
+        self.cache = cache
+        self.memo_cache = memo_cache if memo_cache is not None else get_memo_cache()
+        if metrics is None and (settings.S3_METRICS or settings.S3_SLOW_OPERATION_SECONDS):
+            metrics = get_metrics()
+        self.metrics = metrics
+
+    @property
+    def _bucket(self) -> str:
+        # An unset AWS_BUCKET reaches boto3 as an empty name, rejected like None would be
+        return settings.S3_BUCKET_NAME or ""
 
-    def upload_json_file(self, file_name: str, data: dict, folder: str) -> int:
+    @instrumented()
+    def upload_json_file(
+        self,
+        file_name: str,
+        data: Any,
+        folder: str,
+        indent: int | None = 4,
+        compress: bool = False,
+        encoder: JsonEncoder | None = None,
+    ) -> int:
         """
         Upload a JSON file to an AWS S3 bucket.
-        :param file_name: The name of the file to be saved in S3 (without extension)
+        :param file_name: The name of the file to be saved in S3 (with extension)
         :param data: The data to be serialized and uploaded
         :param folder: The folder within the S3 bucket where the file will be stored
+        :param indent: Spaces per indentation level; None for compact output, 30 to 50%
+            smaller, encoded with orjson when it is installed
+        :param compress: Gzip the payload and store it with ContentEncoding gzip
+        :param encoder: Callable turning ``data`` into JSON bytes, replacing the default one
         :return: int status code (0 for success, 1 for failure)
         """
         try:
-            json_data = json.dumps(data, indent=4)
             s3_file_key = f"{folder}/{file_name}"
-            self.s3_client.put_object(
-                Bucket=settings.S3_BUCKET_NAME, Key=s3_file_key, Body=json_data
+            upload_object(
+                self.s3_client,
+                self._bucket,
+                s3_file_key,
+                encode_json(data, indent, compress, encoder),
+                content_type="application/json",
+                content_encoding="gzip" if compress else None,
             )
             return 0
-        except ClientError as e:
+        except (ClientError, MultipartUploadError, TypeError, ValueError) as e:
+            logger.error(str(e))
+            return 1
+
+    @instrumented()
+    def upload_json_lines(
+        self,
+        file_name: str,
+        records: Iterable[Any],
+        folder: str,
+        compress: bool = False,
+        encoder: JsonEncoder | None = None,
+    ) -> int:
+        """
+        Upload records as a JSON Lines file, one compact record per line. The records are
+        encoded and uploaded as a stream (a multipart upload once past the threshold), so
+        a generator over a large export is never held in memory.
+        :param file_name: The name of the file to be saved in S3, e.g. "export.jsonl"
+        :param records: Any iterable of JSON-serializable records
+        :param folder: The folder within the S3 bucket where the file will be stored
+        :param compress: Gzip the stream and store it with ContentEncoding gzip
+        :param encoder: Callable turning a record into compact JSON bytes
+        :return: int status code (0 for success, 1 for failure)
+        """
+        try:
+            upload_object(
+                self.s3_client,
+                self._bucket,
+                f"{folder}/{file_name}",
+                encode_json_lines(records, compress, encoder),
+                content_type="application/x-ndjson",
+                content_encoding="gzip" if compress else None,
+            )
+            return 0
+        except (ClientError, MultipartUploadError, TypeError, ValueError) as e:
             logger.error(str(e))
             return 1
 
+    @instrumented()
+    def download_json(
+        self, file_name: str, folder: str, decoder: JsonDecoder | None = None
+    ) -> Any | None:
+        """
+        Download and parse a JSON or JSON Lines file, gzipped or not.
+        :param file_name: The name of the file; ".jsonl" and ".ndjson" files are JSON Lines
+        :param folder: The folder within the S3 bucket where the file is stored
+        :param decoder: Callable parsing JSON bytes, replacing the default one
+        :return: The parsed value, the list of records for JSON Lines, or None on failure
+        """
+        s3_file_key = f"{folder}/{file_name}"
+        try:
+            content, _ = self._fetch_object(s3_file_key)
+            if file_name.endswith(JSON_LINES_EXTENSIONS):
+                return decode_json_lines(content, decoder)
+            return (decoder or json_decoder())(gunzip_if_compressed(content))
+        except ClientError as e:
+            logger.error(f"Failed to download '{s3_file_key}': {e}")
+            return None
+        except (ValueError, zlib.error, gzip.BadGzipFile) as e:  # corrupt JSON or gzip data
+            logger.error(f"Error parsing JSON file {s3_file_key}: {str(e)}")
+            return None
+
+    @instrumented()
+    def iter_json_lines(
+        self, file_name: str, folder: str, decoder: JsonDecoder | None = None
+    ) -> Iterator[Any]:
+        """
+        Stream the records of a JSON Lines file, gzipped or not, without loading it whole.
+        :param file_name: The name of the file
+        :param folder: The folder within the S3 bucket where the file is stored
+        :param decoder: Callable parsing one JSON record, replacing the default one
+        :return: Iterator over the records
+        """
+        decode = decoder or json_decoder()
+        response = call_with_retry(
+            self.s3_client.get_object, Bucket=settings.S3_BUCKET_NAME, Key=f"{folder}/{file_name}"
+        )
+        with closing(response["Body"]) as body:
+            for line in iter_lines(iter(lambda: body.read(DEFAULT_CHUNK_SIZE), b"")):
+                yield decode(line)
+
+    def _list_pages(self, prefix: str, delimiter: str | None = None) -> Iterator[dict[str, Any]]:
+        """
+        Yield the raw ``list_objects_v2`` responses for a prefix, following pagination.
+        """
+        return list_pages(self.s3_client, self._bucket, prefix, delimiter=delimiter)
+
+    def _iter_objects(self, prefix: str) -> Iterator[dict[str, Any]]:
+        """
+        Yield the listing entries (Key, Size, ETag, LastModified) of every object under a
+        prefix, page by page.
+        """
+        return iter_objects(self.s3_client, self._bucket, prefix)
+
+    @overload
+    def iter_files(
+        self,
+        folder: str,
+        include_metadata: Literal[False] = ...,
+        sharded: bool = ...,
+        alphabet: str | None = ...,
+        max_workers: int = ...,
+    ) -> Generator[str, None, None]:
+        ...
+
+    @overload
+    def iter_files(
+        self,
+        folder: str,
+        include_metadata: Literal[True],
+        sharded: bool = ...,
+        alphabet: str | None = ...,
+        max_workers: int = ...,
+    ) -> Generator[S3Object, None, None]:
+        ...
+
+    @instrumented()
+    def iter_files(
+        self,
+        folder: str,
+        include_metadata: bool = False,
+        sharded: bool = False,
+        alphabet: str | None = None,
+        max_workers: int = DEFAULT_LIST_WORKERS,
+    ) -> Generator[str | S3Object, None, None]:
+        """
+        Lazily list the files of a folder within an AWS S3 bucket.
+        Names are yielded as soon as each page of 1000 keys arrives, so callers can start
+        working before the listing is over and memory does not grow with the folder size.
+
+        Each page needs the continuation token of the previous one, so a plain listing runs
+        at one page per round trip. For folders with millions of keys ``sharded=True``
+        splits the folder into key ranges, at its subfolders or at the characters of
+        ``alphabet``, lists them concurrently and yields the merged result in key order.
+        :param folder: The folder within the S3 bucket
+        :param include_metadata: Yield S3Object entries with size, ETag and LastModified
+            instead of plain file names
+        :param sharded: List key ranges of the folder concurrently
+        :param alphabet: Characters at which to split the folder, e.g. "0123456789abcdef" for
+            hash-named keys; by default the subfolders found by a Delimiter probe are used
+        :param max_workers: Number of shards listed concurrently
+        :return: Iterator over the file names (relative to the folder) or S3Object entries;
+            close it when stopping early to stop the listing of a sharded folder
+        """
+        # The trailing slash keeps sibling folders sharing the name's start (reports_old
+        # for reports) out of the listing
+        prefix = f"{folder}/"
+        if sharded:
+            objects = iter_objects_sharded(
+                self.s3_client,
+                self._bucket,
+                prefix,
+                alphabet=alphabet,
+                max_workers=max_workers,
+            )
+        else:
+            objects = self._iter_objects(prefix)
+        for obj in objects:
+            filename = obj["Key"][len(prefix) :]
+            if not filename:
+                continue
+            if include_metadata:
+                yield S3Object(
+                    name=filename,
+                    key=obj["Key"],
+                    size=obj["Size"],
+                    etag=obj["ETag"],
+                    last_modified=obj["LastModified"],
+                )
+            else:
+                yield filename
+
+    @instrumented()
+    def iter_subfolders(self, folder: str) -> Iterator[str]:
+        """
+        Lazily list the direct subfolders of a folder, using a Delimiter listing so the
+        files they contain are never transferred.
+        :param folder: The folder within the S3 bucket
+        :return: Iterator over the subfolder names, relative to the folder
+        """
+        for response in self._list_pages(f"{folder}/", delimiter="/"):
+            for common_prefix in response.get("CommonPrefixes", []):
+                yield common_prefix["Prefix"][len(folder) + 1 :].rstrip("/")
+
+    @instrumented()
     def get_available_files(self, folder: str) -> list[str]:
         """
         List all files in a specific folder within an AWS S3 bucket.
@@ -60,66 +365,63 @@ class S3Manager:
         """
         files = []
         try:
-            is_truncated = True  # Pagination flag
-            continuation_token = None  # Continuation token for pagination
-            list_kwargs = {
-                "Bucket": settings.S3_BUCKET_NAME,
-                "Prefix": folder,
-                "MaxKeys": 1000,  # Set to 1000 (AWS limit per request)
-                "ContinuationToken": continuation_token,
-            }
-
-            while is_truncated:
-                list_kwargs["ContinuationToken"] = continuation_token
-                if list_kwargs["ContinuationToken"] is None:
-                    list_kwargs.pop("ContinuationToken", None)
-
-                response = self.s3_client.list_objects_v2(**list_kwargs)
-
-                if "Contents" in response:
-                    for file in response["Contents"]:
-                        filename = file["Key"][len(folder) + 1 :]
-                        if filename:
-                            files.append(filename)
-
-                # Check if more files are available
-                is_truncated = response.get("IsTruncated", False)
-
-                # Update continuation token if more files are available
-                continuation_token = response.get("NextContinuationToken", None)
-
+            for filename in self.iter_files(folder):
+                files.append(filename)
         except ClientError as e:
             logger.error(str(e))
         return files
 
+    @instrumented(payload="data")
     def upload_to_s3(
         self,
         file_name: str,
-        data: bytes,
+        data: UploadSource | Any,
         folder: str,
-        content_type: str = "application/octet-stream",
+        content_type: str | None = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
+        max_workers: int = DEFAULT_PART_WORKERS,
+        codec: str | None = None,
     ) -> int:
         """
         Upload a file to an AWS S3 bucket.
-        :param file_name: The name of the file to be saved in S3 (without extension)
-        :param data: The data to be uploaded
+        Above ``multipart_threshold`` the file is sent as a multipart upload whose parts are
+        uploaded concurrently and retried one by one; a failed upload is aborted.
+        :param file_name: The name of the file to be saved in S3 (with extension)
+        :param data: The data to be uploaded: bytes or a memoryview, a local file Path, an
+            open binary file or an iterator of byte chunks, sent as is; or any other value
+            (str, DataFrame, image...), encoded by the codec matching the extension. A value
+            the codec cannot encode fails the upload
         :param folder: The folder within the S3 bucket where the file will be stored
-        :param content_type: The content type of the file
+        :param content_type: The content type of the file; defaults to the codec's for
+            encoded values and to application/octet-stream otherwise
+        :param part_size: Size of each part of a multipart upload (at least 5 MiB)
+        :param multipart_threshold: Size above which a multipart upload is used
+        :param max_workers: Number of parts uploaded concurrently
+        :param codec: Name of a registered codec to encode ``data`` with, e.g. "json"
         :return: int status code (0 for success, 1 for failure)
         """
         try:
             s3_file_key = f"{folder}/{file_name}"
-            self.s3_client.put_object(
-                Bucket=settings.S3_BUCKET_NAME,
-                Key=s3_file_key,
-                Body=data,
-                ContentType=content_type,
+            if codec is not None or not is_upload_source(data):
+                data, encoded_type = codec_registry.encode(data, file_name, codec)
+                content_type = content_type or encoded_type
+            upload_object(
+                self.s3_client,
+                self._bucket,
+                s3_file_key,
+                data,
+                content_type=content_type or "application/octet-stream",
+                part_size=part_size,
+                multipart_threshold=multipart_threshold,
+                max_workers=max_workers,
             )
             return 0
-        except ClientError as e:
+        except (ClientError, MultipartUploadError, CodecError, OSError) as e:
             logger.error(str(e))
             return 1
 
+    @instrumented()
     def delete_object_from_s3(self, file_name: str, folder: str) -> int:
         """
         Delete an object from an AWS S3 bucket.
@@ -129,21 +431,131 @@ class S3Manager:
         """
         try:
             s3_file_key = f"{folder}/{file_name}"
-            self.s3_client.delete_object(Bucket=settings.S3_BUCKET_NAME, Key=s3_file_key)
+            call_with_retry(
+                self.s3_client.delete_object, Bucket=settings.S3_BUCKET_NAME, Key=s3_file_key
+            )
             logger.info(f"Object {s3_file_key} deleted from S3.")
             return 0
         except ClientError as e:
             logger.error(str(e))
             return 1
 
+    def _delete_batch(self, keys: list[str]) -> dict[str, str]:
+        """
+        Delete up to 1000 keys with a single DeleteObjects request.
+        :param keys: The full keys to delete
+        :return: Mapping of the keys that could not be deleted to their error
+        """
+        response = call_with_retry(
+            self.s3_client.delete_objects,
+            Bucket=settings.S3_BUCKET_NAME,
+            Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+        )
+        return {
+            error["Key"]: f"{error['Code']}: {error.get('Message', '')}"
+            for error in response.get("Errors", [])
+        }
+
+    @instrumented()
+    def delete_many(
+        self,
+        keys: Iterable[str],
+        dry_run: bool = False,
+        max_workers: int = DEFAULT_DELETE_WORKERS,
+        progress_callback: ProgressCallback | None = None,
+    ) -> TransferReport:
+        """
+        Delete many objects from an AWS S3 bucket with DeleteObjects requests of up to 1000
+        keys, several batches being sent concurrently.
+        :param keys: The full keys of the objects to delete
+        :param dry_run: Only count the keys, nothing is deleted; they are reported as skipped
+        :param max_workers: Number of batches sent concurrently
+        :param progress_callback: Called with a TransferProgress after every batch
+        :return: TransferReport with deleted keys and the error of every key not deleted
+        """
+        report = TransferReport()
+        if dry_run:
+            for key in keys:
+                report.skipped.append(key)
+            logger.info(f"Dry run: {len(report.skipped)} objects would be deleted from S3.")
+            return report
+
+        lock = threading.Lock()
+
+        def delete(batch: list[str]) -> int:
+            try:
+                errors = self._delete_batch(batch)
+            except (ClientError, BotoCoreError) as e:
+                errors = {key: str(e) for key in batch}
+            with lock:
+                report.failed.update(errors)
+                report.succeeded.extend(key for key in batch if key not in errors)
+            return 0
+
+        def progress(batch_progress: TransferProgress) -> None:
+            if progress_callback is not None:
+                progress_callback(
+                    replace(
+                        batch_progress,
+                        completed=len(report.succeeded),
+                        failed=len(report.failed),
+                    )
+                )
+
+        report.elapsed = run_concurrently(
+            batched(keys, DELETE_BATCH_SIZE),
+            delete,
+            max_workers=max_workers,
+            progress_callback=progress,
+            describe=lambda batch: batch[0],
+        ).elapsed
+        for key, error in report.failed.items():
+            logger.error(f"Failed to delete {key}: {error}")
+        logger.info(
+            f"Deleted {len(report.succeeded)} objects from S3 in {report.elapsed:.2f}s, "
+            f"{len(report.failed)} failed."
+        )
+        return report
+
+    @instrumented()
+    def delete_prefix(
+        self,
+        folder: str,
+        dry_run: bool = False,
+        max_workers: int = DEFAULT_DELETE_WORKERS,
+        progress_callback: ProgressCallback | None = None,
+    ) -> TransferReport:
+        """
+        Delete every object of a folder, batches being deleted while the listing goes on.
+        :param folder: The folder within the S3 bucket to clear
+        :param dry_run: Only count the objects, nothing is deleted
+        :param max_workers: Number of batches sent concurrently
+        :param progress_callback: Called with a TransferProgress after every batch
+        :return: TransferReport with deleted keys and the error of every key not deleted
+        """
+        try:
+            return self.delete_many(
+                (obj["Key"] for obj in self._iter_objects(f"{folder}/")),
+                dry_run=dry_run,
+                max_workers=max_workers,
+                progress_callback=progress_callback,
+            )
+        except ClientError as e:
+            logger.error(f"Error listing folder {folder}: {str(e)}")
+            return TransferReport(failed={folder: str(e)})
+
+    @instrumented()
     def check_file_exists(self, key: str) -> bool:
         """
         Check if a file exists in an S3 bucket.
         :param key: The full key of the file in the S3 bucket
         :return: True if the file exists, False otherwise
         """
+        return self._head_exists(key)
+
+    def _head_exists(self, key: str) -> bool:
         try:
-            self.s3_client.head_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
+            call_with_retry(self.s3_client.head_object, Bucket=settings.S3_BUCKET_NAME, Key=key)
             return True
         except ClientError as e:
             if e.response["Error"]["Code"] == "404":
@@ -151,97 +563,573 @@ class S3Manager:
             else:
                 raise
 
+    @instrumented()
+    def check_files_exist(self, keys: Iterable[str], prefix: str | None = None) -> set[str]:
+        """
+        Check which of many keys exist with paginated listings instead of one HEAD request
+        per key.
+        Keys are grouped by folder and each group is listed over the key range it spans.
+        A listing is given up for HEAD requests as soon as it has cost as many requests as
+        the keys it still has to find, so a few keys in a large folder, or keys spread over
+        many folders, never cost more than one HEAD each, plus a page.
+        :param keys: The full keys of the files in the S3 bucket
+        :param prefix: Prefix to list the keys under it with; by default each key's folder
+        :return: The subset of keys that exist
+        """
+        groups: dict[str, list[str]] = {}
+        for key in set(keys):
+            if prefix is not None and key.startswith(prefix):
+                group = prefix
+            else:
+                group = key.rpartition("/")[0] + "/" if "/" in key else ""
+            groups.setdefault(group, []).append(key)
+        found: set[str] = set()
+        for group_prefix, group_keys in groups.items():
+            found |= self._check_group_exists(group_prefix, sorted(group_keys))
+        return found
+
+    def _check_group_exists(self, prefix: str, keys: list[str]) -> set[str]:
+        """
+        Check which of the sorted keys under a prefix exist, listing from the first key and
+        switching to HEAD requests when they become cheaper.
+        """
+        found: set[str] = set()
+        unresolved = set(keys)
+        listed_up_to = ""
+        if len(keys) > 1:
+            pages = list_pages(
+                self.s3_client,
+                self._bucket,
+                prefix,
+                # keys[0] is listed, it sorts after its own prefix
+                start_after=keys[0][:-1] or None,
+            )
+            for requests, response in enumerate(pages, start=1):
+                contents = response.get("Contents", [])
+                for obj in contents:
+                    if obj["Key"] in unresolved:
+                        found.add(obj["Key"])
+                if contents:
+                    listed_up_to = contents[-1]["Key"]
+                # Keys up to the last listed one are settled, found or not
+                unresolved = {key for key in unresolved if key > listed_up_to}
+                if not response.get("IsTruncated", False):
+                    return found
+                if len(unresolved) <= requests:
+                    break
+        found.update(key for key in sorted(unresolved) if self._head_exists(key))
+        return found
+
+    @instrumented()
     def download_from_s3(
-        self, file_name: str, folder: str
-    ) -> bytes | str | None | pd.DataFrame | Image.Image:
+        self,
+        file_name: str,
+        folder: str,
+        memoize: bool | None = None,
+        codec: str | None = None,
+    ) -> DecodedContent | None:
         """
-        Download a file from an AWS S3 bucket, with optional decompression for gzip files.
+        Download a file from an AWS S3 bucket, decoded according to its extension (see
+        aws.codec_registry): gzip and zstd files are decompressed, pickles loaded, images
+        opened, parquet and feather files read as DataFrames, other files returned as text
+        if they are UTF-8 and as bytes otherwise.
         :param file_name: The name of the file to be downloaded from S3 (with extension)
         :param folder: The folder within the S3 bucket where the file is stored (can be composed folder/subfolder)
-        :return: The file content, decompressed if it's a gzip file, or None on failure
+        :param memoize: Keep the decoded content in memory and reuse it while its ETag is
+            unchanged; defaults to True for folders registered with memoize_folder.
+            Memoized values are shared, callers must not modify them
+        :param codec: Name of a registered codec to use instead of the extension's, e.g.
+            "json" to parse a JSON file, or "raw" / "memoryview" to skip decoding
+        :return: The decoded file content, or None on failure
         """
         s3_file_key = f"{folder}/{file_name}"
-        if not self.check_file_exists(s3_file_key):
-            logger.error(
-                f"File '{s3_file_key}' does not exist in bucket '{settings.S3_BUCKET_NAME}'."
+        if memoize is None:
+            memoize = self.memo_cache.covers(s3_file_key)
+        decoded: DecodedContent | None
+        try:
+            # Undecoded bytes cost nothing to rebuild, they are never memoized
+            if memoize and codec not in RAW_CODECS:
+                decoded = self._download_memoized(file_name, s3_file_key, codec)
+            else:
+                content, _ = self._fetch_object(s3_file_key)
+                decoded = self._decode_content(file_name, content, s3_file_key, codec)
+            return decoded
+        except ClientError as e:
+            # The GET's own 404 tells us the file is missing, no HEAD request needed beforehand
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                logger.error(
+                    f"File '{s3_file_key}' does not exist in bucket '{settings.S3_BUCKET_NAME}'."
+                )
+            else:
+                logger.critical(str(e))
+            return None
+
+    def memoize_folder(self, folder: str) -> None:
+        """
+        Memoize the decoded content of every file downloaded from a folder, in this process.
+        :param folder: The folder within the S3 bucket, subfolders included
+        """
+        self.memo_cache.memoize_folder(folder)
+
+    def _download_memoized(self, file_name: str, s3_file_key: str, codec: str | None) -> Any:
+        """
+        Return the memoized content of a file if it is still fresh or S3 confirms with a 304
+        that its ETag is unchanged, otherwise download, decode and memoize it.
+        """
+        # The same object decoded by two codecs gives two values
+        memo_key = s3_file_key if codec is None else f"{s3_file_key}#{codec}"
+        entry = self.memo_cache.get(memo_key)
+        if entry is not None and not entry.expired:
+            self.memo_cache.record(hit=True)
+            return entry.value
+        if entry is None:
+            content, etag = self._fetch_object(s3_file_key)
+        else:
+            fetched = self._fetch_object(s3_file_key, entry.etag)
+            if fetched is None:
+                self.memo_cache.refresh(memo_key)
+                self.memo_cache.record(hit=True)
+                return entry.value
+            content, etag = fetched
+        self.memo_cache.record(hit=False)
+        value = self._decode_content(file_name, content, s3_file_key, codec)
+        if value is not None:
+            self.memo_cache.put(memo_key, etag, value, len(content))
+        return value
+
+    @overload
+    def _fetch_object(self, s3_file_key: str, etag: None = None) -> tuple[bytes, str]:
+        ...
+
+    @overload
+    def _fetch_object(self, s3_file_key: str, etag: str | None) -> tuple[bytes, str] | None:
+        ...
+
+    def _fetch_object(self, s3_file_key: str, etag: str | None = None) -> tuple[bytes, str] | None:
+        """
+        Fetch the raw bytes of an object with a single GET, through the disk cache if any.
+        :param s3_file_key: The full key of the file in the S3 bucket
+        :param etag: ETag of a copy held by the caller; the GET is then conditional
+        :return: The object content and its ETag, or None if it still has the given ETag
+        """
+        if etag is None and self.cache is not None:
+            return self._get_object_cached(self.cache, s3_file_key)
+        conditions: dict[str, Any] = {"IfNoneMatch": etag} if etag else {}
+        # get_object is a single request, whereas download_fileobj sends a HEAD first
+        try:
+            response = call_with_retry(
+                self.s3_client.get_object,
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=s3_file_key,
+                **conditions,
             )
+        except ClientError as e:
+            if etag and e.response["Error"]["Code"] in NOT_MODIFIED_ERROR_CODES:
+                return None
+            raise
+        with closing(response["Body"]) as body:
+            content = body.read()
+        if self.cache is not None:
+            self.cache.put(self._bucket, s3_file_key, response["ETag"], content)
+        return content, response["ETag"]
+
+    def _get_object_cached(self, cache: S3DiskCache, s3_file_key: str) -> tuple[bytes, str]:
+        """
+        Fetch the raw bytes of an object through the disk cache. A cached copy is revalidated
+        with a conditional GET: S3 answers 304 Not Modified without a body while the ETag is
+        unchanged, and sends the new content otherwise.
+        :param cache: The disk cache of the manager
+        :param s3_file_key: The full key of the file in the S3 bucket
+        :return: The object content and its ETag
+        """
+        bucket = self._bucket
+        cached_etag = cache.etag(bucket, s3_file_key)
+        conditions: dict[str, Any] = {"IfNoneMatch": cached_etag} if cached_etag else {}
+        try:
+            response = call_with_retry(
+                self.s3_client.get_object, Bucket=bucket, Key=s3_file_key, **conditions
+            )
+            cache.record_miss()
+        except ClientError as e:
+            if not cached_etag or e.response["Error"]["Code"] not in NOT_MODIFIED_ERROR_CODES:
+                raise
+            cached = cache.get(bucket, s3_file_key, cached_etag)
+            if cached is not None:
+                return cached, cached_etag
+            # Evicted or replaced since its ETag was read: fetch it unconditionally
+            response = call_with_retry(self.s3_client.get_object, Bucket=bucket, Key=s3_file_key)
+        with closing(response["Body"]) as body:
+            content = body.read()
+        cache.put(bucket, s3_file_key, response["ETag"], content)
+        return content, response["ETag"]
+
+    @staticmethod
+    def _decode_content(
+        file_name: str, content: bytes, s3_file_key: str, codec: str | None = None
+    ) -> Any:
+        """
+        Decode the raw content of an object with the codec matching its extension.
+        :param file_name: The name of the file (with extension)
+        :param content: The raw content of the file
+        :param s3_file_key: The full key of the file, used for logging
+        :param codec: Name of a registered codec to use instead of the extension's
+        :return: The decoded content, or None if it cannot be decoded
+        """
+        try:
+            return codec_registry.decode(content, file_name, codec)
+        except (
+            pickle.UnpicklingError,
+            AttributeError,
+            EOFError,
+            ImportError,
+            IndexError,
+            ValueError,
+            OSError,
+        ) as e:
+            logger.error(f"Error decoding file {s3_file_key}: {str(e)}")
             return None
 
-        file_stream = BytesIO()
+    @instrumented()
+    def read_range(
+        self, file_name: str, folder: str, start: int, end: int | None = None
+    ) -> bytes | None:
+        """
+        Read part of a file from an AWS S3 bucket with a single ranged GET, like slicing
+        ``content[start:end]``: a negative ``start`` without ``end`` reads the tail.
+        :param file_name: The name of the file (with extension)
+        :param folder: The folder within the S3 bucket where the file is stored
+        :param start: Offset of the first byte; negative to count from the end
+        :param end: Offset after the last byte, to the end of the file by default
+        :return: The bytes read, empty past the end of the file, or None on failure
+        """
+        if start < 0 and end is not None:
+            raise ValueError("A negative start reads the tail of the file and takes no end")
+        if end is not None and end <= start:
+            return b""
+        if start < 0:
+            byte_range = f"bytes={start}"
+        else:
+            byte_range = f"bytes={start}-{'' if end is None else end - 1}"
+        s3_file_key = f"{folder}/{file_name}"
         try:
-            self.s3_client.download_fileobj(
-                Bucket=settings.S3_BUCKET_NAME, Key=s3_file_key, Fileobj=file_stream
+            response = call_with_retry(
+                self.s3_client.get_object,
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=s3_file_key,
+                Range=byte_range,
             )
-            file_stream.seek(0)
-            # Handle gzip files
-            if file_name.endswith(".gz"):
-                with gzip.open(file_stream, "rb") as f_in:
-                    return f_in.read().decode("utf-8")
-
-            # Handle pickle files
-            if file_name.endswith(".pkl"):
-                # Security warning: Only unpickle data from trusted sources
-                # This is safe as long as the pickle files in S3 are created by our application
-                # and not uploaded by users or external systems
-                try:
-                    return pickle.load(file_stream)  # nosec B301
-                except (
-                    pickle.UnpicklingError,
-                    AttributeError,
-                    EOFError,
-                    ImportError,
-                    IndexError,
-                ) as e:
-                    logger.error(f"Error unpickling file {s3_file_key}: {str(e)}")
-                    return None
-
-            # Handle image files
-            image_extensions = (
-                ".png",
-                ".jpg",
-                ".jpeg",
-                ".bmp",
-                ".gif",
-                ".tiff",
-                ".webp",
+            with closing(response["Body"]) as body:
+                content: bytes = body.read()
+            return content
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "InvalidRange":
+                return b""
+            logger.error(f"Failed to read {byte_range} of '{s3_file_key}': {e}")
+            return None
+
+    def open_reader(self, file_name: str, folder: str, **kwargs: Any) -> S3RangeReader | None:
+        """
+        Open a file of an AWS S3 bucket as a seekable binary file object that downloads the
+        parts being read, so pandas, PIL or zipfile can read it without a full download.
+        :param file_name: The name of the file (with extension)
+        :param folder: The folder within the S3 bucket where the file is stored
+        :param kwargs: Block size, cache and read-ahead options of S3RangeReader
+        :return: The reader, or None if the file does not exist
+        """
+        s3_file_key = f"{folder}/{file_name}"
+        try:
+            return S3RangeReader(self.s3_client, self._bucket, s3_file_key, **kwargs)
+        except ClientError as e:
+            logger.error(f"Failed to open '{s3_file_key}': {e}")
+            return None
+
+    @instrumented()
+    def upload_dataframe(
+        self,
+        df: pd.DataFrame,
+        file_name: str,
+        folder: str,
+        compression: Compression | None = DEFAULT_COMPRESSION,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ) -> int:
+        """
+        Upload a DataFrame as a Parquet or Feather file, according to the file extension.
+        :param df: The DataFrame to upload
+        :param file_name: The name of the file, ending in .parquet, .feather or .arrow
+        :param folder: The folder within the S3 bucket where the file will be stored
+        :param compression: Codec of the column data, e.g. "zstd", "snappy" or None
+        :param row_group_size: Rows per Parquet row group, the unit skipped by filters
+        :return: int status code (0 for success, 1 for failure)
+        """
+        try:
+            fmt = dataframe_format(file_name)
+            data = dataframe_to_bytes(df, fmt, compression, row_group_size)
+            upload_object(
+                self.s3_client,
+                self._bucket,
+                f"{folder}/{file_name}",
+                data,
+                content_type=DATAFRAME_CONTENT_TYPES[fmt],
             )
-            if file_name.lower().endswith(image_extensions):
-                return Image.open(file_stream)
+            return 0
+        except (ClientError, MultipartUploadError, ValueError) as e:
+            logger.error(str(e))
+            return 1
 
-            # Default: return content as a string
-            return file_stream.read().decode("utf-8")
+    @instrumented()
+    def download_dataframe(
+        self,
+        file_name: str,
+        folder: str,
+        columns: list[str] | None = None,
+        filters: Filters | None = None,
+    ) -> pd.DataFrame | None:
+        """
+        Read a Parquet or Feather file of an S3 bucket into a DataFrame, through ranged GETs.
+        For Parquet only the footer, the projected columns and the row groups that can match
+        the filters are downloaded.
+        :param file_name: The name of the file, ending in .parquet, .feather or .arrow
+        :param folder: The folder within the S3 bucket where the file is stored
+        :param columns: Only read these columns
+        :param filters: Only keep the rows matching these pyarrow DNF filters, e.g.
+            [("year", ">=", 2024)]
+        :return: The DataFrame, or None on failure
+        """
+        s3_file_key = f"{folder}/{file_name}"
+        try:
+            fmt = dataframe_format(file_name)
+            # pyarrow plans and coalesces its own reads, read-ahead would only add waste
+            reader = S3RangeReader(self.s3_client, self._bucket, s3_file_key, read_ahead_blocks=0)
+            return read_dataframe(reader, fmt, columns, filters)
         except ClientError as e:
-            logger.critical(str(e))
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                logger.error(
+                    f"File '{s3_file_key}' does not exist in bucket '{settings.S3_BUCKET_NAME}'."
+                )
+            else:
+                logger.critical(str(e))
+            return None
+        except ValueError as e:
+            logger.error(f"Error reading DataFrame {s3_file_key}: {str(e)}")
+            return None
+
+    @instrumented()
+    def download_large_file(
+        self,
+        file_name: str,
+        folder: str,
+        local_path: str,
+        range_size: int = DEFAULT_RANGE_SIZE,
+        max_workers: int = DEFAULT_RANGE_WORKERS,
+        resume: bool = True,
+        verify: bool = True,
+        progress_callback: ProgressCallback | None = None,
+    ) -> str | None:
+        """
+        Download one large file with concurrent ranged GETs written at their offsets in a
+        preallocated local file. An interrupted download is resumed by calling it again.
+        :param file_name: The name of the file to be downloaded from S3 (with extension)
+        :param folder: The folder within the S3 bucket where the file is stored
+        :param local_path: The local file path to write to
+        :param range_size: Size of the byte range fetched by each request
+        :param max_workers: Number of ranges downloaded concurrently
+        :param resume: Keep the ranges already written by an interrupted download
+        :param verify: Check the ETag of the result against the object's
+        :param progress_callback: Called with a TransferProgress after every range
+        :return: The local file path, or None on failure
+        """
+        s3_file_key = f"{folder}/{file_name}"
+        try:
+            download_in_ranges(
+                self.s3_client,
+                self._bucket,
+                s3_file_key,
+                local_path,
+                range_size=range_size,
+                max_workers=max_workers,
+                resume=resume,
+                verify=verify,
+                progress_callback=progress_callback,
+            )
+            return local_path
+        except (ClientError, RangedDownloadError, OSError) as e:
+            logger.error(f"Failed to download '{s3_file_key}' to '{local_path}': {e}")
+            return None
+
+    @instrumented()
+    def download_to_file(
+        self,
+        file_name: str,
+        folder: str,
+        local_path: str,
+        decompress: bool | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> str | None:
+        """
+        Stream a file from an AWS S3 bucket to the local disk in fixed-size chunks.
+        Memory usage stays bounded by ``chunk_size`` whatever the size of the object.
+        :param file_name: The name of the file to be downloaded from S3 (with extension)
+        :param folder: The folder within the S3 bucket where the file is stored
+        :param local_path: The local file path to write to
+        :param decompress: Gunzip while writing; defaults to True for ".gz" files
+        :param chunk_size: Number of bytes read from S3 at a time
+        :return: The local file path, or None on failure
+        """
+        s3_file_key = f"{folder}/{file_name}"
+        if decompress is None:
+            decompress = file_name.endswith(".gz")
+        try:
+            call_with_retry(self._stream_to_file, s3_file_key, local_path, decompress, chunk_size)
+            return local_path
+        except (ClientError, OSError) as e:
+            logger.error(f"Failed to download '{s3_file_key}' to '{local_path}': {e}")
             return None
 
-    def rename_s3_folder(self, old_folder: str, new_folder: str) -> None:
+    def _stream_to_file(
+        self,
+        s3_file_key: str,
+        local_path: str,
+        decompress: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Pipe the body of an object to a local file, optionally through incremental gunzip.
+        The data is written to a temporary ".part" file that is renamed once complete,
+        so a failed download never leaves a truncated file behind.
+        :return: Number of bytes received from S3
+        """
+        response = self.s3_client.get_object(Bucket=settings.S3_BUCKET_NAME, Key=s3_file_key)
+        body = response["Body"]
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        part_path = f"{local_path}.part"
+        try:
+            with open(part_path, "wb") as f_out:
+                if decompress:
+                    with gzip.GzipFile(fileobj=body, mode="rb") as f_in:
+                        shutil.copyfileobj(f_in, f_out, chunk_size)
+                else:
+                    for chunk in body.iter_chunks(chunk_size):
+                        f_out.write(chunk)
+            os.replace(part_path, local_path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        finally:
+            body.close()
+        return int(response.get("ContentLength", 0))
+
+    @instrumented()
+    def copy_s3_folder(
+        self,
+        old_folder: str,
+        new_folder: str,
+        resume: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        multipart_threshold: int = MAX_COPY_SIZE,
+        progress_callback: ProgressCallback | None = None,
+    ) -> TransferReport:
+        """
+        Copy every object of a folder to another folder, server-side and concurrently.
+        The whole prefix is paginated and objects over 5 GB are copied in parallel parts.
+        The listing is read while copies are created, so it is limited to ``old_folder/``
+        and skips ``new_folder/``: copies never show up in later pages and get copied again.
+        :param old_folder: The name of the existing folder in S3
+        :param new_folder: The folder to copy the objects to
+        :param resume: Skip objects already copied by an interrupted run, i.e. whose copy has
+            the source's ETag, which a single-request CopyObject preserves (costs one listing
+            of ``new_folder``). Objects copied in parts get a new ETag and are copied again
+        :param max_workers: Number of concurrent copy threads
+        :param multipart_threshold: Size above which an object is copied in parts
+        :param progress_callback: Called with a TransferProgress after every object
+        :return: TransferReport with copied, skipped and failed source keys
+        """
+        source_prefix, destination_prefix = f"{old_folder}/", f"{new_folder}/"
+        # An unrelated object of the same size already at the destination must not pass for
+        # a copy: rename_s3_folder deletes the sources of skipped objects
+        copied: dict[str, str] = {}
+        if resume:
+            copied = {obj["Key"]: obj["ETag"] for obj in self._iter_objects(destination_prefix)}
+
+        def copy(obj: dict[str, Any]) -> int | None:
+            new_key = new_folder + obj["Key"][len(old_folder) :]
+            if copied.get(new_key) == obj["ETag"]:
+                return None
+            return copy_object(
+                self.s3_client,
+                self._bucket,
+                obj["Key"],
+                new_key,
+                obj["Size"],
+                multipart_threshold=multipart_threshold,
+            )
+
+        return run_concurrently(
+            (
+                obj
+                for obj in self._iter_objects(source_prefix)
+                if not obj["Key"].startswith(destination_prefix)
+            ),
+            copy,
+            max_workers=max_workers,
+            progress_callback=progress_callback,
+            describe=lambda obj: obj["Key"],
+        )
+
+    @instrumented()
+    def rename_s3_folder(
+        self,
+        old_folder: str,
+        new_folder: str,
+        resume: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        multipart_threshold: int = MAX_COPY_SIZE,
+        progress_callback: ProgressCallback | None = None,
+    ) -> TransferReport:
         """
         Rename a folder in S3 by copying all objects from the old folder to the new folder
         and then deleting the old objects.
+        Copies run concurrently (see copy_s3_folder) and the sources are deleted in batches
+        of 1000 once copied. Only objects copied by this call, or whose copy was verified by
+        its ETag, are deleted, so an interrupted move can be finished by calling this method
+        again with ``resume=True``.
         :param old_folder: The name of the existing folder in S3
         :param new_folder: The new folder name to move the objects to
+        :param resume: Skip objects whose copy by an interrupted run has the source's ETag
+        :param max_workers: Number of concurrent copy threads
+        :param multipart_threshold: Size above which an object is copied in parts
+        :param progress_callback: Called with a TransferProgress after every copied object
+        :return: TransferReport with moved, skipped and failed source keys
         """
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=settings.S3_BUCKET_NAME, Prefix=old_folder
+            report = self.copy_s3_folder(
+                old_folder,
+                new_folder,
+                resume=resume,
+                max_workers=max_workers,
+                multipart_threshold=multipart_threshold,
+                progress_callback=progress_callback,
             )
-            if "Contents" not in response:
+            moved = report.succeeded + report.skipped
+            if not moved and not report.failed:
                 logger.info(f"No objects found in the folder: {old_folder}")
-                return
-
-            for obj in response["Contents"]:
-                old_key = obj["Key"]
-                new_key = old_key.replace(old_folder, new_folder, 1)
-                self.s3_client.copy_object(
-                    Bucket=settings.S3_BUCKET_NAME,
-                    CopySource={"Bucket": settings.S3_BUCKET_NAME, "Key": old_key},
-                    Key=new_key,
-                )
-                self.s3_client.delete_object(Bucket=settings.S3_BUCKET_NAME, Key=old_key)
-                logger.info(f"Moved {old_key} to {new_key}")
-            logger.info(f"Folder renamed from {old_folder} to {new_folder}")
+                return report
+
+            deleted = self.delete_many(moved)
+            if deleted.failed:
+                report.failed.update(deleted.failed)
+                report.succeeded = [k for k in report.succeeded if k not in deleted.failed]
+                report.skipped = [k for k in report.skipped if k not in deleted.failed]
+            for key, error in report.failed.items():
+                logger.error(f"Failed to move {key}: {error}")
+            logger.info(
+                f"Folder renamed from {old_folder} to {new_folder}: "
+                f"{len(moved)} objects moved, {len(report.failed)} failed"
+            )
         except ClientError as e:
             logger.info(f"Error renaming folder: {str(e)}")
+            report = TransferReport(failed={old_folder: str(e)})
+        return report
 
     def save_to_local_disk(self, content: Any, file_name: str, folder_path: str) -> str | None:
         """
@@ -251,8 +1139,9 @@ class S3Manager:
         :param file_name: The name of the file (including extension).
         :param folder_path: The local folder where the file should be saved.
         """
-        os.makedirs(folder_path, exist_ok=True)  # Ensure the directory exists
         file_path = os.path.join(folder_path, file_name)
+        # Ensure the directory exists, including subfolders coming from the key
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
         # Handle image files
         # image_extensions = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff", ".webp")
@@ -261,7 +1150,7 @@ class S3Manager:
             return file_path
 
         # Handle binary files (e.g., gzip, pickle, or any other non-text files)
-        if isinstance(content, bytes):
+        if isinstance(content, (bytes, bytearray, memoryview)):
             with open(file_path, "wb") as f:
                 f.write(content)
             return file_path
@@ -275,12 +1164,153 @@ class S3Manager:
         # If content is None, return None
         return None
 
-    def download_folder(self, folder_path: str, aws_path: str) -> None:
-        files = self.get_available_files(aws_path)
-        for file_ in files:
-            content = self.download_from_s3(file_, aws_path)
-            self.save_to_local_disk(content, file_, folder_path)
-        return
+    def _download_to_local(
+        self,
+        file_name: str,
+        aws_path: str,
+        folder_path: str,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> int:
+        """
+        Stream one object of a folder to the same relative path on disk, byte for byte.
+        Raises on failure so that the caller can record the key in its report.
+        :return: Number of bytes downloaded
+        """
+        s3_file_key = f"{aws_path}/{file_name}"
+        return call_with_retry(
+            self._stream_to_file,
+            s3_file_key,
+            os.path.join(folder_path, file_name),
+            False,
+            max_retries=max_retries,
+            backoff=backoff,
+        )
+
+    @instrumented()
+    def download_folder(
+        self,
+        folder_path: str,
+        aws_path: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_in_flight: int | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        progress_callback: ProgressCallback | None = None,
+    ) -> TransferReport:
+        """
+        Download every file of an S3 folder to a local folder, keeping the relative layout.
+        Objects are fetched concurrently and streamed straight to disk, so memory stays
+        bounded whatever their size. Transient errors are retried with backoff.
+        :param folder_path: The local folder where the files will be saved
+        :param aws_path: The folder within the S3 bucket to download
+        :param max_workers: Number of concurrent download threads
+        :param max_in_flight: Cap on requests submitted but not yet finished
+        :param max_retries: Retries per object on transient errors
+        :param backoff: Base delay in seconds between retries
+        :param progress_callback: Called with a TransferProgress after every object
+        :return: TransferReport with downloaded keys and failed keys with their error
+        """
+        try:
+            # Downloads start as soon as the first page of the listing arrives
+            report = run_concurrently(
+                self.iter_files(aws_path),
+                lambda file_: self._download_to_local(
+                    file_, aws_path, folder_path, max_retries=max_retries, backoff=backoff
+                ),
+                max_workers=max_workers,
+                max_in_flight=max_in_flight,
+                progress_callback=progress_callback,
+            )
+        except ClientError as e:
+            logger.error(f"Error listing folder {aws_path}: {str(e)}")
+            return TransferReport(failed={aws_path: str(e)})
+        for file_, error in report.failed.items():
+            logger.error(f"Failed to download '{aws_path}/{file_}': {error}")
+        logger.info(
+            f"Downloaded {len(report.succeeded)}/{len(report.succeeded) + len(report.failed)} "
+            f"files from '{aws_path}' ({report.bytes_transferred} bytes in {report.elapsed:.2f}s)"
+        )
+        return report
+
+    def _upload_from_local(
+        self,
+        relative_path: str,
+        folder_path: str,
+        aws_path: str,
+        remote: dict[str, tuple[int, str]],
+    ) -> int | None:
+        """
+        Upload one file of a local folder under the same relative key.
+        When ``remote`` describes the object already in S3 and both size and ETag match,
+        the upload is skipped.
+        :return: Number of bytes uploaded, or None if the file was skipped
+        """
+        local_file = Path(folder_path) / relative_path
+        s3_file_key = f"{aws_path}/{relative_path}"
+        if s3_file_key in remote:
+            size, etag = remote[s3_file_key]
+            # Sizes are free to compare, checksums are only computed when they match
+            if size == local_file.stat().st_size and etag == local_etag(local_file):
+                return None
+        content_type = mimetypes.guess_type(local_file.name)[0] or "application/octet-stream"
+        return upload_object(
+            self.s3_client,
+            self._bucket,
+            s3_file_key,
+            local_file,
+            content_type=content_type,
+        )
+
+    @instrumented()
+    def upload_folder(
+        self,
+        folder_path: str,
+        aws_path: str,
+        sync: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_in_flight: int | None = None,
+        progress_callback: ProgressCallback | None = None,
+    ) -> TransferReport:
+        """
+        Upload every file of a local folder to an S3 folder, keeping the relative layout.
+        Files are uploaded concurrently with a content type guessed from their extension.
+        :param folder_path: The local folder to upload
+        :param aws_path: The folder within the S3 bucket where the files will be stored
+        :param sync: Skip files whose size and ETag match the object already in S3, using a
+            single listing of ``aws_path``
+        :param max_workers: Number of concurrent upload threads
+        :param max_in_flight: Cap on uploads submitted but not yet finished
+        :param progress_callback: Called with a TransferProgress after every file
+        :return: TransferReport with uploaded, skipped and failed relative paths
+        """
+        files = [
+            Path(root, name).relative_to(folder_path).as_posix()
+            for root, _, names in os.walk(folder_path)
+            for name in names
+        ]
+        remote: dict[str, tuple[int, str]] = {}
+        if sync:
+            for response in self._list_pages(f"{aws_path}/"):
+                for obj in response.get("Contents", []):
+                    remote[obj["Key"]] = (obj["Size"], obj["ETag"])
+
+        report = run_concurrently(
+            files,
+            lambda file_: self._upload_from_local(file_, folder_path, aws_path, remote),
+            max_workers=max_workers,
+            max_in_flight=max_in_flight,
+            progress_callback=progress_callback,
+            total=len(files),
+        )
+        for file_, error in report.failed.items():
+            logger.error(f"Failed to upload '{file_}' to '{aws_path}': {error}")
+        logger.info(
+            f"Uploaded {len(report.succeeded)}/{len(files)} files to '{aws_path}', "
+            f"{len(report.skipped)} unchanged "
+            f"({report.bytes_transferred} bytes in {report.elapsed:.2f}s)"
+        )
+        return report
 
 
 if __name__ == "__main__":
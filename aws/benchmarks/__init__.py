@@ -0,0 +1,4 @@
+"""
+Created by Analitika at 19/08/2024
+contact@analitika.fr
+"""
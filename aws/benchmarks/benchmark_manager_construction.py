@@ -0,0 +1,35 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Compare the cost of constructing an S3Manager with a new boto3 client (session, credential
+resolution, service model loading) against one reusing the process-wide client. No request
+is sent: with real S3 the reused client also saves the TLS handshake that a fresh connection
+pool has to redo on its first request, which this benchmark does not measure.
+python -m aws.benchmarks.benchmark_manager_construction
+"""
+# External imports
+import time
+from collections.abc import Callable
+
+from loguru import logger
+
+# Internal imports
+from aws import S3Manager
+from aws.client import create_s3_client, reset_s3_clients
+
+N_MANAGERS = 50
+
+
+def per_manager(name: str, make_manager: Callable[[], S3Manager]) -> None:
+    start = time.perf_counter()
+    for _ in range(N_MANAGERS):
+        make_manager()
+    elapsed = time.perf_counter() - start
+    logger.info(f"{name:<30} {1000 * elapsed / N_MANAGERS:>8.2f} ms per manager")
+
+
+if __name__ == "__main__":
+    reset_s3_clients()
+    per_manager("new client per manager", lambda: S3Manager(create_s3_client()))
+    per_manager("shared client", S3Manager)
@@ -0,0 +1,62 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Count the S3 requests and wall time of the read path against the in-memory stand-in.
+python -m aws.benchmarks.benchmark_s3_calls
+"""
+# External imports
+import time
+from collections.abc import Callable
+
+from loguru import logger
+
+# Internal imports
+from aws import S3Manager
+from aws.testing import InMemoryS3Client
+
+FOLDER = "bench"
+N_KEYS = 200
+LATENCY = 0.005  # seconds per request, roughly an in-region round trip
+
+
+def make_manager() -> tuple[S3Manager, InMemoryS3Client]:
+    s3_client = InMemoryS3Client(latency=LATENCY)
+    for i in range(N_KEYS):
+        s3_client.add_object(f"{FOLDER}/file_{i:05d}.txt", f"content {i}".encode())
+    return S3Manager(s3_client=s3_client), s3_client
+
+
+def measure(name: str, scenario: Callable[[S3Manager], object]) -> None:
+    s3_manager, s3_client = make_manager()
+    start = time.perf_counter()
+    scenario(s3_manager)
+    elapsed = time.perf_counter() - start
+    logger.info(f"{name:<40} {sum(s3_client.calls.values()):>6} calls {elapsed:>8.3f}s")
+
+
+def head_then_get(s3_manager: S3Manager) -> None:
+    for i in range(N_KEYS):
+        if s3_manager.check_file_exists(f"{FOLDER}/file_{i:05d}.txt"):
+            s3_manager.download_from_s3(f"file_{i:05d}.txt", FOLDER)
+
+
+def single_get(s3_manager: S3Manager) -> None:
+    for i in range(N_KEYS):
+        s3_manager.download_from_s3(f"file_{i:05d}.txt", FOLDER)
+
+
+def head_per_key(s3_manager: S3Manager) -> None:
+    for i in range(N_KEYS):
+        s3_manager.check_file_exists(f"{FOLDER}/file_{i:05d}.txt")
+
+
+def batched_listing(s3_manager: S3Manager) -> None:
+    s3_manager.check_files_exist(f"{FOLDER}/file_{i:05d}.txt" for i in range(N_KEYS))
+
+
+if __name__ == "__main__":
+    measure("download: HEAD + GET per key", head_then_get)
+    measure("download: single GET per key", single_get)
+    measure("exists: HEAD per key", head_per_key)
+    measure("exists: batched listing", batched_listing)
@@ -0,0 +1,268 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Throughput of S3Manager against the in-memory stand-in, with an emulated network: every
+request waits ``latency`` seconds and moves bodies at ``bandwidth`` bytes per second per
+connection. Upload, download, listing, delete, rename and download_folder are measured for
+every object size and concurrency of the matrix, and the objects/s and MB/s obtained are
+saved as JSON, by default under data/benchmarks/, which git ignores. Passing the file of an
+earlier run with --compare logs the change of every scenario, to catch regressions between
+versions.
+python -m aws.benchmarks.benchmark_throughput --sizes 1024 1048576 --concurrency 1 16
+"""
+# External imports
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+# Internal imports
+from aws import S3Manager
+from aws.testing import InMemoryS3Client
+from aws.transfer import run_concurrently
+from config import settings
+
+FOLDER = "bench"
+OBJECT_SIZES = (1024, 64 * 1024, 1024 * 1024)
+CONCURRENCY = (1, 8, 32)
+N_OBJECTS = 64
+N_LISTED_OBJECTS = 5000  # listings are paged by 1000 keys, so they need more objects
+LATENCY = 0.005  # seconds per request, roughly an in-region round trip
+BANDWIDTH = 100 * 1024 * 1024  # bytes per second per connection
+REGRESSION_THRESHOLD = 0.9  # ratio of objects/s below which a scenario is flagged
+
+
+@dataclass
+class BenchmarkResult:
+    operation: str
+    object_size: int
+    concurrency: int
+    objects: int
+    requests: int
+    seconds: float
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.objects / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.objects * self.object_size / self.seconds / 1e6 if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "objects_per_second": round(self.objects_per_second, 2),
+            "mb_per_second": round(self.mb_per_second, 3),
+        }
+
+
+def object_names(count: int) -> list[str]:
+    """
+    Hash-like names, spread over the key space like most real datasets.
+    """
+    return [
+        f"{hashlib.md5(str(i).encode(), usedforsecurity=False).hexdigest()}.bin"
+        for i in range(count)
+    ]
+
+
+def make_manager(latency: float, bandwidth: float | None) -> tuple[S3Manager, InMemoryS3Client]:
+    s3_client = InMemoryS3Client(latency=latency, bandwidth=bandwidth)
+    return S3Manager(s3_client=s3_client), s3_client
+
+
+def populate(s3_client: InMemoryS3Client, names: list[str], object_size: int) -> None:
+    payload = os.urandom(object_size)
+    for name in names:
+        s3_client.add_object(f"{FOLDER}/{name}", payload)
+
+
+def upload(s3_manager: S3Manager, names: list[str], object_size: int, concurrency: int) -> None:
+    payload = os.urandom(object_size)
+    run_concurrently(
+        names,
+        lambda name: s3_manager.upload_to_s3(name, payload, FOLDER),
+        max_workers=concurrency,
+    )
+
+
+def download(s3_manager: S3Manager, names: list[str], object_size: int, concurrency: int) -> None:
+    def fetch(name: str) -> int:
+        content = s3_manager.download_from_s3(name, FOLDER, codec="raw")
+        return len(content) if isinstance(content, bytes) else 0
+
+    run_concurrently(names, fetch, max_workers=concurrency)
+
+
+def listing(s3_manager: S3Manager, names: list[str], object_size: int, concurrency: int) -> None:
+    listed = sum(
+        1
+        for _ in s3_manager.iter_files(
+            FOLDER, sharded=concurrency > 1, alphabet="0123456789abcdef", max_workers=concurrency
+        )
+    )
+    assert listed == len(names)  # nosec B101 - sanity check of the benchmark itself
+
+
+def delete(s3_manager: S3Manager, names: list[str], object_size: int, concurrency: int) -> None:
+    s3_manager.delete_many((f"{FOLDER}/{name}" for name in names), max_workers=concurrency)
+
+
+def rename(s3_manager: S3Manager, names: list[str], object_size: int, concurrency: int) -> None:
+    s3_manager.rename_s3_folder(FOLDER, f"{FOLDER}-renamed", max_workers=concurrency)
+
+
+def download_folder(
+    s3_manager: S3Manager, names: list[str], object_size: int, concurrency: int
+) -> None:
+    with tempfile.TemporaryDirectory() as local_dir:
+        s3_manager.download_folder(local_dir, FOLDER, max_workers=concurrency)
+
+
+# operation -> (scenario, whether the objects exist beforehand)
+SCENARIOS: dict[str, tuple[Callable[[S3Manager, list[str], int, int], None], bool]] = {
+    "upload": (upload, False),
+    "download": (download, True),
+    "list": (listing, True),
+    "delete": (delete, True),
+    "rename": (rename, True),
+    "download_folder": (download_folder, True),
+}
+
+
+def run_scenario(
+    operation: str,
+    object_size: int,
+    concurrency: int,
+    n_objects: int,
+    latency: float,
+    bandwidth: float | None,
+) -> BenchmarkResult:
+    scenario, prepopulated = SCENARIOS[operation]
+    names = object_names(n_objects)
+    s3_manager, s3_client = make_manager(latency, bandwidth)
+    if prepopulated:
+        populate(s3_client, names, object_size)
+    start = time.perf_counter()
+    scenario(s3_manager, names, object_size, concurrency)
+    seconds = time.perf_counter() - start
+    return BenchmarkResult(
+        operation, object_size, concurrency, n_objects, sum(s3_client.calls.values()), seconds
+    )
+
+
+def run_matrix(
+    operations: list[str],
+    object_sizes: list[int],
+    concurrency: list[int],
+    n_objects: int = N_OBJECTS,
+    latency: float = LATENCY,
+    bandwidth: float | None = BANDWIDTH,
+) -> list[BenchmarkResult]:
+    """
+    Run every operation for every object size and concurrency. Listing does not depend on
+    the object size and is run once per concurrency, on empty objects.
+    """
+    results = []
+    for operation in operations:
+        for object_size in [0] if operation == "list" else object_sizes:
+            for workers in concurrency:
+                count = N_LISTED_OBJECTS if operation == "list" else n_objects
+                result = run_scenario(operation, object_size, workers, count, latency, bandwidth)
+                logger.info(
+                    f"{operation:<16} {object_size:>9} B x{workers:<3} "
+                    f"{result.objects_per_second:>10.1f} obj/s {result.mb_per_second:>9.2f} MB/s "
+                    f"{result.requests:>6} requests"
+                )
+                results.append(result)
+    return results
+
+
+def save_results(results: list[BenchmarkResult], path: Path, parameters: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "parameters": parameters,
+        "results": [result.to_dict() for result in results],
+    }
+    path.write_text(json.dumps(document, indent=4))
+    logger.info(f"Results saved to {path}")
+
+
+def compare_results(results: list[BenchmarkResult], previous_path: Path) -> None:
+    """
+    Log the change of objects/s of every scenario also found in an earlier results file.
+    """
+    previous = {
+        (entry["operation"], entry["object_size"], entry["concurrency"]): entry
+        for entry in json.loads(previous_path.read_text())["results"]
+    }
+    for result in results:
+        before = previous.get((result.operation, result.object_size, result.concurrency))
+        if not before or not before["objects_per_second"]:
+            continue
+        ratio = result.objects_per_second / before["objects_per_second"]
+        message = (
+            f"{result.operation:<16} {result.object_size:>9} B x{result.concurrency:<3} "
+            f"{before['objects_per_second']:>10.1f} -> {result.objects_per_second:>10.1f} obj/s "
+            f"({ratio - 1:+.0%})"
+        )
+        if ratio < REGRESSION_THRESHOLD:
+            logger.warning(f"Regression: {message}")
+        else:
+            logger.info(message)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="S3Manager throughput benchmark")
+    parser.add_argument(
+        "--operations", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(OBJECT_SIZES))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=list(CONCURRENCY))
+    parser.add_argument("--objects", type=int, default=N_OBJECTS)
+    parser.add_argument("--latency", type=float, default=LATENCY)
+    parser.add_argument("--bandwidth", type=float, default=BANDWIDTH, help="0 for unlimited")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path, help="results file of an earlier run")
+    args = parser.parse_args()
+
+    benchmark_results = run_matrix(
+        args.operations,
+        args.sizes,
+        args.concurrency,
+        args.objects,
+        args.latency,
+        args.bandwidth or None,
+    )
+    output = args.output or (
+        settings.DATA_DIR
+        / "benchmarks"
+        / f"s3_throughput_{datetime.now().strftime(settings.TIME_FORMAT)}.json"
+    )
+    save_results(
+        benchmark_results,
+        output,
+        {
+            "objects": args.objects,
+            "listed_objects": N_LISTED_OBJECTS,
+            "latency": args.latency,
+            "bandwidth": args.bandwidth or None,
+        },
+    )
+    if args.compare:
+        compare_results(benchmark_results, args.compare)
@@ -0,0 +1,97 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Process-wide factory of boto3 S3 clients.
+
+Creating a session and a client resolves credentials, loads the service model and starts a
+new connection pool, so doing it for every S3Manager makes short-lived managers pay for TLS
+handshakes again and again. boto3 clients are thread-safe: one client per configuration is
+created lazily and shared by all threads. Connection pools must not be shared across a
+fork, so child processes drop the inherited clients and build their own on first use.
+
+Retries are left to call_with_retry, which sees every attempt (metrics count them) and also
+retries streamed bodies: botocore makes S3_MAX_ATTEMPTS attempts per request, 1 by default,
+and stacking both layers would multiply the attempts and backoff of a failing request.
+"""
+# External imports
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any
+
+import boto3  # AWS SDK for Python
+from botocore.config import Config
+
+# Internal imports
+from config import settings
+
+_lock = threading.Lock()
+_clients: dict[tuple[Any, ...], Any] = {}
+
+
+def _client_config(
+    max_pool_connections: int, connect_timeout: float, read_timeout: float, max_attempts: int
+) -> Config:
+    return Config(
+        max_pool_connections=max_pool_connections,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        retries={"total_max_attempts": max_attempts, "mode": settings.S3_RETRY_MODE},
+        tcp_keepalive=True,
+    )
+
+
+def create_s3_client(
+    max_pool_connections: int | None = None,
+    connect_timeout: float | None = None,
+    read_timeout: float | None = None,
+    max_attempts: int | None = None,
+) -> Any:
+    """
+    Build a new S3 client with its own session and connection pool.
+    Arguments default to the S3_* values of the settings.
+    """
+    config = _client_config(
+        max_pool_connections or settings.S3_MAX_POOL_CONNECTIONS,
+        connect_timeout or settings.S3_CONNECT_TIMEOUT,
+        read_timeout or settings.S3_READ_TIMEOUT,
+        max_attempts or settings.S3_MAX_ATTEMPTS,
+    )
+    return boto3.Session(
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION,
+    ).client("s3", config=config)
+
+
+def get_s3_client(
+    max_pool_connections: int | None = None,
+    connect_timeout: float | None = None,
+    read_timeout: float | None = None,
+    max_attempts: int | None = None,
+) -> Any:
+    """
+    Return the shared S3 client for this configuration, creating it on first use.
+    Arguments default to the S3_* values of the settings.
+    """
+    key = (max_pool_connections, connect_timeout, read_timeout, max_attempts)
+    with _lock:
+        if key not in _clients:
+            _clients[key] = create_s3_client(*key)
+        return _clients[key]
+
+
+def reset_s3_clients() -> None:
+    """
+    Forget the shared clients; the next call to get_s3_client builds fresh ones.
+    """
+    global _lock
+    # The lock may have been held by another thread at fork time, so it is replaced too
+    _lock = threading.Lock()
+    _clients.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_s3_clients)
@@ -0,0 +1,300 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Registry of the codecs used to turn S3 objects into Python values and back.
+
+A codec is looked up by name, by file extension (the longest registered suffix wins, so
+".csv.gz" may be registered apart from ".gz") or by content type. Files matching nothing are
+returned as text when they are valid UTF-8 and as bytes otherwise, so binary formats are never
+corrupted. The "raw" and "memoryview" codecs skip decoding altogether, for callers that only
+move bytes around.
+
+Parquet and Feather need pyarrow, and zstd needs zstandard. They are imported on first use,
+so the other codecs work without them.
+
+    register_codec(Codec("csv", decode=lambda b: pd.read_csv(BytesIO(b))), [".csv"])
+"""
+# External imports
+from __future__ import annotations
+
+import gzip
+import mimetypes
+import pickle  # nosec B403 - Used only for internal data, not user input
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import Any
+
+import pandas as pd
+from PIL import Image
+
+# Internal imports
+from aws.json_io import (
+    decode_json_lines,
+    encode_json,
+    encode_json_lines,
+    gunzip_if_compressed,
+    json_decoder,
+)
+
+
+class CodecError(ValueError):
+    """
+    Raised when a codec does not exist or cannot encode the value it is given.
+    """
+
+
+@dataclass(frozen=True)
+class Codec:
+    name: str
+    decode: Callable[[bytes], Any]
+    # (value, file name) -> bytes; None for codecs that can only decode
+    encode: Callable[[Any, str], bytes] | None = None
+    # None to guess the content type from the file name
+    content_type: str | None = "application/octet-stream"
+
+
+_codecs: dict[str, Codec] = {}
+_extensions: dict[str, str] = {}
+_content_types: dict[str, str] = {}
+
+
+def register_codec(
+    codec: Codec, extensions: tuple[str, ...] = (), content_types: tuple[str, ...] = ()
+) -> None:
+    """
+    Register a codec, replacing any codec of the same name or claiming the same extensions.
+    :param codec: The codec to register
+    :param extensions: File suffixes handled by the codec, e.g. (".parquet",)
+    :param content_types: Content types handled by the codec, for keys without extension
+    """
+    _codecs[codec.name] = codec
+    for extension in extensions:
+        _extensions[extension.lower()] = codec.name
+    for content_type in content_types:
+        _content_types[content_type] = codec.name
+
+
+def get_codec(name: str) -> Codec:
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise CodecError(f"Unknown codec '{name}', registered: {sorted(_codecs)}") from None
+
+
+def codec_for(file_name: str, content_type: str | None = None) -> Codec:
+    """
+    Find the codec of a file from its extension, then its content type.
+    :return: The matching codec, or the "auto" codec (text or bytes) if none matches
+    """
+    suffixes = [s.lower() for s in PurePosixPath(file_name).suffixes]
+    for i in range(len(suffixes)):
+        name = _extensions.get("".join(suffixes[i:]))
+        if name is not None:
+            return _codecs[name]
+    if content_type is not None and content_type in _content_types:
+        return _codecs[_content_types[content_type]]
+    return _codecs["auto"]
+
+
+def decode(
+    content: bytes, file_name: str, codec: str | None = None, content_type: str | None = None
+) -> Any:
+    """
+    Decode the raw content of an object with the named codec or the one matching the file.
+    """
+    chosen = get_codec(codec) if codec is not None else codec_for(file_name, content_type)
+    return chosen.decode(content)
+
+
+def encode(data: Any, file_name: str, codec: str | None = None) -> tuple[bytes, str]:
+    """
+    Encode a value with the named codec or the one matching the file.
+    :return: The bytes to upload and their content type
+    """
+    chosen = get_codec(codec) if codec is not None else codec_for(file_name)
+    if chosen.encode is None:
+        raise CodecError(f"Codec '{chosen.name}' cannot encode")
+    content_type = chosen.content_type or mimetypes.guess_type(file_name)[0]
+    return chosen.encode(data, file_name), content_type or "application/octet-stream"
+
+
+def _text_or_bytes(content: bytes) -> str | bytes:
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return content
+
+
+def _expect(data: Any, types: type | tuple[type, ...], codec: str) -> None:
+    """Raise CodecError if a value is not of a type the codec encodes."""
+    if not isinstance(data, types):
+        names = [t.__name__ for t in (types if isinstance(types, tuple) else (types,))]
+        raise CodecError(
+            f"Codec '{codec}' cannot encode {type(data).__name__}, expected {' or '.join(names)}"
+        )
+
+
+def _to_bytes(data: Any) -> bytes:
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    _expect(data, (bytes, bytearray, memoryview), "raw")
+    return bytes(data)
+
+
+def _encode_text(data: Any, _: str) -> bytes:
+    _expect(data, str, "text")
+    return str.encode(data, "utf-8")
+
+
+def _encode_gzip(data: Any, _: str) -> bytes:
+    # Text is not compressed implicitly: encode it to bytes first, in the encoding wanted
+    _expect(data, (bytes, bytearray, memoryview), "gzip")
+    return gzip.compress(data)
+
+
+def _decode_zstd(content: bytes) -> str | bytes:
+    import zstandard
+
+    with zstandard.ZstdDecompressor().stream_reader(BytesIO(content)) as reader:
+        return _text_or_bytes(reader.read())
+
+
+def _encode_zstd(data: Any, _: str) -> bytes:
+    import zstandard
+
+    _expect(data, (bytes, bytearray, memoryview), "zstd")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def _decode_pickle(content: bytes) -> Any:
+    # Security warning: Only unpickle data from trusted sources
+    # This is safe as long as the pickle files in S3 are created by our application
+    # and not uploaded by users or external systems
+    return pickle.loads(content)  # nosec B301
+
+
+def _encode_pickle(data: Any, _: str) -> bytes:
+    try:
+        return pickle.dumps(data)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise CodecError(f"Codec 'pickle' cannot encode {type(data).__name__}: {e}") from e
+
+
+def _encode_json(data: Any, _: str) -> bytes:
+    try:
+        return encode_json(data, indent=4)
+    except TypeError as e:  # orjson.JSONEncodeError is a TypeError too
+        raise CodecError(f"Codec 'json' cannot encode {type(data).__name__}: {e}") from e
+
+
+def _encode_json_lines(records: Any, _: str) -> bytes:
+    _expect(records, (list, tuple, Iterator), "jsonl")
+    try:
+        return b"".join(encode_json_lines(records))
+    except TypeError as e:
+        raise CodecError(f"Codec 'jsonl' cannot encode a record: {e}") from e
+
+
+def _encode_image(image: Any, file_name: str) -> bytes:
+    _expect(image, Image.Image, "image")
+    buffer = BytesIO()
+    image_format = Image.registered_extensions().get(PurePosixPath(file_name).suffix.lower())
+    image.save(buffer, format=image_format or image.format or "PNG")
+    return buffer.getvalue()
+
+
+def _encode_parquet(df: Any, _: str) -> bytes:
+    _expect(df, pd.DataFrame, "parquet")
+    buffer = BytesIO()
+    df.to_parquet(buffer)
+    return buffer.getvalue()
+
+
+def _encode_feather(df: Any, _: str) -> bytes:
+    _expect(df, pd.DataFrame, "feather")
+    buffer = BytesIO()
+    df.to_feather(buffer)
+    return buffer.getvalue()
+
+
+register_codec(Codec("raw", bytes, lambda data, _: _to_bytes(data)))
+register_codec(Codec("memoryview", memoryview, lambda data, _: _to_bytes(data)))
+register_codec(Codec("auto", _text_or_bytes, lambda data, _: _to_bytes(data)))
+# JSON files are returned as text unless the "json" codec is asked for, as they always were.
+# Text stored with ContentEncoding gzip is recognized by its magic number and gunzipped.
+register_codec(
+    Codec(
+        "text",
+        lambda content: gunzip_if_compressed(content).decode("utf-8"),
+        _encode_text,
+        "text/plain",
+    ),
+    (
+        ".txt",
+        ".csv",
+        ".tsv",
+        ".json",
+        ".jsonl",
+        ".ndjson",
+        ".md",
+        ".html",
+        ".xml",
+        ".yaml",
+        ".yml",
+        ".sql",
+    ),
+    ("text/plain", "text/csv", "text/html", "application/json"),
+)
+register_codec(
+    Codec(
+        "json",
+        lambda content: json_decoder()(gunzip_if_compressed(content)),
+        _encode_json,
+        "application/json",
+    )
+)
+register_codec(
+    Codec(
+        "jsonl",
+        decode_json_lines,
+        _encode_json_lines,
+        "application/x-ndjson",
+    )
+)
+register_codec(
+    Codec(
+        "gzip",
+        lambda content: _text_or_bytes(gzip.decompress(content)),
+        _encode_gzip,
+        "application/gzip",
+    ),
+    (".gz",),
+    ("application/gzip", "application/x-gzip"),
+)
+register_codec(
+    Codec("zstd", _decode_zstd, _encode_zstd, "application/zstd"),
+    (".zst", ".zstd"),
+    ("application/zstd",),
+)
+register_codec(
+    Codec("pickle", _decode_pickle, _encode_pickle),
+    (".pkl", ".pickle"),
+)
+register_codec(
+    Codec("image", lambda content: Image.open(BytesIO(content)), _encode_image, None),
+    (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff", ".webp"),
+    ("image/png", "image/jpeg", "image/gif", "image/webp"),
+)
+register_codec(
+    Codec("parquet", lambda content: pd.read_parquet(BytesIO(content)), _encode_parquet),
+    (".parquet",),
+    ("application/vnd.apache.parquet",),
+)
+register_codec(
+    Codec("feather", lambda content: pd.read_feather(BytesIO(content)), _encode_feather),
+    (".feather", ".arrow"),
+    ("application/vnd.apache.arrow.file",),
+)
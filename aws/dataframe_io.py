@@ -0,0 +1,116 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Columnar serialization of DataFrames, Parquet and Feather (Arrow IPC), backed by pyarrow.
+
+Parquet files are written in row groups of ``row_group_size`` rows, each with min/max
+statistics per column. Read from a seekable source such as S3RangeReader, pyarrow only
+fetches the footer, then the chunks of the projected columns in the row groups whose
+statistics can match the filters. Feather files support column projection but are read whole.
+pyarrow is imported on first use.
+"""
+# External imports
+from __future__ import annotations
+
+from io import BytesIO, RawIOBase
+from pathlib import PurePosixPath
+from typing import Any, BinaryIO, Literal
+
+import pandas as pd
+
+DataFrameFormat = Literal["parquet", "feather"]
+# Codecs of the column data; Feather files only support zstd and lz4
+Compression = Literal["zstd", "lz4", "snappy", "gzip", "brotli"]
+# DNF filters as accepted by pyarrow, e.g. [("year", ">=", 2024), ("country", "in", {"FR"})]
+Filters = list[tuple[str, str, Any]] | list[list[tuple[str, str, Any]]]
+
+DEFAULT_COMPRESSION: Compression = "zstd"
+FEATHER_COMPRESSION: dict[Compression | None, Literal["zstd", "lz4", "uncompressed"]] = {
+    "zstd": "zstd",
+    "lz4": "lz4",
+    None: "uncompressed",
+}
+DEFAULT_ROW_GROUP_SIZE = 100_000  # rows; smaller groups make filtering finer but footers bigger
+FORMAT_EXTENSIONS: dict[str, DataFrameFormat] = {
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+}
+DATAFRAME_CONTENT_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "feather": "application/vnd.apache.arrow.file",
+}
+
+
+def dataframe_format(file_name: str) -> DataFrameFormat:
+    """
+    Return the columnar format of a file from its extension.
+    """
+    suffix = PurePosixPath(file_name).suffix.lower()
+    if suffix not in FORMAT_EXTENSIONS:
+        raise ValueError(
+            f"Cannot tell the DataFrame format of '{file_name}', "
+            f"expected one of {sorted(FORMAT_EXTENSIONS)}"
+        )
+    return FORMAT_EXTENSIONS[suffix]
+
+
+def dataframe_to_bytes(
+    df: pd.DataFrame,
+    fmt: DataFrameFormat,
+    compression: Compression | None = DEFAULT_COMPRESSION,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> bytes:
+    """
+    Serialize a DataFrame to Parquet or Feather.
+    :param compression: Codec of the column data, e.g. "zstd", "snappy", "lz4" or None
+    :param row_group_size: Rows per Parquet row group, ignored for Feather
+    :return: The serialized file
+    """
+    buffer = BytesIO()
+    if fmt == "parquet":
+        df.to_parquet(buffer, compression=compression, row_group_size=row_group_size)
+    elif compression in FEATHER_COMPRESSION:
+        df.to_feather(buffer, compression=FEATHER_COMPRESSION[compression])
+    else:
+        raise ValueError(f"Feather files cannot be compressed with {compression}")
+    return buffer.getvalue()
+
+
+def read_dataframe(
+    source: BinaryIO | RawIOBase,
+    fmt: DataFrameFormat,
+    columns: list[str] | None = None,
+    filters: Filters | None = None,
+) -> pd.DataFrame:
+    """
+    Read a Parquet or Feather file into a DataFrame.
+    :param source: A seekable binary file
+    :param columns: Only read these columns
+    :param filters: Only keep the rows matching these DNF filters; for Parquet, row groups
+        whose statistics exclude every match are not read at all
+    :return: The DataFrame
+    """
+    import pyarrow.parquet as pq
+
+    if fmt == "parquet":
+        df: pd.DataFrame = pq.read_table(source, columns=columns, filters=filters).to_pandas()
+        return df
+
+    import pyarrow.feather as feather
+
+    read_columns = columns
+    if filters and columns is not None:
+        # The filtered columns are needed to evaluate the filters, even if not returned
+        filtered = {
+            name for item in filters for name, _, _ in (item if isinstance(item, list) else [item])
+        }
+        read_columns = columns + sorted(filtered - set(columns))
+    table = feather.read_table(source, columns=read_columns, memory_map=False)
+    if filters:
+        table = table.filter(pq.filters_to_expression(filters))
+    if columns is not None:
+        table = table.select(columns)
+    df = table.to_pandas()
+    return df
@@ -0,0 +1,205 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Read-through disk cache of S3 objects.
+
+Each object is stored in a single file named after the hash of its bucket and key, holding a
+one-line JSON header (key, ETag, size) followed by the raw bytes. Files are written to a
+temporary name and moved in place with os.replace, which is atomic, so several processes can
+share one cache directory and a reader never sees half an entry. The modification time of a
+file is bumped on every hit and the least recently used files are evicted once the directory
+grows over its size budget.
+
+The directory is scanned once, then mirrored in memory (the size of every entry, in order of
+last use), so storing an entry costs no listing of the directory: only the entries evicted
+are touched.
+Entries written or read by other processes sharing the directory are picked up by a new scan
+every ``rescan_interval`` puts.
+"""
+# External imports
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from loguru import logger
+
+DEFAULT_CACHE_MAX_BYTES = 1024**3
+DEFAULT_RESCAN_INTERVAL = 1000  # puts between two scans of the directory
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class S3DiskCache:
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        rescan_interval: int = DEFAULT_RESCAN_INTERVAL,
+    ) -> None:
+        """
+        Initialize the cache.
+        :param cache_dir: Directory holding the cached objects, created if needed
+        :param max_bytes: Size budget of the directory; LRU entries are evicted above it
+        :param rescan_interval: Number of puts after which the directory is scanned again,
+            to account for the entries of other processes
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.rescan_interval = rescan_interval
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        # path -> size of every entry, least recently used first; None until the first scan
+        self._entries: OrderedDict[Path, int] | None = None
+        self._total = 0
+        self._puts_since_scan = 0
+
+    def _path(self, bucket: str, key: str) -> Path:
+        digest = hashlib.sha256(f"{bucket}/{key}".encode()).hexdigest()
+        return self.cache_dir / f"{digest}.s3cache"
+
+    def etag(self, bucket: str, key: str) -> str | None:
+        """
+        Return the ETag of the cached copy of an object, or None if it is not cached.
+        """
+        try:
+            with open(self._path(bucket, key), "rb") as f:
+                cached_etag: str = json.loads(f.readline())["etag"]
+            return cached_etag
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def get(self, bucket: str, key: str, etag: str) -> bytes | None:
+        """
+        Return the cached bytes of an object if the cached copy has the given ETag.
+        A hit marks the entry as recently used.
+        """
+        path = self._path(bucket, key)
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                data = f.read() if header["etag"] == etag else None
+        except (OSError, ValueError, KeyError):
+            data = None
+        if data is None:
+            self._record(misses=1)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # evicted meanwhile by another process, the data read is still valid
+        with self._lock:
+            if self._entries is not None and path in self._entries:
+                self._entries.move_to_end(path)
+        self._record(hits=1)
+        return data
+
+    def put(self, bucket: str, key: str, etag: str, data: bytes) -> None:
+        """
+        Store an object atomically, then evict old entries if the budget is exceeded.
+        """
+        if len(data) > self.max_bytes:
+            return
+        header = json.dumps({"key": key, "etag": etag, "size": len(data)}).encode() + b"\n"
+        path = self._path(bucket, key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            if self._entries is None or self._puts_since_scan >= self.rescan_interval:
+                self._scan()
+            else:
+                self._puts_since_scan += 1
+                size = len(header) + len(data)
+                self._total += size - self._entries.pop(path, 0)
+                self._entries[path] = size
+            evicted = self._evict_entries()
+        self._log_evictions(evicted)
+
+    def evict(self) -> None:
+        """
+        Scan the directory and delete the least recently used entries until the cache fits
+        in its size budget.
+        """
+        with self._lock:
+            self._scan()
+            evicted = self._evict_entries()
+        self._log_evictions(evicted)
+
+    def _scan(self) -> None:
+        entries = []
+        for path in self.cache_dir.glob("*.s3cache"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        self._entries = OrderedDict((path, size) for _, path, size in sorted(entries))
+        self._total = sum(self._entries.values())
+        self._puts_since_scan = 0
+
+    def _evict_entries(self) -> int:
+        """
+        Delete the least recently used entries known until the total fits in the budget.
+        """
+        evicted = 0
+        while self._entries and self._total > self.max_bytes:
+            path, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                path.unlink()
+                evicted += 1
+            except OSError:
+                pass  # already removed by another process
+        return evicted
+
+    def _log_evictions(self, evicted: int) -> None:
+        if evicted:
+            self._record(evictions=evicted)
+            logger.debug(f"Evicted {evicted} entries from the S3 cache {self.cache_dir}")
+
+    def record_miss(self) -> None:
+        """
+        Count a lookup answered by S3 rather than by the cache.
+        """
+        self._record(misses=1)
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self.cache_dir.glob("*.s3cache"):
+                path.unlink(missing_ok=True)
+            self._entries = None
+
+    def _record(self, hits: int = 0, misses: int = 0, evictions: int = 0) -> None:
+        with self._lock:
+            self.stats.hits += hits
+            self.stats.misses += misses
+            self.stats.evictions += evictions
+
+    def stats_dict(self) -> dict[str, float]:
+        return {**asdict(self.stats), "hit_rate": self.stats.hit_rate}
@@ -0,0 +1,135 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+JSON and JSON Lines serialization for S3 objects.
+
+Compact output (no indentation, no spaces after separators) is 30 to 50% smaller than the
+indented one, and orjson, when installed, encodes several times faster than the json module.
+Payloads can be gzipped, in which case they are uploaded with ``ContentEncoding: gzip``.
+JSON Lines are produced and consumed as streams of chunks, so an export of millions of records
+is never held in memory as a whole. Decoding recognizes gzip data by its magic number, so
+files written compressed or not are read the same way.
+"""
+# External imports
+from __future__ import annotations
+
+import importlib
+import json
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from types import ModuleType
+from typing import Any
+
+# Imported by name so type checkers see the same Optional type with or without it installed
+orjson: ModuleType | None
+try:
+    orjson = importlib.import_module("orjson")
+except ImportError:  # orjson is optional, the standard library is used without it
+    orjson = None
+
+JsonEncoder = Callable[[Any], bytes]
+JsonDecoder = Callable[[bytes], Any]
+
+GZIP_MAGIC = b"\x1f\x8b"
+GZIP_WBITS = 16 + zlib.MAX_WBITS  # zlib window bits selecting the gzip container
+JSON_LINES_CHUNK_SIZE = 1024 * 1024  # bytes of encoded records gathered before compressing
+
+
+def json_encoder(indent: int | None = None) -> JsonEncoder:
+    """
+    Return the fastest available encoder producing the given layout.
+    :param indent: Spaces per indentation level, None for compact output
+    :return: Callable turning a value into UTF-8 JSON bytes
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_INDENT_2 if indent == 2 else 0
+        dumps = orjson.dumps
+        return lambda data: dumps(data, option=option)
+    separators = (",", ":") if indent is None else None
+    return lambda data: json.dumps(data, indent=indent, separators=separators).encode("utf-8")
+
+
+def json_decoder() -> JsonDecoder:
+    if orjson is not None:
+        loads: JsonDecoder = orjson.loads
+        return loads
+    return json.loads
+
+
+def gunzip_if_compressed(content: bytes) -> bytes:
+    """
+    Decompress gzip data, recognized by its magic number, and return anything else as is.
+    """
+    return zlib.decompress(content, GZIP_WBITS) if content[:2] == GZIP_MAGIC else content
+
+
+def encode_json(
+    data: Any,
+    indent: int | None = None,
+    compress: bool = False,
+    encoder: JsonEncoder | None = None,
+) -> bytes:
+    """
+    Serialize a value to JSON.
+    :param indent: Spaces per indentation level, None for compact output
+    :param compress: Gzip the result
+    :param encoder: Callable turning a value into JSON bytes, replacing the default one
+    :return: The encoded bytes
+    """
+    encoded = (encoder or json_encoder(indent))(data)
+    return zlib.compress(encoded, wbits=GZIP_WBITS) if compress else encoded
+
+
+def encode_json_lines(
+    records: Iterable[Any], compress: bool = False, encoder: JsonEncoder | None = None
+) -> Iterator[bytes]:
+    """
+    Serialize records to JSON Lines lazily, one record per line.
+    :param records: Any iterable of JSON-serializable records, consumed once
+    :param compress: Gzip the stream
+    :param encoder: Callable turning a record into compact JSON bytes
+    :return: Iterator over chunks of the encoded stream
+    """
+    encode = encoder or json_encoder()
+    compressor = zlib.compressobj(wbits=GZIP_WBITS) if compress else None
+    buffer = bytearray()
+    for record in records:
+        buffer += encode(record)
+        buffer += b"\n"
+        if len(buffer) >= JSON_LINES_CHUNK_SIZE:
+            yield compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+    if compressor:
+        yield compressor.compress(bytes(buffer)) + compressor.flush()
+    elif buffer:
+        yield bytes(buffer)
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Split a stream of chunks into its non-empty lines, gunzipping it on the fly if the
+    first chunk starts with the gzip magic number.
+    """
+    decompressor = None
+    pending = b""
+    for index, chunk in enumerate(chunks):
+        if index == 0 and chunk[:2] == GZIP_MAGIC:
+            decompressor = zlib.decompressobj(GZIP_WBITS)
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        *lines, pending = (pending + chunk).split(b"\n")
+        yield from (line for line in lines if line.strip())
+    if decompressor is not None:
+        *lines, pending = (pending + decompressor.flush()).split(b"\n")
+        yield from (line for line in lines if line.strip())
+    if pending.strip():
+        yield pending
+
+
+def decode_json_lines(content: bytes, decoder: JsonDecoder | None = None) -> list[Any]:
+    """
+    Parse a whole JSON Lines file, gzipped or not, into the list of its records.
+    """
+    decode = decoder or json_decoder()
+    return [decode(line) for line in iter_lines([content])]
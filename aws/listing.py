@@ -0,0 +1,148 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+"""
+# External imports
+from __future__ import annotations
+
+import string
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any
+
+# Internal imports
+from aws.transfer import call_with_retry
+
+DEFAULT_LIST_WORKERS = 8
+# First characters used to split a flat prefix into shards when probing finds no subfolders
+DEFAULT_SHARD_ALPHABET = string.digits + string.ascii_letters
+DEFAULT_PROBE_PAGES = 5
+
+
+def list_pages(
+    s3_client: Any,
+    bucket: str,
+    prefix: str,
+    delimiter: str | None = None,
+    start_after: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield the raw ``list_objects_v2`` responses for a prefix, following pagination.
+    :param prefix: The key prefix to list
+    :param delimiter: Group keys sharing a prefix up to this character in CommonPrefixes
+    :param start_after: Only list keys strictly greater than this one
+    :return: Iterator over the response pages
+    """
+    is_truncated = True  # Pagination flag
+    continuation_token = None  # Continuation token for pagination
+    list_kwargs: dict[str, Any] = {
+        "Bucket": bucket,
+        "Prefix": prefix,
+        "MaxKeys": 1000,  # Set to 1000 (AWS limit per request)
+        "ContinuationToken": continuation_token,
+    }
+    if delimiter is not None:
+        list_kwargs["Delimiter"] = delimiter
+    if start_after is not None:
+        list_kwargs["StartAfter"] = start_after
+
+    while is_truncated:
+        list_kwargs["ContinuationToken"] = continuation_token
+        if list_kwargs["ContinuationToken"] is None:
+            list_kwargs.pop("ContinuationToken", None)
+
+        response = call_with_retry(s3_client.list_objects_v2, **list_kwargs)
+        yield response
+
+        # Check if more files are available
+        is_truncated = response.get("IsTruncated", False)
+
+        # Update continuation token if more files are available
+        continuation_token = response.get("NextContinuationToken", None)
+
+
+def iter_objects(
+    s3_client: Any,
+    bucket: str,
+    prefix: str,
+    start_after: str | None = None,
+    stop_at: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield the listing entries (Key, Size, ETag, LastModified) of every object under a
+    prefix, page by page, optionally restricted to the key range (start_after, stop_at].
+    """
+    for response in list_pages(s3_client, bucket, prefix, start_after=start_after):
+        for obj in response.get("Contents", []):
+            if stop_at is not None and obj["Key"] > stop_at:
+                return
+            yield obj
+
+
+def probe_shard_boundaries(
+    s3_client: Any, bucket: str, prefix: str, max_pages: int = DEFAULT_PROBE_PAGES
+) -> list[str]:
+    """
+    Find the subfolders of a prefix with a Delimiter listing, to use them as shard bounds.
+    Only the first ``max_pages`` pages are read so that probing a huge flat prefix stays cheap.
+    :return: Sorted list of subfolder prefixes
+    """
+    boundaries: list[str] = []
+    pages = list_pages(s3_client, bucket, prefix, delimiter="/")
+    for _, response in zip(range(max_pages), pages):
+        boundaries.extend(p["Prefix"] for p in response.get("CommonPrefixes", []))
+    return boundaries
+
+
+def iter_objects_sharded(
+    s3_client: Any,
+    bucket: str,
+    prefix: str,
+    alphabet: str | None = None,
+    max_workers: int = DEFAULT_LIST_WORKERS,
+) -> Iterator[dict[str, Any]]:
+    """
+    List a prefix as several key ranges fetched concurrently, yielding entries in key order.
+
+    The keyspace is cut at ``prefix + c`` for every character of ``alphabet`` or, without an
+    alphabet, at the subfolders found by a Delimiter probe (falling back to letters and
+    digits for flat prefixes). Each shard covers (bound_i, bound_i+1], so every key belongs
+    to exactly one shard whatever characters it contains, and concatenating the shards in
+    order gives the same sequence as a sequential listing.
+    :param prefix: The key prefix to list
+    :param alphabet: Characters at which to split the keyspace after the prefix
+    :param max_workers: Number of shards listed concurrently, and held in memory at most
+    :return: Iterator over the listing entries, in key order
+    """
+    if alphabet is not None:
+        boundaries = sorted({prefix + c for c in alphabet})
+    else:
+        boundaries = probe_shard_boundaries(s3_client, bucket, prefix)
+        if len(boundaries) < 2:
+            boundaries = sorted(prefix + c for c in DEFAULT_SHARD_ALPHABET)
+    ranges = list(zip([None, *boundaries], [*boundaries, None]))
+
+    def list_shard(bounds: tuple[str | None, str | None]) -> list[dict[str, Any]]:
+        start_after, stop_at = bounds
+        return list(iter_objects(s3_client, bucket, prefix, start_after, stop_at))
+
+    # At most max_workers shards are listed or waiting to be yielded at a time, so memory is
+    # bounded by the size of max_workers shards, not by the whole listing
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = iter(ranges)
+        window: deque[Future[list[dict[str, Any]]]] = deque(
+            executor.submit(list_shard, bounds) for bounds in islice(pending, max_workers)
+        )
+        try:
+            while window:
+                # Shards are yielded in submission order, which is key order
+                shard = window.popleft().result()
+                for bounds in islice(pending, 1):
+                    window.append(executor.submit(list_shard, bounds))
+                yield from shard
+                del shard
+        finally:
+            for future in window:  # the caller stopped early
+                future.cancel()
@@ -0,0 +1,149 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+In-process memoization of decoded S3 objects.
+
+Decoding (unpickling a model, gunzipping a file, opening an image) often costs more than the
+download itself. Decoded values are kept per key together with the ETag of the bytes they were
+decoded from. Within the TTL they are returned without any request. Past it, a conditional GET
+revalidates the ETag, and the value is reused as long as S3 answers 304. The total size of the
+values is capped by a memory budget, evicting the least recently used ones first.
+
+Memoized values are shared between callers, so they must be treated as read-only.
+"""
+# External imports
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import pandas as pd
+from PIL import Image
+
+# Internal imports
+from config import settings
+
+
+@dataclass
+class MemoEntry:
+    value: Any
+    etag: str
+    size: int
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+def approximate_size(value: Any, raw_size: int) -> int:
+    """
+    Estimate the memory held by a decoded value, falling back to the size of its raw bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    return max(raw_size, sys.getsizeof(value))
+
+
+class DecodedObjectCache:
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        """
+        Initialize the cache.
+        :param max_bytes: Memory budget of the cached values, by approximate size
+        :param ttl: Seconds during which a value is returned without revalidation
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.folders: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, MemoEntry] = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def memoize_folder(self, folder: str) -> None:
+        """
+        Memoize every download from this folder and its subfolders by default.
+        """
+        self.folders.add(folder.rstrip("/"))
+
+    def covers(self, key: str) -> bool:
+        return any(key.startswith(f"{folder}/") for folder in self.folders)
+
+    def get(self, key: str) -> MemoEntry | None:
+        """
+        Return the entry of a key, expired or not, marking it as recently used.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def refresh(self, key: str) -> None:
+        """
+        Start a new TTL for an entry whose ETag was just revalidated.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl
+
+    def put(self, key: str, etag: str, value: Any, raw_size: int) -> None:
+        """
+        Store a decoded value, then evict the least recently used ones above the budget.
+        Values larger than the whole budget are not stored.
+        """
+        size = approximate_size(value, raw_size)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total -= previous.size
+            self._entries[key] = MemoEntry(value, etag, size, time.monotonic() + self.ttl)
+            self._total += size
+            while self._total > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total -= evicted.size
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+    @property
+    def size(self) -> int:
+        return self._total
+
+
+_shared_cache: DecodedObjectCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_memo_cache() -> DecodedObjectCache:
+    """
+    Return the process-wide cache of decoded objects, shared by all S3Managers so that a hot
+    object is decoded once per process even when managers are short-lived.
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = DecodedObjectCache(settings.S3_MEMO_MAX_BYTES, settings.S3_MEMO_TTL)
+        return _shared_cache
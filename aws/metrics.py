@@ -0,0 +1,351 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Per-operation metrics and tracing hooks for S3Manager.
+
+Every instrumented call produces an OperationRecord: operation name, start time, duration,
+payload size, status and number of retried requests. Records are aggregated per operation
+into call counts by status, retry and byte totals, and latency and size histograms, which
+can be read as a dict or exported in the Prometheus text format. Hooks receive each record
+as it is produced, e.g. to open tracing spans, and calls slower than a threshold are logged.
+
+Metrics are off unless a collector is given to the manager (or settings.S3_METRICS is set):
+a disabled call costs one attribute lookup.
+
+Only the outermost instrumented call is recorded: the calls a method makes to other
+instrumented methods, e.g. rename_s3_folder to copy_s3_folder and delete_many, are part of
+it, and their retries are counted in its record instead of being recorded a second time.
+
+    metrics = S3Metrics(slow_threshold=2.0)
+    s3_manager = S3Manager(metrics=metrics)
+    ...
+    print(metrics.to_prometheus())
+
+Statuses are "ok", "error" (the method returned None or 1), "partial" (a TransferReport
+with failures) and "exception" (the method raised).
+"""
+# External imports
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from loguru import logger
+
+# Internal imports
+from aws.transfer import TransferReport, retry_listener
+from config import settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Set while an instrumented call runs, in its thread and the workers it starts
+_in_operation: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "in_s3_operation", default=False
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = tuple(1024 * 4**n for n in range(11))  # 1 KiB to 1 GiB
+
+
+@dataclass
+class OperationRecord:
+    operation: str
+    started_at: float  # epoch seconds
+    duration: float  # seconds
+    size: int | None  # payload bytes, None when unknown
+    status: str
+    retries: int = 0
+    error: str | None = None
+
+
+OperationHook = Callable[[OperationRecord], None]
+
+
+class Histogram:
+    def __init__(self, buckets: Iterable[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """
+        Return the (upper bound, count of values below it) pairs, Prometheus style.
+        """
+        pairs, total = [], 0
+        for bound, count in zip((*map(_format_number, self.buckets), "+Inf"), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "buckets": dict(self.cumulative()),
+            "sum": self.sum,
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+        }
+
+
+@dataclass
+class OperationStats:
+    calls: Counter = field(default_factory=Counter)  # by status
+    retries: int = 0
+    bytes: int = 0
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    size: Histogram = field(default_factory=lambda: Histogram(SIZE_BUCKETS))
+
+
+class S3Metrics:
+    def __init__(
+        self, slow_threshold: float | None = None, hooks: Iterable[OperationHook] = ()
+    ) -> None:
+        """
+        Initialize an empty collector.
+        :param slow_threshold: Duration in seconds above which a call is logged as slow
+        :param hooks: Callables receiving every OperationRecord, e.g. to export traces
+        """
+        self.slow_threshold = slow_threshold
+        self.hooks = list(hooks)
+        self._stats: dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: OperationHook) -> None:
+        self.hooks.append(hook)
+
+    def record(self, record: OperationRecord) -> None:
+        """
+        Aggregate a finished call, log it if slow and hand it to the hooks.
+        """
+        with self._lock:
+            stats = self._stats.setdefault(record.operation, OperationStats())
+            stats.calls[record.status] += 1
+            stats.retries += record.retries
+            stats.latency.observe(record.duration)
+            if record.size is not None:
+                stats.bytes += record.size
+                stats.size.observe(record.size)
+        if self.slow_threshold is not None and record.duration >= self.slow_threshold:
+            logger.warning(
+                f"Slow S3 operation {record.operation}: {record.duration:.3f}s, "
+                f"status {record.status}, {record.retries} retries"
+            )
+        for hook in self.hooks:
+            try:
+                hook(record)
+            except Exception as e:
+                logger.error(f"Metrics hook {hook!r} failed: {e}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Return the metrics of every operation seen so far as plain data.
+        """
+        with self._lock:
+            return {
+                operation: {
+                    "calls": dict(stats.calls),
+                    "retries": stats.retries,
+                    "bytes": stats.bytes,
+                    "latency_seconds": stats.latency.to_dict(),
+                    "size_bytes": stats.size.to_dict(),
+                }
+                for operation, stats in sorted(self._stats.items())
+            }
+
+    def to_prometheus(self, prefix: str = "s3") -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        :param prefix: Prefix of the metric names
+        """
+        lines = [
+            f"# HELP {prefix}_operations_total S3Manager calls by operation and status.",
+            f"# TYPE {prefix}_operations_total counter",
+        ]
+        with self._lock:
+            stats_items = sorted(self._stats.items())
+            for operation, stats in stats_items:
+                for status, count in sorted(stats.calls.items()):
+                    labels = f'operation="{operation}",status="{status}"'
+                    lines.append(f"{prefix}_operations_total{{{labels}}} {count}")
+            lines += [
+                f"# HELP {prefix}_operation_retries_total Requests retried within S3Manager calls.",
+                f"# TYPE {prefix}_operation_retries_total counter",
+            ]
+            for operation, stats in stats_items:
+                lines.append(
+                    f'{prefix}_operation_retries_total{{operation="{operation}"}} {stats.retries}'
+                )
+            for name, attribute, help_text in (
+                ("operation_duration_seconds", "latency", "Duration of S3Manager calls."),
+                ("operation_payload_bytes", "size", "Payload size of S3Manager calls."),
+            ):
+                lines += [
+                    f"# HELP {prefix}_{name} {help_text}",
+                    f"# TYPE {prefix}_{name} histogram",
+                ]
+                for operation, stats in stats_items:
+                    histogram = getattr(stats, attribute)
+                    for bound, count in histogram.cumulative():
+                        labels = f'operation="{operation}",le="{bound}"'
+                        lines.append(f"{prefix}_{name}_bucket{{{labels}}} {count}")
+                    labels = f'operation="{operation}"'
+                    lines.append(
+                        f"{prefix}_{name}_sum{{{labels}}} {_format_number(histogram.sum)}"
+                    )
+                    lines.append(f"{prefix}_{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+_metrics: S3Metrics | None = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> S3Metrics:
+    """
+    Return the process-wide collector, created on first use from the settings.
+    """
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = S3Metrics(slow_threshold=settings.S3_SLOW_OPERATION_SECONDS)
+        return _metrics
+
+
+def payload_size(value: Any) -> int | None:
+    """
+    Return the number of bytes a value carries, when it is a byte string, text or a report.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return value.nbytes if isinstance(value, memoryview) else len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, TransferReport):
+        return value.bytes_transferred
+    return None
+
+
+def call_status(result: Any) -> str:
+    if result is None or (type(result) is int and result == 1):
+        return "error"
+    if isinstance(result, TransferReport) and not result.ok:
+        return "partial"
+    return "ok"
+
+
+def instrumented(payload: str | None = None) -> Callable[[F], F]:
+    """
+    Decorate an S3Manager method so every call is recorded by ``self.metrics``, if set.
+    Generator methods are timed from the first item to exhaustion.
+    :param payload: Name of the argument whose size is recorded, e.g. the uploaded data;
+        by default the size of the returned value is
+    """
+
+    def decorator(func: F) -> F:
+        operation = func.__name__
+        signature = inspect.signature(func)
+
+        def size_of(self: Any, args: tuple, kwargs: dict, result: Any) -> int | None:
+            if payload is None:
+                return payload_size(result)
+            return payload_size(signature.bind(self, *args, **kwargs).arguments.get(payload))
+
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def generator_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+                metrics = self.metrics
+                # A generator runs in its consumer's context between items, so it does not
+                # set _in_operation, which would hide the consumer's own calls
+                if metrics is None or _in_operation.get():
+                    return (yield from func(self, *args, **kwargs))
+                started_at, start = time.time(), time.perf_counter()
+                status, error = "ok", None
+                try:
+                    return (yield from func(self, *args, **kwargs))
+                except Exception as e:
+                    status, error = "exception", str(e)
+                    raise
+                finally:
+                    metrics.record(
+                        OperationRecord(
+                            operation,
+                            started_at,
+                            time.perf_counter() - start,
+                            None,
+                            status,
+                            error=error,
+                        )
+                    )
+
+            return generator_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            metrics = self.metrics
+            if metrics is None or _in_operation.get():
+                return func(self, *args, **kwargs)
+            retries = 0
+
+            def count_retry(error: Exception) -> None:
+                nonlocal retries
+                retries += 1
+
+            token = retry_listener.set(count_retry)
+            operation_token = _in_operation.set(True)
+            started_at, start = time.time(), time.perf_counter()
+            try:
+                result = func(self, *args, **kwargs)
+            except Exception as e:
+                metrics.record(
+                    OperationRecord(
+                        operation,
+                        started_at,
+                        time.perf_counter() - start,
+                        None,
+                        "exception",
+                        retries,
+                        str(e),
+                    )
+                )
+                raise
+            finally:
+                _in_operation.reset(operation_token)
+                retry_listener.reset(token)
+            duration = time.perf_counter() - start
+            metrics.record(
+                OperationRecord(
+                    operation,
+                    started_at,
+                    duration,
+                    size_of(self, args, kwargs, result),
+                    call_status(result),
+                    retries,
+                )
+            )
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,358 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+"""
+# External imports
+from __future__ import annotations
+
+import hashlib
+import itertools
+import math
+import os
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, BinaryIO, TypeVar
+
+from loguru import logger
+
+# Internal imports
+from aws.transfer import (
+    DEFAULT_BACKOFF,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_RETRIES,
+    ProgressCallback,
+    call_with_retry,
+    run_concurrently,
+)
+
+P = TypeVar("P")
+
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 minimum for every part but the last one
+MAX_PARTS = 10_000  # S3 maximum number of parts per upload
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+DEFAULT_MULTIPART_THRESHOLD = 64 * 1024 * 1024
+DEFAULT_PART_WORKERS = 8
+MAX_COPY_SIZE = 5 * 1024**3  # largest object CopyObject accepts in one request
+DEFAULT_COPY_PART_SIZE = 512 * 1024 * 1024  # no data goes through us, so parts can be big
+
+# What can be uploaded: raw bytes (including the memoryview of the "memoryview" codec), a
+# local file path, an open binary file or an iterator of byte chunks of any size (e.g. a
+# generator streaming an export)
+UploadSource = bytes | bytearray | memoryview | os.PathLike | BinaryIO | Iterable[bytes]
+
+
+class MultipartUploadError(RuntimeError):
+    """
+    Raised when some parts of a multipart upload could not be sent, after retries.
+    """
+
+
+def is_upload_source(data: Any) -> bool:
+    """
+    Tell whether a value can be uploaded as is, without encoding it first.
+    Iterators are taken to yield bytes; other iterables such as lists or dicts are not.
+    """
+    return isinstance(data, (bytes, bytearray, memoryview, os.PathLike, Iterator)) or hasattr(
+        data, "read"
+    )
+
+
+def source_size(source: UploadSource) -> int | None:
+    """
+    Return the size of an upload source in bytes, or None if it is only known once read.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).nbytes
+    if isinstance(source, os.PathLike):
+        return os.path.getsize(source)
+    return None
+
+
+def iter_parts(source: UploadSource, part_size: int) -> Iterator[bytes]:
+    """
+    Cut any upload source into chunks of exactly ``part_size`` bytes (the last one may be
+    shorter). Only one part is held in memory at a time for files and iterators.
+    :param source: The data to upload
+    :param part_size: Size of every part in bytes
+    :return: Iterator over the parts
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source).cast("B")
+        for start in range(0, len(view), part_size):
+            yield bytes(view[start : start + part_size])
+        return
+    if isinstance(source, os.PathLike):
+        with open(source, "rb") as f:
+            yield from iter_parts(f, part_size)
+        return
+
+    chunks: Iterable[bytes]
+    if hasattr(source, "read"):
+        read = source.read
+        chunks = iter(lambda: read(part_size), b"")
+    else:
+        chunks = source
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def upload_part_size(size: int, part_size: int = DEFAULT_PART_SIZE) -> int:
+    """
+    Part size actually used for an object of ``size`` bytes, grown so it fits in MAX_PARTS.
+    """
+    return max(part_size, math.ceil(size / MAX_PARTS))
+
+
+def local_etag(
+    path: os.PathLike,
+    part_size: int = DEFAULT_PART_SIZE,
+    multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
+) -> str:
+    """
+    Compute the ETag S3 would give a local file uploaded by ``upload_object``: the MD5 of
+    the content for a single PUT, the MD5 of the part MD5s suffixed by the number of parts
+    for a multipart upload.
+    :param path: The local file
+    :return: The ETag, quoted like the ones returned by S3
+    """
+    size = os.path.getsize(path)
+    if size <= multipart_threshold:
+        digest = hashlib.md5(usedforsecurity=False)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return f'"{digest.hexdigest()}"'
+    part_digests = [
+        hashlib.md5(part, usedforsecurity=False).digest()
+        for part in iter_parts(path, upload_part_size(size, part_size))
+    ]
+    combined = hashlib.md5(b"".join(part_digests), usedforsecurity=False).hexdigest()
+    return f'"{combined}-{len(part_digests)}"'
+
+
+def upload_object(
+    s3_client: Any,
+    bucket: str,
+    key: str,
+    source: UploadSource,
+    content_type: str | None = None,
+    part_size: int = DEFAULT_PART_SIZE,
+    multipart_threshold: int = DEFAULT_MULTIPART_THRESHOLD,
+    max_workers: int = DEFAULT_PART_WORKERS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    progress_callback: ProgressCallback | None = None,
+    content_encoding: str | None = None,
+) -> int:
+    """
+    Upload an object with a single PUT below ``multipart_threshold`` and with a parallel
+    multipart upload above it. Sources of unknown size are buffered up to the threshold to
+    make that choice.
+    :param content_encoding: ContentEncoding stored with the object, e.g. "gzip"
+    :return: Number of bytes uploaded
+    """
+    if part_size < MIN_PART_SIZE:
+        raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+    size = source_size(source)
+    if size is not None:
+        part_size = upload_part_size(size, part_size)
+    extra_args = {"ContentType": content_type} if content_type else {}
+    if content_encoding:
+        extra_args["ContentEncoding"] = content_encoding
+
+    parts = iter_parts(source, part_size)
+    head: list[bytes] = []
+    buffered = 0
+    for part in parts:
+        head.append(part)
+        buffered += len(part)
+        if buffered > multipart_threshold:
+            break
+    else:
+        # The whole source fits under the threshold: one request is cheapest
+        call_with_retry(
+            s3_client.put_object,
+            Bucket=bucket,
+            Key=key,
+            Body=b"".join(head),
+            max_retries=max_retries,
+            backoff=backoff,
+            **extra_args,
+        )
+        return buffered
+
+    return multipart_upload(
+        s3_client,
+        bucket,
+        key,
+        itertools.chain(head, parts),
+        extra_args=extra_args,
+        max_workers=max_workers,
+        max_retries=max_retries,
+        backoff=backoff,
+        progress_callback=progress_callback,
+    )
+
+
+def multipart_upload(
+    s3_client: Any,
+    bucket: str,
+    key: str,
+    parts: Iterable[bytes],
+    extra_args: dict[str, Any] | None = None,
+    max_workers: int = DEFAULT_PART_WORKERS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    progress_callback: ProgressCallback | None = None,
+) -> int:
+    """
+    Send the parts of an object concurrently, retrying each part on its own.
+    If any part still fails the upload is aborted so no orphaned parts are left billed.
+    :return: Number of bytes uploaded
+    """
+
+    def send(upload_id: str, part_number: int, body: bytes) -> tuple[str, int]:
+        response = call_with_retry(
+            s3_client.upload_part,
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+            max_retries=max_retries,
+            backoff=backoff,
+        )
+        return response["ETag"], len(body)
+
+    return _run_multipart(
+        s3_client, bucket, key, parts, send, extra_args, max_workers, progress_callback
+    )
+
+
+def copy_object(
+    s3_client: Any,
+    bucket: str,
+    source_key: str,
+    key: str,
+    size: int,
+    multipart_threshold: int = MAX_COPY_SIZE,
+    part_size: int = DEFAULT_COPY_PART_SIZE,
+    max_workers: int = DEFAULT_PART_WORKERS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+) -> int:
+    """
+    Copy an object server-side, with a single CopyObject up to ``multipart_threshold`` and
+    with concurrent UploadPartCopy ranges above it (CopyObject is limited to 5 GB).
+    :param size: Size of the source object in bytes, as returned by the listing
+    :return: Number of bytes copied
+    """
+    copy_source = {"Bucket": bucket, "Key": source_key}
+    if size <= multipart_threshold:
+        call_with_retry(
+            s3_client.copy_object,
+            Bucket=bucket,
+            CopySource=copy_source,
+            Key=key,
+            max_retries=max_retries,
+            backoff=backoff,
+        )
+        return size
+
+    # Unlike CopyObject, a multipart upload does not carry the source metadata over
+    head = call_with_retry(s3_client.head_object, Bucket=bucket, Key=source_key)
+    extra_args = {"ContentType": head["ContentType"]} if head.get("ContentType") else {}
+    if head.get("ContentEncoding"):
+        extra_args["ContentEncoding"] = head["ContentEncoding"]
+    if head.get("Metadata"):
+        extra_args["Metadata"] = head["Metadata"]
+    part_size = upload_part_size(size, part_size)
+    ranges = ((start, min(start + part_size, size) - 1) for start in range(0, size, part_size))
+
+    def send(upload_id: str, part_number: int, byte_range: tuple[int, int]) -> tuple[str, int]:
+        start, end = byte_range
+        response = call_with_retry(
+            s3_client.upload_part_copy,
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            CopySource=copy_source,
+            CopySourceRange=f"bytes={start}-{end}",
+            max_retries=max_retries,
+            backoff=backoff,
+        )
+        return response["CopyPartResult"]["ETag"], end - start + 1
+
+    return _run_multipart(s3_client, bucket, key, ranges, send, extra_args, max_workers, None)
+
+
+def _run_multipart(
+    s3_client: Any,
+    bucket: str,
+    key: str,
+    parts: Iterable[P],
+    send: Callable[[str, int, P], tuple[str, int]],
+    extra_args: dict[str, Any] | None,
+    max_workers: int,
+    progress_callback: ProgressCallback | None,
+) -> int:
+    """
+    Drive a multipart upload: create it, run ``send`` concurrently on every numbered part,
+    then complete it, or abort it if any part failed or the caller was interrupted.
+    :param send: Callable (upload id, part number, part) -> (ETag, number of bytes)
+    :return: Number of bytes transferred
+    """
+    upload_id = call_with_retry(
+        s3_client.create_multipart_upload, Bucket=bucket, Key=key, **(extra_args or {})
+    )["UploadId"]
+    etags: dict[int, str] = {}
+    failed = threading.Event()
+
+    def send_part(item: tuple[int, P]) -> int:
+        part_number, part = item
+        try:
+            etag, transferred = send(upload_id, part_number, part)
+        except Exception:
+            failed.set()
+            raise
+        etags[part_number] = etag
+        return transferred
+
+    # Stop reading the source as soon as one part is lost
+    numbered_parts = itertools.takewhile(lambda _: not failed.is_set(), enumerate(parts, 1))
+    try:
+        report = run_concurrently(
+            numbered_parts,
+            send_part,
+            max_workers=max_workers,
+            max_in_flight=max_workers,  # bounds memory to max_workers parts
+            progress_callback=progress_callback,
+            describe=lambda item: str(item[0]),
+        )
+        if not report.ok:
+            raise MultipartUploadError(f"Failed to upload parts of '{key}': {report.failed}")
+        call_with_retry(
+            s3_client.complete_multipart_upload,
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [{"ETag": etags[n], "PartNumber": n} for n in sorted(etags)]
+            },
+        )
+    except BaseException:
+        try:
+            call_with_retry(
+                s3_client.abort_multipart_upload, Bucket=bucket, Key=key, UploadId=upload_id
+            )
+        except Exception as e:
+            logger.error(f"Could not abort multipart upload {upload_id} of '{key}': {e}")
+        raise
+    return report.bytes_transferred
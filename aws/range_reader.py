@@ -0,0 +1,189 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Seekable, read-only file object over an S3 object, backed by ranged GET requests.
+
+Readers that seek to the parts they need, like pyarrow reading a Parquet footer and then
+only the projected column chunks, or zipfile reading the central directory and then one
+member, fetch those bytes instead of the whole object. Every range request is made with
+If-Match on the ETag seen when the reader was opened, so an object replaced while it is being
+read fails with PreconditionFailed instead of mixing versions.
+
+The object is read in aligned blocks. The last blocks read are kept in an LRU cache, so the
+many small reads of parsers hit memory, and once reads are found to be sequential the next
+blocks are fetched in the same request. Reads spanning more blocks than the cache holds
+bypass it with a single request.
+
+    with S3RangeReader(s3_client, bucket, "archives/a.zip") as reader:
+        names = zipfile.ZipFile(reader).namelist()
+"""
+# External imports
+from __future__ import annotations
+
+import io
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from typing import Any
+
+# Internal imports
+from aws.transfer import call_with_retry
+
+DEFAULT_BLOCK_SIZE = 256 * 1024
+DEFAULT_CACHE_BLOCKS = 32
+DEFAULT_READ_AHEAD_BLOCKS = 4
+
+
+class S3RangeReader(io.RawIOBase):
+    def __init__(
+        self,
+        s3_client: Any,
+        bucket: str,
+        key: str,
+        size: int | None = None,
+        etag: str | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+        read_ahead_blocks: int = DEFAULT_READ_AHEAD_BLOCKS,
+    ) -> None:
+        """
+        Open an object for reading. Without ``size`` and ``etag`` a HEAD request finds them.
+        :param s3_client: The boto3 S3 client
+        :param bucket: The bucket of the object
+        :param key: The full key of the object
+        :param size: Size of the object in bytes, e.g. from a listing
+        :param etag: ETag of the object, e.g. from a listing
+        :param block_size: Size of the blocks the object is fetched and cached by
+        :param cache_blocks: Number of recently read blocks kept in memory
+        :param read_ahead_blocks: Blocks fetched past a sequential read; 0 disables it
+        """
+        super().__init__()
+        self.size: int
+        self.etag: str
+        if size is None or etag is None:
+            head = call_with_retry(s3_client.head_object, Bucket=bucket, Key=key)
+            self.size, self.etag = head["ContentLength"], head["ETag"]
+        else:
+            self.size, self.etag = size, etag
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.read_ahead_blocks = read_ahead_blocks
+        self.requests = 0
+        self.bytes_fetched = 0
+        self._pos = 0
+        self._last_end = -1  # where the previous read stopped, to detect sequential reads
+        self._blocks: OrderedDict[int, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._pos = position
+        return position
+
+    def read(self, size: int | None = -1) -> bytes:
+        """
+        Read up to ``size`` bytes from the current position, all the rest by default.
+        """
+        remaining = self.size - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b""
+        start, end = self._pos, self._pos + size
+        with self._lock:
+            data = self._read_blocks(start, end)
+            self._last_end = end
+        self._pos = end
+        return data
+
+    def _read_blocks(self, start: int, end: int) -> bytes:
+        """
+        Return the bytes ``start`` to ``end`` (excluded) from cached and newly fetched blocks.
+        """
+        first, last = start // self.block_size, (end - 1) // self.block_size
+        if last - first + 1 > self.cache_blocks:
+            # Caching would evict everything for blocks unlikely to be read again
+            return self._fetch(start, end - 1)
+
+        # Blocks of this read, taken out before storing new blocks can evict them
+        blocks = {}
+        missing = []
+        for index in range(first, last + 1):
+            if index in self._blocks:
+                self._blocks.move_to_end(index)
+                blocks[index] = self._blocks[index]
+            else:
+                missing.append(index)
+        if missing:
+            fetch_last = missing[-1]
+            if start == self._last_end and self.read_ahead_blocks:
+                # Never read so far ahead that the blocks asked for get evicted
+                read_ahead = min(self.read_ahead_blocks, self.cache_blocks - (last - first + 1))
+                fetch_last = min(fetch_last + read_ahead, (self.size - 1) // self.block_size)
+            # One request from the first missing block, cached blocks in between included
+            fetch_start = missing[0] * self.block_size
+            data = self._fetch(fetch_start, min((fetch_last + 1) * self.block_size, self.size) - 1)
+            for offset in range(0, len(data), self.block_size):
+                index = missing[0] + offset // self.block_size
+                block = data[offset : offset + self.block_size]
+                self._store(index, block)
+                if index <= last:
+                    blocks[index] = block
+
+        offset = first * self.block_size
+        chunks = (blocks[index] for index in range(first, last + 1))
+        return b"".join(chunks)[start - offset : end - offset]
+
+    def _store(self, index: int, block: bytes) -> None:
+        self._blocks[index] = block
+        self._blocks.move_to_end(index)
+        while len(self._blocks) > self.cache_blocks:
+            self._blocks.popitem(last=False)
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def _fetch(self, start: int, end: int) -> bytes:
+        """
+        Fetch the bytes ``start`` to ``end`` included with one ranged GET, retried with the
+        body read so a connection dropped mid-body is retried too.
+        """
+        data = call_with_retry(self._get_range, start, end)
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        return data
+
+    def _get_range(self, start: int, end: int) -> bytes:
+        response = self.s3_client.get_object(
+            Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end}", IfMatch=self.etag
+        )
+        with closing(response["Body"]) as body:
+            data: bytes = body.read()
+        return data
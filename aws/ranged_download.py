@@ -0,0 +1,229 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Parallel download of one large object by byte ranges.
+
+A single GET stream is limited to the throughput of one connection. Here the object is cut
+into ranges fetched concurrently, each written straight to its offset in a preallocated
+``.part`` file with os.pwrite, so memory stays at one chunk per worker whatever the size.
+Every range request carries If-Match on the ETag read at the start: an object replaced
+mid-download fails instead of producing a mix of versions.
+
+The ranges already written are recorded in a ``.part.json`` state file next to the partial
+file. A download interrupted by an error or a crash resumes with the missing ranges only, as
+long as the object still has the same ETag. Once complete, the file is checked against the
+object's size and, when it can be recomputed, its ETag, then moved to its final name.
+"""
+# External imports
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+# Internal imports
+from aws.multipart import local_etag
+from aws.transfer import (
+    DEFAULT_BACKOFF,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_RETRIES,
+    ProgressCallback,
+    call_with_retry,
+    run_concurrently,
+)
+
+DEFAULT_RANGE_SIZE = 16 * 1024 * 1024
+DEFAULT_RANGE_WORKERS = 8
+MIB = 1024 * 1024
+# Part sizes of the usual uploaders: S3 minimum, boto3 and CLI default, upload_object default...
+COMMON_PART_SIZES = tuple(n * MIB for n in (5, 8, 15, 16, 32, 64, 100, 128, 256, 512))
+
+
+class RangedDownloadError(RuntimeError):
+    """
+    Raised when some ranges could not be downloaded or the result does not match the object.
+    """
+
+
+def expected_etag(path: str, etag: str) -> str | None:
+    """
+    Recompute the ETag of a downloaded file the way S3 computed the object's one.
+    Multipart ETags depend on the part size chosen by the uploader, which is unknown: the
+    usual SDK part sizes giving the right number of parts are all tried, in a single read.
+    :return: The recomputed ETag, the object's one if any candidate part size matches it,
+        or None if no usual part size gives that number of parts
+    """
+    size = os.path.getsize(path)
+    if "-" not in etag:
+        return local_etag(Path(path), multipart_threshold=size)
+    parts = int(etag.strip('"').split("-")[1])
+    guess = math.ceil(size / parts / MIB) * MIB
+    part_sizes = sorted(
+        {
+            part_size
+            for part_size in (*COMMON_PART_SIZES, guess)
+            if part_size > 0 and math.ceil(size / part_size) == parts
+        }
+    )
+    if not part_sizes:
+        return None
+    etags = _multipart_etags(path, part_sizes)
+    return etag if etag in etags else etags[0]
+
+
+def _multipart_etags(path: str, part_sizes: list[int]) -> list[str]:
+    """
+    Compute the multipart ETags of a file for several part sizes, all multiples of 1 MiB,
+    reading the file once.
+    """
+    hashers = {part_size: hashlib.md5(usedforsecurity=False) for part_size in part_sizes}
+    digests: dict[int, list[bytes]] = {part_size: [] for part_size in part_sizes}
+    position = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(MIB), b""):
+            position += len(chunk)
+            for part_size, hasher in hashers.items():
+                hasher.update(chunk)
+                if position % part_size == 0:
+                    digests[part_size].append(hasher.digest())
+                    hashers[part_size] = hashlib.md5(usedforsecurity=False)
+    etags = []
+    for part_size in part_sizes:
+        if position % part_size:
+            digests[part_size].append(hashers[part_size].digest())
+        combined = hashlib.md5(b"".join(digests[part_size]), usedforsecurity=False).hexdigest()
+        etags.append(f'"{combined}-{len(digests[part_size])}"')
+    return etags
+
+
+def _load_state(state_path: str, part_path: str, etag: str, size: int, range_size: int) -> set:
+    """
+    Return the ranges already written by an earlier attempt on the same object version.
+    """
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    if (
+        (state.get("etag"), state.get("size"), state.get("range_size")) != (etag, size, range_size)
+        or not os.path.exists(part_path)
+        or os.path.getsize(part_path) != size
+    ):
+        return set()
+    return set(state.get("done", []))
+
+
+def _save_state(state_path: str, etag: str, size: int, range_size: int, done: set) -> None:
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"etag": etag, "size": size, "range_size": range_size, "done": sorted(done)}, f)
+    os.replace(tmp_path, state_path)
+
+
+def download_in_ranges(
+    s3_client: Any,
+    bucket: str,
+    key: str,
+    local_path: str,
+    range_size: int = DEFAULT_RANGE_SIZE,
+    max_workers: int = DEFAULT_RANGE_WORKERS,
+    resume: bool = True,
+    verify: bool = True,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    progress_callback: ProgressCallback | None = None,
+) -> int:
+    """
+    Download an object to a local file with concurrent ranged GETs.
+    :param range_size: Size of the byte range fetched by each request
+    :param max_workers: Number of ranges downloaded concurrently
+    :param resume: Reuse the ranges of a previous interrupted download of the same version
+    :param verify: Recompute the ETag of the result and compare it with the object's
+    :param max_retries: Retries per range on transient errors
+    :param backoff: Base delay in seconds between retries
+    :param progress_callback: Called with a TransferProgress after every range
+    :return: Number of bytes downloaded by this call, resumed ranges excluded
+    """
+    head = call_with_retry(
+        s3_client.head_object, Bucket=bucket, Key=key, max_retries=max_retries, backoff=backoff
+    )
+    size, etag = head["ContentLength"], head["ETag"]
+    part_path, state_path = f"{local_path}.part", f"{local_path}.part.json"
+    os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+
+    done = _load_state(state_path, part_path, etag, size, range_size) if resume else set()
+    if done:
+        logger.info(f"Resuming download of '{key}': {len(done)} ranges already on disk")
+    else:
+        # Reserve the whole file up front: no fragmentation, and every range has its offset
+        with open(part_path, "wb") as f:
+            f.truncate(size)
+            if hasattr(os, "posix_fallocate") and size:
+                os.posix_fallocate(f.fileno(), 0, size)
+        _save_state(state_path, etag, size, range_size, done)
+
+    count = math.ceil(size / range_size)
+    lock = threading.Lock()
+    fd = os.open(part_path, os.O_WRONLY)
+
+    def fetch(index: int) -> int:
+        start = index * range_size
+        end = min(start + range_size, size) - 1
+        response = s3_client.get_object(
+            Bucket=bucket, Key=key, Range=f"bytes={start}-{end}", IfMatch=etag
+        )
+        offset = start
+        with closing(response["Body"]) as body:
+            for chunk in iter(lambda: body.read(DEFAULT_CHUNK_SIZE), b""):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+        if offset != end + 1:
+            raise RangedDownloadError(f"Range {start}-{end} of '{key}' ended at {offset}")
+        return offset - start
+
+    def download_range(index: int) -> int:
+        transferred = call_with_retry(fetch, index, max_retries=max_retries, backoff=backoff)
+        with lock:
+            done.add(index)
+            _save_state(state_path, etag, size, range_size, done)
+        return transferred
+
+    try:
+        report = run_concurrently(
+            [index for index in range(count) if index not in done],
+            download_range,
+            max_workers=max_workers,
+            progress_callback=progress_callback,
+            total=count - len(done),
+        )
+    finally:
+        os.close(fd)
+    if not report.ok:
+        raise RangedDownloadError(
+            f"Failed to download {len(report.failed)} ranges of '{key}', "
+            f"run again to resume: {report.failed}"
+        )
+
+    # With SSE-KMS or customer keys the ETag is not an MD5 of the content
+    encrypted = head.get("ServerSideEncryption") == "aws:kms" or "SSECustomerAlgorithm" in head
+    if verify and not encrypted:
+        actual = expected_etag(part_path, etag)
+        if actual is None:
+            logger.warning(
+                f"Cannot recompute the ETag {etag} of '{key}', only its size is checked"
+            )
+        elif actual != etag:
+            os.remove(state_path)
+            raise RangedDownloadError(f"ETag mismatch for '{key}': expected {etag}, got {actual}")
+    os.replace(part_path, local_path)
+    os.remove(state_path)
+    return report.bytes_transferred
@@ -0,0 +1,324 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+In-memory stand-in for the subset of the boto3 S3 client used by S3Manager.
+Only meant for tests and benchmarks: pass an instance as ``S3Manager(s3_client=...)``.
+"""
+# External imports
+from __future__ import annotations
+
+import hashlib
+import itertools
+import threading
+import time
+import unittest
+from collections import Counter
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Any, BinaryIO
+
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+
+# Internal imports
+from aws.aws_storage import S3Manager
+
+
+def client_error(code: str, operation: str, status: int = 400) -> ClientError:
+    return ClientError(
+        {
+            "Error": {"Code": code, "Message": f"Stubbed {code}"},
+            "ResponseMetadata": {"HTTPStatusCode": status},
+        },
+        operation,
+    )
+
+
+class InMemoryS3Client:
+    def __init__(self, latency: float = 0.0, bandwidth: float | None = None) -> None:
+        self.objects: dict[str, dict[str, Any]] = {}
+        # key -> number of upcoming requests on that key that fail with a 503
+        self.transient_failures: dict[str, int] = {}
+        # operation name -> number of requests received, e.g. calls["HeadObject"]
+        self.calls: Counter[str] = Counter()
+        # seconds slept on every request to emulate a network round trip
+        self.latency = latency
+        # bytes per second of each connection, to emulate transfer time; None for unlimited
+        self.bandwidth = bandwidth
+        # upload id -> {"Key": ..., "Parts": {part number: bytes}} for unfinished multipart uploads
+        self.multipart_uploads: dict[str, dict[str, Any]] = {}
+        self._upload_ids = itertools.count(1)
+        # keys that DeleteObjects refuses to delete, reported as per-key AccessDenied errors
+        self.protected_keys: set[str] = set()
+        # total size of the GetObject bodies returned, ranges included
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+    # ---- helpers -------------------------------------------------------------------------
+    def _request(self, operation: str) -> None:
+        with self._lock:
+            self.calls[operation] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _transfer(self, size: int) -> None:
+        if self.bandwidth:
+            time.sleep(size / self.bandwidth)
+
+    def _maybe_fail(self, key: str, operation: str) -> None:
+        self._request(operation)
+        with self._lock:
+            remaining = self.transient_failures.get(key, 0)
+            if remaining:
+                self.transient_failures[key] = remaining - 1
+                raise client_error("SlowDown", operation, 503)
+
+    def _get(self, key: str, operation: str) -> dict[str, Any]:
+        self._maybe_fail(key, operation)
+        if key not in self.objects:
+            # A HEAD response has no body, so botocore only knows the status code
+            code = "404" if operation == "HeadObject" else "NoSuchKey"
+            raise client_error(code, operation, 404)
+        return self.objects[key]
+
+    def add_object(
+        self,
+        key: str,
+        body: bytes,
+        content_type: str = "binary/octet-stream",
+        content_encoding: str | None = None,
+    ) -> None:
+        self.objects[key] = {
+            "Body": bytes(body),
+            "ContentType": content_type,
+            "ContentEncoding": content_encoding,
+            "ETag": f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"',
+            "LastModified": datetime.now(timezone.utc),
+        }
+
+    # ---- boto3 client surface ------------------------------------------------------------
+    def put_object(
+        self,
+        Bucket: str,
+        Key: str,
+        Body: bytes | str = b"",
+        ContentType: str = "binary/octet-stream",
+        ContentEncoding: str | None = None,
+    ) -> dict[str, Any]:
+        self._maybe_fail(Key, "PutObject")
+        body = Body.encode("utf-8") if isinstance(Body, str) else bytes(Body)
+        self._transfer(len(body))
+        self.add_object(Key, body, ContentType, ContentEncoding)
+        return {"ETag": self.objects[Key]["ETag"]}
+
+    def head_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        obj = self._get(Key, "HeadObject")
+        return {
+            "ContentLength": len(obj["Body"]),
+            "ContentType": obj["ContentType"],
+            "ContentEncoding": obj["ContentEncoding"],
+            "ETag": obj["ETag"],
+            "LastModified": obj["LastModified"],
+        }
+
+    def get_object(
+        self,
+        Bucket: str,
+        Key: str,
+        IfNoneMatch: str | None = None,
+        IfMatch: str | None = None,
+        Range: str | None = None,
+    ) -> dict[str, Any]:
+        obj = self._get(Key, "GetObject")
+        if IfNoneMatch is not None and IfNoneMatch == obj["ETag"]:
+            raise client_error("304", "GetObject", 304)
+        if IfMatch is not None and IfMatch != obj["ETag"]:
+            raise client_error("PreconditionFailed", "GetObject", 412)
+        body, size = obj["Body"], len(obj["Body"])
+        response = {
+            "ContentType": obj["ContentType"],
+            "ContentEncoding": obj["ContentEncoding"],
+            "ETag": obj["ETag"],
+            "LastModified": obj["LastModified"],
+        }
+        if Range is not None:
+            first, last = Range.removeprefix("bytes=").split("-")
+            if not first:  # suffix range: the last N bytes
+                start, end = max(size - int(last), 0), size - 1
+            else:
+                start, end = int(first), min(int(last) if last else size - 1, size - 1)
+            if start >= size:
+                raise client_error("InvalidRange", "GetObject", 416)
+            body = body[start : end + 1]
+            response["ContentRange"] = f"bytes {start}-{end}/{size}"
+        with self._lock:
+            self.bytes_sent += len(body)
+        self._transfer(len(body))
+        response["Body"] = StreamingBody(BytesIO(body), len(body))
+        response["ContentLength"] = len(body)
+        return response
+
+    def download_fileobj(self, Bucket: str, Key: str, Fileobj: BinaryIO) -> None:
+        # boto3's managed transfer sends a HEAD to size the object before the GET
+        self.head_object(Bucket=Bucket, Key=Key)
+        body = self._get(Key, "GetObject")["Body"]
+        self._transfer(len(body))
+        Fileobj.write(body)
+
+    def delete_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        self._request("DeleteObject")
+        self.objects.pop(Key, None)
+        return {}
+
+    def delete_objects(self, Bucket: str, Delete: dict[str, Any]) -> dict[str, Any]:
+        self._request("DeleteObjects")
+        if len(Delete["Objects"]) > 1000:
+            raise client_error("MalformedXML", "DeleteObjects")
+        deleted, errors = [], []
+        for obj in Delete["Objects"]:
+            if obj["Key"] in self.protected_keys:
+                errors.append({"Key": obj["Key"], "Code": "AccessDenied", "Message": "Denied"})
+            else:
+                self.objects.pop(obj["Key"], None)
+                deleted.append({"Key": obj["Key"]})
+        return {"Deleted": [] if Delete.get("Quiet") else deleted, "Errors": errors}
+
+    def copy_object(self, Bucket: str, CopySource: dict[str, str], Key: str) -> dict[str, Any]:
+        obj = self._get(CopySource["Key"], "CopyObject")
+        self.add_object(Key, obj["Body"], obj["ContentType"], obj["ContentEncoding"])
+        return {"CopyObjectResult": {"ETag": self.objects[Key]["ETag"]}}
+
+    def list_objects_v2(
+        self,
+        Bucket: str,
+        Prefix: str = "",
+        MaxKeys: int = 1000,
+        ContinuationToken: str | None = None,
+        Delimiter: str | None = None,
+        StartAfter: str | None = None,
+    ) -> dict[str, Any]:
+        self._request("ListObjectsV2")
+        # Entries are keys or, with a Delimiter, common prefixes ending with it
+        entries = sorted(
+            {
+                (
+                    k[: k.index(Delimiter, len(Prefix)) + len(Delimiter)]
+                    if Delimiter and Delimiter in k[len(Prefix) :]
+                    else k
+                )
+                for k in self.objects
+                if k.startswith(Prefix)
+            }
+        )
+        for after in (StartAfter, ContinuationToken):
+            if after is not None:
+                entries = [e for e in entries if e > after]
+        page, rest = entries[:MaxKeys], entries[MaxKeys:]
+        keys = [e for e in page if e in self.objects]
+        prefixes = [e for e in page if e not in self.objects]
+        response: dict[str, Any] = {"KeyCount": len(page), "IsTruncated": bool(rest)}
+        if keys:
+            response["Contents"] = [
+                {
+                    "Key": k,
+                    "Size": len(self.objects[k]["Body"]),
+                    "ETag": self.objects[k]["ETag"],
+                    "LastModified": self.objects[k]["LastModified"],
+                }
+                for k in keys
+            ]
+        if prefixes:
+            response["CommonPrefixes"] = [{"Prefix": p} for p in prefixes]
+        if rest:
+            response["NextContinuationToken"] = page[-1]
+        return response
+
+    def create_multipart_upload(
+        self,
+        Bucket: str,
+        Key: str,
+        ContentType: str = "binary/octet-stream",
+        ContentEncoding: str | None = None,
+    ) -> dict[str, Any]:
+        self._request("CreateMultipartUpload")
+        with self._lock:
+            upload_id = f"upload-{next(self._upload_ids)}"
+            self.multipart_uploads[upload_id] = {
+                "Key": Key,
+                "ContentType": ContentType,
+                "ContentEncoding": ContentEncoding,
+                "Parts": {},
+            }
+        return {"UploadId": upload_id}
+
+    def upload_part(
+        self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes
+    ) -> dict[str, Any]:
+        self._maybe_fail(f"{Key}#{PartNumber}", "UploadPart")
+        if UploadId not in self.multipart_uploads:
+            raise client_error("NoSuchUpload", "UploadPart", 404)
+        self._transfer(len(Body))
+        self.multipart_uploads[UploadId]["Parts"][PartNumber] = bytes(Body)
+        return {"ETag": f'"{hashlib.md5(Body, usedforsecurity=False).hexdigest()}"'}
+
+    def complete_multipart_upload(
+        self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict[str, Any]
+    ) -> dict[str, Any]:
+        self._request("CompleteMultipartUpload")
+        upload = self.multipart_uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        if numbers != sorted(numbers) or set(numbers) != set(upload["Parts"]):
+            raise client_error("InvalidPart", "CompleteMultipartUpload")
+        self.add_object(
+            Key,
+            b"".join(upload["Parts"][n] for n in numbers),
+            upload["ContentType"],
+            upload["ContentEncoding"],
+        )
+        # S3 gives multipart objects the MD5 of the part MD5s suffixed by the part count
+        digests = b"".join(
+            hashlib.md5(upload["Parts"][n], usedforsecurity=False).digest() for n in numbers
+        )
+        combined = hashlib.md5(digests, usedforsecurity=False).hexdigest()
+        self.objects[Key]["ETag"] = f'"{combined}-{len(numbers)}"'
+        return {"ETag": self.objects[Key]["ETag"]}
+
+    def upload_part_copy(
+        self,
+        Bucket: str,
+        Key: str,
+        UploadId: str,
+        PartNumber: int,
+        CopySource: dict[str, str],
+        CopySourceRange: str,
+    ) -> dict[str, Any]:
+        body = self._get(CopySource["Key"], "UploadPartCopy")["Body"]
+        start, end = (int(bound) for bound in CopySourceRange.removeprefix("bytes=").split("-"))
+        part = body[start : end + 1]
+        self.multipart_uploads[UploadId]["Parts"][PartNumber] = part
+        return {
+            "CopyPartResult": {"ETag": f'"{hashlib.md5(part, usedforsecurity=False).hexdigest()}"'}
+        }
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str) -> dict[str, Any]:
+        self._request("AbortMultipartUpload")
+        self.multipart_uploads.pop(UploadId, None)
+        return {}
+
+
+class S3StubTestCase(unittest.TestCase):
+    """
+    Test case with a fresh in-memory ``s3_client`` and an ``s3_manager`` that uses it.
+    Tests needing other S3Manager options build theirs with ``make_manager``.
+    """
+
+    s3_client: InMemoryS3Client
+    s3_manager: S3Manager
+
+    def setUp(self) -> None:
+        self.s3_client = InMemoryS3Client()
+        self.s3_manager = self.make_manager()
+
+    def make_manager(self, **options: Any) -> S3Manager:
+        return S3Manager(s3_client=self.s3_client, **options)
@@ -0,0 +1,127 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Tests of the AsyncS3Manager against the in-memory S3 stand-in.
+"""
+# External imports
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import EndpointConnectionError
+
+from aws import AsyncS3Manager, S3Manager
+from aws.testing import InMemoryS3Client
+
+
+class TestAsyncS3Manager(unittest.IsolatedAsyncioTestCase):
+    s3_client: InMemoryS3Client
+    async_manager: AsyncS3Manager
+
+    async def asyncSetUp(self) -> None:
+        self.s3_client = InMemoryS3Client(latency=0.01)
+        self.async_manager = AsyncS3Manager(S3Manager(s3_client=self.s3_client), max_concurrency=8)
+
+    async def asyncTearDown(self) -> None:
+        await self.async_manager.close()
+
+    async def test_same_semantics_as_sync_manager(self) -> None:
+        """
+        Status codes and None for missing keys are those of S3Manager.
+        """
+        exit_code = await self.async_manager.upload_json_file("a.json", {"a": 1}, "docs")
+        content, missing = await self.async_manager.download_many(["a.json", "b.json"], "docs")
+        deleted = await self.async_manager.delete_object_from_s3("a.json", "docs")
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(json.loads(content), {"a": 1})
+        self.assertIsNone(missing)
+        self.assertEqual(deleted, 0)
+        self.assertEqual(await self.async_manager.get_available_files("docs"), [])
+
+    async def test_gather_fan_out_is_bounded(self) -> None:
+        """
+        A gather over many downloads runs concurrently but never above max_concurrency.
+        """
+        for i in range(40):
+            self.s3_client.add_object(f"docs/{i}.txt", str(i).encode())
+        in_flight, peak = 0, 0
+        download = self.async_manager.s3_manager.download_from_s3
+
+        def tracked(file_name: str, folder: str) -> object:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                return download(file_name, folder)
+            finally:
+                in_flight -= 1
+
+        with patch.object(self.async_manager.s3_manager, "download_from_s3", side_effect=tracked):
+            contents = await asyncio.gather(
+                *(self.async_manager.download_from_s3(f"{i}.txt", "docs") for i in range(40))
+            )
+
+        self.assertEqual(contents, [str(i) for i in range(40)])
+        self.assertLessEqual(peak, 8)
+        self.assertGreater(peak, 1)
+
+    async def test_download_folder(self) -> None:
+        """
+        Folders are downloaded as concurrent tasks into the usual on-disk layout.
+        """
+        for i in range(20):
+            self.s3_client.add_object(f"reports/sub/{i}.txt", str(i).encode())
+
+        with tempfile.TemporaryDirectory() as local_dir:
+            report = await self.async_manager.download_folder(local_dir, "reports")
+            with open(os.path.join(local_dir, "sub", "7.txt")) as f:
+                self.assertEqual(f.read(), "7")
+
+        self.assertTrue(report.ok)
+        self.assertEqual(len(report.succeeded), 20)
+
+    async def test_json_range_and_large_file_calls(self) -> None:
+        """
+        The JSON, ranged read and large file helpers of S3Manager are available too.
+        """
+        exit_code = await self.async_manager.upload_json_file(
+            "a.json.gz", {"a": 1}, "docs", indent=None, compress=True
+        )
+        self.s3_client.add_object("docs/big.bin", bytes(range(256)) * 100)
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(await self.async_manager.download_json("a.json.gz", "docs"), {"a": 1})
+        self.assertEqual(
+            await self.async_manager.read_range("big.bin", "docs", 1, 4), b"\x01\x02\x03"
+        )
+        with tempfile.TemporaryDirectory() as local_dir:
+            local_path = os.path.join(local_dir, "big.bin")
+            result = await self.async_manager.download_large_file(
+                "big.bin", "docs", local_path, range_size=1000
+            )
+            with open(local_path, "rb") as f:
+                self.assertEqual(f.read(), bytes(range(256)) * 100)
+        self.assertEqual(result, local_path)
+
+    @patch("aws.transfer.time.sleep")
+    async def test_download_folder_reports_connection_errors(self, mock_sleep: MagicMock) -> None:
+        """
+        A listing stopped by a connection error is reported in the TransferReport.
+        """
+        unreachable = EndpointConnectionError(endpoint_url="https://s3.amazonaws.com")
+        with (
+            patch.object(self.s3_client, "list_objects_v2", side_effect=unreachable),
+            tempfile.TemporaryDirectory() as local_dir,
+        ):
+            report = await self.async_manager.download_folder(local_dir, "reports")
+
+        self.assertEqual(list(report.failed), ["reports"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,11 +5,20 @@ contact@analitika.fr
 
 
 # External imports
+import gzip
+import itertools
 import json
+import os
+import tempfile
+import time
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from aws import S3Manager
+from aws import S3Manager, TransferProgress
+from aws.multipart import MIN_PART_SIZE, local_etag
+from aws.testing import S3StubTestCase, client_error
+from aws.transfer import is_retryable
 
 # Internal imports
 from config import settings
@@ -88,5 +97,425 @@ class TestS3Manager(unittest.TestCase):
             mock_rename.assert_called_once_with(cls.prefix, f"{cls.prefix}_deleted")
 
 
+class TestS3ManagerWithStub(S3StubTestCase):
+    """
+    Exercise the S3Manager logic end-to-end against the in-memory S3 stand-in.
+    """
+
+    local_dir: tempfile.TemporaryDirectory
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.local_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.local_dir.cleanup()
+
+    def test_download_folder(self) -> None:
+        """
+        All files are downloaded concurrently, transient errors are retried and the
+        relative layout of the keys is kept on disk.
+        """
+        for i in range(25):
+            self.s3_client.add_object(f"reports/file_{i}.json", json.dumps({"i": i}).encode())
+        self.s3_client.add_object("reports/sub/nested.txt", b"nested")
+        self.s3_client.transient_failures["reports/file_3.json"] = 2
+
+        progress: list[TransferProgress] = []
+        report = self.s3_manager.download_folder(
+            self.local_dir.name,
+            "reports",
+            max_workers=4,
+            backoff=0,
+            progress_callback=progress.append,
+        )
+
+        self.assertTrue(report.ok)
+        self.assertEqual(len(report.succeeded), 26)
+        self.assertEqual(progress[-1].completed, 26)
+        self.assertEqual(len(progress), 26)
+        with open(os.path.join(self.local_dir.name, "file_3.json")) as f:
+            self.assertEqual(json.load(f), {"i": 3})
+        with open(os.path.join(self.local_dir.name, "sub", "nested.txt")) as f:
+            self.assertEqual(f.read(), "nested")
+
+    def test_download_folder_reports_failures(self) -> None:
+        """
+        Keys that keep failing after all retries end up in the report instead of raising.
+        """
+        self.s3_client.add_object("reports/good.txt", b"good")
+        self.s3_client.add_object("reports/bad.txt", b"bad")
+        self.s3_client.transient_failures["reports/bad.txt"] = 10
+
+        report = self.s3_manager.download_folder(
+            self.local_dir.name, "reports", max_retries=2, backoff=0
+        )
+
+        self.assertEqual(report.succeeded, ["good.txt"])
+        self.assertIn("bad.txt", report.failed)
+
+    def test_download_to_file_streams_gzip(self) -> None:
+        """
+        Gzip objects are decompressed chunk by chunk into the destination file.
+        """
+        payload = b"line\n" * 10_000
+        self.s3_client.add_object("exports/big.csv.gz", gzip.compress(payload))
+        self.s3_client.add_object("exports/raw.bin", bytes(range(256)))
+        local_path = os.path.join(self.local_dir.name, "big.csv")
+
+        result = self.s3_manager.download_to_file(
+            "big.csv.gz", "exports", local_path, chunk_size=1024
+        )
+        report = self.s3_manager.download_folder(self.local_dir.name, "exports")
+
+        self.assertEqual(result, local_path)
+        with open(local_path, "rb") as f:
+            self.assertEqual(f.read(), payload)
+        self.assertTrue(report.ok)
+        with open(os.path.join(self.local_dir.name, "raw.bin"), "rb") as f:
+            self.assertEqual(f.read(), bytes(range(256)))
+        self.assertIsNone(
+            self.s3_manager.download_to_file("missing.txt", "exports", local_path + ".x")
+        )
+        self.assertFalse(os.path.exists(local_path + ".x.part"))
+
+    def test_download_uses_a_single_request(self) -> None:
+        """
+        Downloads send one GET, and a missing key still maps to None without a HEAD.
+        """
+        self.s3_client.add_object("docs/a.txt", b"a")
+
+        self.assertEqual(self.s3_manager.download_from_s3("a.txt", "docs"), "a")
+        self.assertIsNone(self.s3_manager.download_from_s3("missing.txt", "docs"))
+        self.assertEqual(self.s3_client.calls["GetObject"], 2)
+        self.assertEqual(self.s3_client.calls["HeadObject"], 0)
+
+    def test_check_files_exist(self) -> None:
+        """
+        Existence of many keys is answered from one listing instead of one HEAD per key.
+        """
+        for i in range(5):
+            self.s3_client.add_object(f"docs/{i}.txt", b"x")
+
+        found = self.s3_manager.check_files_exist(["docs/1.txt", "docs/4.txt", "docs/9.txt"])
+
+        self.assertEqual(found, {"docs/1.txt", "docs/4.txt"})
+        self.assertEqual(self.s3_client.calls["ListObjectsV2"], 1)
+        self.assertEqual(self.s3_client.calls["HeadObject"], 0)
+
+    def test_check_files_exist_in_several_folders(self) -> None:
+        """
+        Keys in unrelated folders are not answered by listing the whole bucket, and keys
+        spread over a large folder cost at most one request each.
+        """
+        for i in range(5000):
+            self.s3_client.add_object(f"reports/file_{i:04d}.txt", b"x")
+        self.s3_client.add_object("zzz/other.txt", b"x")
+        with patch.object(
+            self.s3_client, "list_objects_v2", wraps=self.s3_client.list_objects_v2
+        ) as list_objects_v2:
+            found = self.s3_manager.check_files_exist(["reports/file_0001.txt", "zzz/other.txt"])
+            self.assertEqual(found, {"reports/file_0001.txt", "zzz/other.txt"})
+            self.assertEqual(self.s3_client.calls["HeadObject"], 2)
+            list_objects_v2.assert_not_called()
+
+            keys = ["reports/file_0000.txt", "reports/file_2500.txt", "reports/missing.txt"]
+            found = self.s3_manager.check_files_exist(keys)
+
+        self.assertEqual(found, {"reports/file_0000.txt", "reports/file_2500.txt"})
+        prefixes = [call.kwargs["Prefix"] for call in list_objects_v2.call_args_list]
+        self.assertNotIn("", prefixes)
+        self.assertLessEqual(
+            self.s3_client.calls["ListObjectsV2"] + self.s3_client.calls["HeadObject"], 2 + 4
+        )
+
+    def test_upload_multipart(self) -> None:
+        """
+        Large payloads, files and iterators go through a parallel multipart upload.
+        """
+        part_size = MIN_PART_SIZE
+        payload = os.urandom(2 * part_size + 123)
+        local_file = Path(self.local_dir.name) / "payload.bin"
+        local_file.write_bytes(payload)
+        chunks = (payload[i : i + 1000] for i in range(0, len(payload), 1000))
+
+        for name, source in (("bytes", payload), ("path", local_file), ("iter", chunks)):
+            exit_code = self.s3_manager.upload_to_s3(
+                name, source, "uploads", part_size=part_size, multipart_threshold=part_size
+            )
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(self.s3_client.objects[f"uploads/{name}"]["Body"], payload)
+        self.assertEqual(self.s3_client.calls["CreateMultipartUpload"], 3)
+        self.assertEqual(self.s3_client.calls["UploadPart"], 9)
+        self.assertEqual(self.s3_client.calls["PutObject"], 0)
+
+        self.assertEqual(self.s3_manager.upload_to_s3("small", b"small", "uploads"), 0)
+        self.assertEqual(self.s3_client.calls["PutObject"], 1)
+
+    @patch("aws.transfer.time.sleep")
+    def test_upload_multipart_aborts_on_failure(self, mock_sleep: MagicMock) -> None:
+        """
+        A part failing after all retries aborts the upload instead of leaving it orphaned.
+        """
+        part_size = MIN_PART_SIZE
+        self.s3_client.transient_failures["uploads/big#2"] = 100
+
+        exit_code = self.s3_manager.upload_to_s3(
+            "big", bytes(3 * part_size), "uploads", part_size=part_size, multipart_threshold=0
+        )
+
+        self.assertEqual(exit_code, 1)
+        self.assertNotIn("uploads/big", self.s3_client.objects)
+        self.assertEqual(self.s3_client.multipart_uploads, {})
+        self.assertEqual(self.s3_client.calls["AbortMultipartUpload"], 1)
+
+    def test_upload_folder_sync(self) -> None:
+        """
+        A folder is uploaded with guessed content types, and a sync run only re-uploads
+        the files whose content changed.
+        """
+        local_root = Path(self.local_dir.name)
+        (local_root / "img").mkdir()
+        for i in range(10):
+            (local_root / f"report_{i}.json").write_text(json.dumps({"i": i}))
+        (local_root / "img" / "logo.png").write_bytes(b"\x89PNG")
+
+        report = self.s3_manager.upload_folder(self.local_dir.name, "site", max_workers=4)
+
+        self.assertEqual(len(report.succeeded), 11)
+        self.assertEqual(self.s3_client.objects["site/img/logo.png"]["ContentType"], "image/png")
+        self.assertEqual(
+            self.s3_client.objects["site/report_0.json"]["ContentType"], "application/json"
+        )
+
+        (local_root / "report_3.json").write_text(json.dumps({"i": "changed"}))
+        report = self.s3_manager.upload_folder(self.local_dir.name, "site", sync=True)
+
+        self.assertEqual(report.succeeded, ["report_3.json"])
+        self.assertEqual(len(report.skipped), 10)
+        self.assertEqual(self.s3_client.calls["PutObject"], 12)
+        self.assertEqual(self.s3_client.calls["ListObjectsV2"], 1)
+
+    def test_local_etag_matches_multipart_etag(self) -> None:
+        """
+        The ETag computed locally matches the one of an object uploaded in several parts.
+        """
+        local_file = Path(self.local_dir.name) / "big.bin"
+        local_file.write_bytes(os.urandom(MIN_PART_SIZE + 10))
+
+        self.s3_manager.upload_to_s3(
+            "big.bin", local_file, "site", part_size=MIN_PART_SIZE, multipart_threshold=0
+        )
+
+        self.assertEqual(
+            local_etag(local_file, part_size=MIN_PART_SIZE, multipart_threshold=0),
+            self.s3_client.objects["site/big.bin"]["ETag"],
+        )
+
+    def test_rename_s3_folder(self) -> None:
+        """
+        Renaming paginates past 1000 objects, copies large objects in parts and deletes
+        the sources in batches.
+        """
+        for i in range(1500):
+            self.s3_client.add_object(f"old/file_{i:04d}.txt", str(i).encode())
+        big = os.urandom(2 * MIN_PART_SIZE + 1)
+        self.s3_client.add_object("old/big.bin", big, "application/x-big")
+
+        report = self.s3_manager.rename_s3_folder("old", "new", multipart_threshold=MIN_PART_SIZE)
+
+        self.assertTrue(report.ok)
+        self.assertEqual(len(report.succeeded), 1501)
+        self.assertFalse(any(key.startswith("old/") for key in self.s3_client.objects))
+        self.assertEqual(self.s3_client.objects["new/file_1499.txt"]["Body"], b"1499")
+        self.assertEqual(self.s3_client.objects["new/big.bin"]["Body"], big)
+        self.assertEqual(self.s3_client.objects["new/big.bin"]["ContentType"], "application/x-big")
+        self.assertEqual(self.s3_client.calls["CreateMultipartUpload"], 1)
+        self.assertEqual(self.s3_client.calls["CopyObject"], 1500)
+        self.assertEqual(self.s3_client.calls["DeleteObjects"], 2)
+        self.assertEqual(self.s3_client.calls["DeleteObject"], 0)
+
+    @patch("aws.transfer.time.sleep")
+    def test_rename_s3_folder_resume(self, mock_sleep: MagicMock) -> None:
+        """
+        A move interrupted by failures can be finished without copying objects again.
+        """
+        for i in range(10):
+            self.s3_client.add_object(f"old/file_{i}.txt", str(i).encode())
+        self.s3_client.transient_failures["old/file_7.txt"] = 100
+
+        first = self.s3_manager.rename_s3_folder("old", "new")
+        self.assertIn("old/file_7.txt", self.s3_client.objects)
+        self.s3_client.transient_failures.clear()
+        copies_before = self.s3_client.calls["CopyObject"]
+        second = self.s3_manager.rename_s3_folder("old", "new", resume=True)
+
+        self.assertEqual(list(first.failed), ["old/file_7.txt"])
+        self.assertEqual(second.succeeded, ["old/file_7.txt"])
+        self.assertEqual(self.s3_client.calls["CopyObject"] - copies_before, 1)
+        self.assertEqual(sorted(self.s3_client.objects), [f"new/file_{i}.txt" for i in range(10)])
+
+    def test_rename_s3_folder_resume_verifies_copies(self) -> None:
+        """
+        On resume an object is only taken for a copy if it has the source's ETag: another
+        object of the same size at the destination is overwritten, not kept while its
+        source is deleted.
+        """
+        for i in range(3):
+            self.s3_client.add_object(f"old/file_{i}.txt", str(i).encode())
+        self.s3_client.add_object("new/file_0.txt", b"0")  # copied before an interruption
+        self.s3_client.add_object("new/file_1.txt", b"x")  # unrelated, same size, newer
+
+        report = self.s3_manager.rename_s3_folder("old", "new", resume=True)
+
+        self.assertEqual(report.skipped, ["old/file_0.txt"])
+        self.assertEqual(sorted(report.succeeded), ["old/file_1.txt", "old/file_2.txt"])
+        self.assertEqual(self.s3_client.objects["new/file_1.txt"]["Body"], b"1")
+        self.assertEqual(sorted(self.s3_client.objects), [f"new/file_{i}.txt" for i in range(3)])
+
+    def test_rename_s3_folder_to_a_name_starting_with_the_source(self) -> None:
+        """
+        Copies created while the source is listed are not picked up by later pages, whether
+        the destination shares the source's name as a prefix or is nested inside it.
+        """
+        for i in range(1200):
+            self.s3_client.add_object(f"reports/f{i:05d}", b"x")
+        self.s3_client.add_object("reports_other/keep", b"y")
+
+        report = self.s3_manager.rename_s3_folder("reports", "reports_old")
+        nested = self.s3_manager.rename_s3_folder("reports_old", "reports_old/archive")
+
+        self.assertEqual(len(report.succeeded), 1200)
+        self.assertEqual(len(nested.succeeded), 1200)
+        self.assertEqual(len(self.s3_client.objects), 1201)
+        self.assertIn("reports_old/archive/f01199", self.s3_client.objects)
+        self.assertIn("reports_other/keep", self.s3_client.objects)
+
+    def test_only_transient_errors_are_retried(self) -> None:
+        """
+        Throttling, 5xx and connection errors are retried, any other error is not.
+        """
+        transient = [
+            client_error("SlowDown", "GetObject", 503),
+            client_error("InternalError", "GetObject", 500),
+            client_error("Unexpected", "GetObject", 502),
+            ConnectionResetError(),
+        ]
+        permanent = [
+            client_error("PreconditionFailed", "GetObject", 412),
+            client_error("InvalidRange", "GetObject", 416),
+            client_error("EntityTooSmall", "CompleteMultipartUpload"),
+            client_error("NoSuchKey", "GetObject", 404),
+            ValueError("not an S3 error"),
+        ]
+
+        self.assertTrue(all(is_retryable(error) for error in transient))
+        self.assertFalse(any(is_retryable(error) for error in permanent))
+
+    def test_delete_prefix(self) -> None:
+        """
+        A prefix is cleared with batched DeleteObjects calls and per-key errors are reported;
+        a dry run deletes nothing.
+        """
+        for i in range(2500):
+            self.s3_client.add_object(f"tmp/file_{i:04d}.txt", b"x")
+        self.s3_client.add_object("tmp_other/keep.txt", b"x")
+        self.s3_client.protected_keys.add("tmp/file_0042.txt")
+
+        dry_run = self.s3_manager.delete_prefix("tmp", dry_run=True)
+        self.assertEqual(len(dry_run.skipped), 2500)
+        self.assertEqual(len(self.s3_client.objects), 2501)
+
+        report = self.s3_manager.delete_prefix("tmp")
+
+        self.assertEqual(len(report.succeeded), 2499)
+        self.assertTrue(report.failed["tmp/file_0042.txt"].startswith("AccessDenied"))
+        self.assertEqual(
+            sorted(self.s3_client.objects), ["tmp/file_0042.txt", "tmp_other/keep.txt"]
+        )
+        self.assertEqual(self.s3_client.calls["DeleteObjects"], 3)
+        self.assertEqual(self.s3_client.calls["DeleteObject"], 0)
+
+    def test_iter_files(self) -> None:
+        """
+        Files are yielded page by page with optional metadata, and subfolders can be
+        listed on their own.
+        """
+        for i in range(2500):
+            self.s3_client.add_object(f"data/file_{i:04d}.txt", b"abc")
+        self.s3_client.add_object("data/2024/a.txt", b"a")
+        self.s3_client.add_object("data/2025/b.txt", b"b")
+
+        first = list(itertools.islice(self.s3_manager.iter_files("data"), 5))
+        self.assertEqual(self.s3_client.calls["ListObjectsV2"], 1)
+        self.assertEqual(
+            first, ["2024/a.txt", "2025/b.txt", "file_0000.txt", "file_0001.txt", "file_0002.txt"]
+        )
+
+        entries = list(self.s3_manager.iter_files("data", include_metadata=True))
+        self.assertEqual(len(entries), 2502)
+        self.assertEqual(entries[-1].name, "file_2499.txt")
+        self.assertEqual(entries[-1].size, 3)
+        self.assertEqual(list(self.s3_manager.iter_subfolders("data")), ["2024", "2025"])
+
+    def test_iter_files_sharded(self) -> None:
+        """
+        Sharded listings return the same files in the same order as a sequential one, even
+        next to a sibling folder sharing the name's start, whether shards come from
+        subfolders, an alphabet or the default fallback.
+        """
+        keys = [f"data/{c}{i:04d}.csv" for c in "0a_Z~" for i in range(300)]
+        keys += [f"data/{y}/part_{i}.csv" for y in ("2023", "2024", "2025") for i in range(700)]
+        keys += ["data/0", "data/2024/", "datab/other.csv"]
+        for key in keys:
+            self.s3_client.add_object(key, b"x")
+        expected = sorted(key[len("data/") :] for key in keys if key.startswith("data/"))
+
+        # datab/ starts like data but is another folder: no listing includes it
+        self.assertEqual(list(self.s3_manager.iter_files("data")), expected)
+        self.assertEqual(list(self.s3_manager.iter_files("data", sharded=True)), expected)
+        self.assertEqual(
+            list(self.s3_manager.iter_files("data", sharded=True, alphabet="02a")), expected
+        )
+        flat = list(self.s3_manager.iter_files("data/2025", sharded=True))
+        self.assertEqual(flat, sorted(f"part_{i}.csv" for i in range(700)))
+
+    def test_iter_files_skips_sibling_folders(self) -> None:
+        """
+        A folder whose name starts like the listed one is not part of it, in plain and
+        sharded listings alike, and downloads of the folder do not try to fetch its files.
+        """
+        for key in ("reports/a.txt", "reports/b/c.txt", "reports_old/x.txt", "reportsx"):
+            self.s3_client.add_object(key, b"x")
+        expected = ["a.txt", "b/c.txt"]
+
+        self.assertEqual(list(self.s3_manager.iter_files("reports")), expected)
+        self.assertEqual(list(self.s3_manager.iter_files("reports", sharded=True)), expected)
+        self.assertEqual(self.s3_manager.get_available_files("reports"), expected)
+        with tempfile.TemporaryDirectory() as local_dir:
+            report = self.s3_manager.download_folder(local_dir, "reports")
+        self.assertTrue(report.ok)
+        self.assertEqual(sorted(report.succeeded), ["a.txt", "b/c.txt"])
+
+    def test_iter_files_sharded_lists_shards_as_they_are_consumed(self) -> None:
+        """
+        Only a window of max_workers shards is listed ahead of the consumer.
+        """
+        for c in "0123456789":
+            self.s3_client.add_object(f"data/{c}.csv", b"x")
+
+        files = self.s3_manager.iter_files(
+            "data", sharded=True, alphabet="0123456789", max_workers=2
+        )
+        first = next(files)
+        time.sleep(0.2)  # a slow consumer: shards listed ahead would pile up meanwhile
+        listed = self.s3_client.calls["ListObjectsV2"]
+        files.close()
+
+        self.assertEqual(first, "0.csv")
+        # the first key is in the second shard: 2 shards listed and 2 more submitted
+        self.assertLessEqual(listed, 4)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,66 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Tests of the process-wide S3 client factory.
+"""
+# External imports
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from aws import S3Manager
+from aws.client import get_s3_client, reset_s3_clients
+
+# Internal imports
+from config import settings
+
+
+class TestS3ClientFactory(unittest.TestCase):
+    def setUp(self) -> None:
+        reset_s3_clients()
+
+    def test_managers_share_one_client(self) -> None:
+        """
+        Every manager of the process, in any thread, uses the same configured client.
+        """
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = set(executor.map(lambda _: id(S3Manager().s3_client), range(32)))
+
+        self.assertEqual(len(clients), 1)
+        config = get_s3_client().meta.config
+        self.assertEqual(config.max_pool_connections, settings.S3_MAX_POOL_CONNECTIONS)
+        self.assertTrue(config.tcp_keepalive)
+        # Transient errors are retried by call_with_retry only
+        self.assertEqual(config.retries["total_max_attempts"], 1)
+
+    def test_reset_builds_a_fresh_client(self) -> None:
+        """
+        After a reset (as done automatically in forked children) a new client is created.
+        """
+        before = get_s3_client()
+        reset_s3_clients()
+
+        self.assertIsNot(get_s3_client(), before)
+        self.assertIsNot(get_s3_client(max_pool_connections=4), get_s3_client())
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_forked_child_gets_its_own_client(self) -> None:
+        """
+        A forked worker does not reuse the connection pool of its parent.
+        """
+        parent_client = id(get_s3_client())
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # child
+            os.close(read_end)
+            os.write(write_end, b"1" if id(get_s3_client()) != parent_client else b"0")
+            os._exit(0)
+        os.close(write_end)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_end, "rb") as pipe:
+            self.assertEqual(pipe.read(), b"1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Tests of the codec registry, through S3Manager uploads and downloads against the in-memory
+S3 stand-in.
+"""
+# External imports
+import gzip
+import importlib.util
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+import pandas as pd
+from PIL import Image
+
+from aws.codec_registry import Codec, codec_for, register_codec
+from aws.testing import S3StubTestCase
+
+
+class TestCodecRegistry(S3StubTestCase):
+    def test_codec_lookup(self) -> None:
+        self.assertEqual(codec_for("a/b/data.PKL").name, "pickle")
+        self.assertEqual(codec_for("export.csv.gz").name, "gzip")
+        self.assertEqual(codec_for("report.pdf").name, "auto")
+        self.assertEqual(codec_for("noext", "image/png").name, "image")
+
+    def test_binary_files_are_not_corrupted(self) -> None:
+        payload = bytes(range(256))
+        self.s3_client.add_object("docs/archive.zip", payload)
+
+        self.assertEqual(self.s3_manager.download_from_s3("archive.zip", "docs"), payload)
+        view = self.s3_manager.download_from_s3("archive.zip", "docs", codec="memoryview")
+        assert isinstance(view, memoryview)
+        self.assertEqual(view.tobytes(), payload)
+
+    def test_raw_mode_skips_decoding(self) -> None:
+        compressed = gzip.compress(b"text")
+        self.s3_client.add_object("docs/a.txt.gz", compressed)
+
+        self.assertEqual(self.s3_manager.download_from_s3("a.txt.gz", "docs"), "text")
+        raw = self.s3_manager.download_from_s3("a.txt.gz", "docs", codec="raw")
+        self.assertEqual(raw, compressed)
+
+    def test_encoded_uploads_round_trip(self) -> None:
+        image = Image.new("RGB", (4, 4), "red")
+
+        self.assertEqual(self.s3_manager.upload_to_s3("d.json", {"a": 1}, "docs", codec="json"), 0)
+        self.assertEqual(
+            self.s3_manager.upload_to_s3("note.txt.gz", b"hello", "docs", codec="gzip"), 0
+        )
+        self.assertEqual(self.s3_manager.upload_to_s3("img.jpg", image, "docs"), 0)
+        self.assertEqual(self.s3_manager.upload_to_s3("bad.txt", {"a": 1}, "docs"), 1)
+
+        self.assertEqual(
+            self.s3_manager.download_from_s3("d.json", "docs", codec="json"), {"a": 1}
+        )
+        self.assertEqual(self.s3_manager.download_from_s3("note.txt.gz", "docs"), "hello")
+        downloaded = self.s3_manager.download_from_s3("img.jpg", "docs")
+        assert isinstance(downloaded, Image.Image)
+        self.assertEqual(downloaded.size, (4, 4))
+        self.assertEqual(self.s3_client.objects["docs/img.jpg"]["ContentType"], "image/jpeg")
+        self.assertEqual(self.s3_client.objects["docs/d.json"]["ContentType"], "application/json")
+
+    def test_raw_reads_are_uploaded_as_is(self) -> None:
+        compressed = gzip.compress(b"text")
+        self.s3_client.add_object("docs/a.txt.gz", compressed)
+        self.s3_client.add_object("docs/model.pkl", b"not decoded")
+
+        for key in ("a.txt.gz", "model.pkl"):
+            view = self.s3_manager.download_from_s3(key, "docs", codec="memoryview")
+            self.assertEqual(self.s3_manager.upload_to_s3(f"copy-{key}", view, "docs"), 0)
+
+        self.assertEqual(self.s3_client.objects["docs/copy-a.txt.gz"]["Body"], compressed)
+        self.assertEqual(self.s3_client.objects["docs/copy-model.pkl"]["Body"], b"not decoded")
+
+    def test_values_of_the_wrong_type_fail(self) -> None:
+        for file_name in ("img.png", "df.parquet", "note.gz", "data.zst"):
+            self.assertEqual(self.s3_manager.upload_to_s3(file_name, "text", "docs"), 1)
+        self.assertEqual(
+            self.s3_manager.upload_to_s3("d.json", {"a": object()}, "docs", codec="json"), 1
+        )
+        self.assertEqual(self.s3_manager.upload_to_s3("f.pkl", lambda: None, "docs"), 1)
+        self.assertEqual(self.s3_client.objects, {})
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet_round_trip(self) -> None:
+        df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+        self.assertEqual(self.s3_manager.upload_to_s3("df.parquet", df, "docs"), 0)
+        downloaded = self.s3_manager.download_from_s3("df.parquet", "docs")
+        assert isinstance(downloaded, pd.DataFrame)
+        pd.testing.assert_frame_equal(downloaded, df)
+
+    def test_custom_codec(self) -> None:
+        register_codec(Codec("csv", lambda content: pd.read_csv(BytesIO(content))), (".test-csv",))
+        self.s3_client.add_object("docs/t.test-csv", b"a,b\n1,2\n")
+
+        df = self.s3_manager.download_from_s3("t.test-csv", "docs")
+
+        assert isinstance(df, pd.DataFrame)
+        self.assertEqual(df.to_dict("records"), [{"a": 1, "b": 2}])
+
+    def test_download_folder_copies_bytes(self) -> None:
+        """
+        download_folder writes the objects as stored, without decompressing them.
+        """
+        compressed = gzip.compress(b"line\n" * 100)
+        self.s3_client.add_object("exports/a.csv.gz", compressed)
+
+        with tempfile.TemporaryDirectory() as local_dir:
+            report = self.s3_manager.download_folder(local_dir, "exports")
+            with open(os.path.join(local_dir, "a.csv.gz"), "rb") as f:
+                self.assertEqual(f.read(), compressed)
+        self.assertTrue(report.ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
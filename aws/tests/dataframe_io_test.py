@@ -0,0 +1,70 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Tests of the DataFrame I/O, against the in-memory S3 stand-in.
+"""
+# External imports
+import importlib.util
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from aws.testing import S3StubTestCase
+
+
+class TestDataFrameIO(S3StubTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame(
+            {
+                "id": np.arange(50_000),
+                "year": np.repeat([2022, 2023, 2024, 2025, 2026], 10_000),
+                **{f"col_{i}": rng.random(50_000) for i in range(10)},
+            }
+        )
+
+    def test_unknown_format_and_missing_file(self) -> None:
+        self.assertEqual(self.s3_manager.upload_dataframe(self.df, "df.csv", "tables"), 1)
+        self.assertIsNone(self.s3_manager.download_dataframe("missing.parquet", "tables"))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet_projection_fetches_only_needed_bytes(self) -> None:
+        """
+        Reading 2 columns of one year downloads a fraction of the file.
+        """
+        self.s3_manager.upload_dataframe(self.df, "df.parquet", "tables", row_group_size=10_000)
+        size = len(self.s3_client.objects["tables/df.parquet"]["Body"])
+
+        full = self.s3_manager.download_dataframe("df.parquet", "tables")
+        self.s3_client.bytes_sent = 0
+        part = self.s3_manager.download_dataframe(
+            "df.parquet", "tables", columns=["id", "col_0"], filters=[("year", "==", 2026)]
+        )
+
+        pd.testing.assert_frame_equal(full, self.df)
+        self.assertEqual(list(part.columns), ["id", "col_0"])
+        self.assertEqual(part["id"].tolist(), list(range(40_000, 50_000)))
+        self.assertLess(self.s3_client.bytes_sent, size / 5)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_feather_round_trip(self) -> None:
+        self.assertEqual(self.s3_manager.upload_dataframe(self.df, "df.feather", "tables"), 0)
+        self.assertEqual(
+            self.s3_manager.upload_dataframe(
+                self.df, "snappy.feather", "tables", compression="snappy"
+            ),
+            1,
+        )
+
+        part = self.s3_manager.download_dataframe(
+            "df.feather", "tables", columns=["id"], filters=[("year", "<", 2023)]
+        )
+
+        self.assertEqual(part["id"].tolist(), list(range(10_000)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Tests of the read-through disk cache, against the in-memory S3 stand-in.
+"""
+# External imports
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from aws.disk_cache import S3DiskCache
+from aws.testing import S3StubTestCase
+
+
+class TestS3DiskCache(S3StubTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = S3DiskCache(self.tmp_dir.name, max_bytes=1024)
+        self.s3_manager = self.make_manager(cache=self.cache)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_revalidated_hit_has_no_body(self) -> None:
+        """
+        A second download is served from disk after a 304 to its conditional GET, and a
+        changed object is fetched again.
+        """
+        self.s3_client.add_object("docs/a.txt", b"first")
+
+        self.assertEqual(self.s3_manager.download_from_s3("a.txt", "docs"), "first")
+        self.assertEqual(self.s3_manager.download_from_s3("a.txt", "docs"), "first")
+        self.s3_client.add_object("docs/a.txt", b"second")
+        self.assertEqual(self.s3_manager.download_from_s3("a.txt", "docs"), "second")
+
+        self.assertEqual(self.s3_client.calls["GetObject"], 3)
+        self.assertEqual(self.cache.stats_dict()["hits"], 1)
+        self.assertEqual(self.cache.stats_dict()["misses"], 2)
+
+    def test_missing_key_is_not_cached(self) -> None:
+        self.assertIsNone(self.s3_manager.download_from_s3("missing.txt", "docs"))
+        self.assertEqual(list(self.cache.cache_dir.iterdir()), [])
+
+    def test_least_recently_used_entries_are_evicted(self) -> None:
+        """
+        Going over the size budget removes the entries that were read the longest ago.
+        """
+        for name in ("a", "b", "c"):
+            self.s3_client.add_object(f"docs/{name}.txt", name.encode() * 400)
+        self.s3_manager.download_from_s3("a.txt", "docs")
+        self.s3_manager.download_from_s3("b.txt", "docs")
+        # Make "a" the oldest entry, whatever the file system timestamp resolution
+        bucket = self.s3_manager._bucket
+        a_path = self.cache._path(bucket, "docs/a.txt")
+        os.utime(a_path, (0, 0))
+        self.s3_manager.download_from_s3("c.txt", "docs")
+
+        self.assertIsNone(self.cache.etag(bucket, "docs/a.txt"))
+        self.assertIsNotNone(self.cache.etag(bucket, "docs/b.txt"))
+        self.assertIsNotNone(self.cache.etag(bucket, "docs/c.txt"))
+        self.assertEqual(self.cache.stats.evictions, 1)
+
+    def test_put_does_not_scan_the_directory(self) -> None:
+        """
+        Once the directory is mirrored, storing entries lists it again only every
+        rescan_interval puts.
+        """
+        cache = S3DiskCache(self.tmp_dir.name, max_bytes=1024, rescan_interval=50)
+        with patch.object(cache, "_scan", wraps=cache._scan) as scan:
+            for i in range(100):
+                cache.put("bucket", f"docs/{i}.txt", f"etag{i}", b"x" * 100)
+
+        self.assertEqual(scan.call_count, 2)  # first put, then after 50 puts
+        self.assertLessEqual(sum(p.stat().st_size for p in cache.cache_dir.iterdir()), 1024)
+        self.assertIsNotNone(cache.get("bucket", "docs/99.txt", "etag99"))
+        self.assertIsNone(cache.etag("bucket", "docs/0.txt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
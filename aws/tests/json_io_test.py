@@ -0,0 +1,90 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Tests of the JSON and JSON Lines uploads and downloads, against the in-memory S3 stand-in.
+"""
+# External imports
+import gzip
+import json
+import unittest
+
+from aws.json_io import encode_json, encode_json_lines, iter_lines
+from aws.testing import S3StubTestCase
+
+
+class TestJsonIO(S3StubTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.data = {
+            "rows": [{"id": i, "name": f"row {i}", "tags": ["a", "b"]} for i in range(200)]
+        }
+
+    def test_compact_and_gzipped_json(self) -> None:
+        self.s3_manager.upload_json_file("indented.json", self.data, "docs")
+        self.s3_manager.upload_json_file("compact.json", self.data, "docs", indent=None)
+        self.s3_manager.upload_json_file(
+            "small.json", self.data, "docs", indent=None, compress=True
+        )
+
+        sizes = {key: len(obj["Body"]) for key, obj in self.s3_client.objects.items()}
+        self.assertLess(sizes["docs/compact.json"], 0.7 * sizes["docs/indented.json"])
+        self.assertLess(sizes["docs/small.json"], sizes["docs/compact.json"] / 5)
+        self.assertEqual(self.s3_client.objects["docs/small.json"]["ContentEncoding"], "gzip")
+        for name in ("indented.json", "compact.json", "small.json"):
+            self.assertEqual(self.s3_manager.download_json(name, "docs"), self.data)
+        # download_from_s3 still returns the text of JSON files, gunzipped
+        text = self.s3_manager.download_from_s3("small.json", "docs")
+        assert isinstance(text, str)
+        self.assertEqual(json.loads(text), self.data)
+
+    def test_corrupt_gzip_is_a_failure(self) -> None:
+        corrupt = gzip.compress(json.dumps(self.data).encode())[:-20] + b"x" * 20
+        self.s3_client.add_object("docs/corrupt.json", corrupt)
+        self.s3_client.add_object("docs/corrupt.jsonl", b"\x1f\x8bnot gzip")
+
+        self.assertIsNone(self.s3_manager.download_json("corrupt.json", "docs"))
+        self.assertIsNone(self.s3_manager.download_json("corrupt.jsonl", "docs"))
+
+    def test_custom_encoder(self) -> None:
+        def encoder(data: object) -> bytes:
+            return json.dumps(data, sort_keys=True).encode()
+
+        self.s3_manager.upload_json_file("sorted.json", {"b": 1, "a": 2}, "docs", encoder=encoder)
+
+        self.assertEqual(self.s3_client.objects["docs/sorted.json"]["Body"], b'{"a": 2, "b": 1}')
+
+    def test_json_lines_stream(self) -> None:
+        """
+        A generator of records is uploaded as a stream and read back record by
+        record, compressed or not.
+        """
+        records = ({"id": i, "payload": "x" * 100} for i in range(60_000))
+
+        self.assertEqual(self.s3_manager.upload_json_lines("export.jsonl", records, "exports"), 0)
+        self.assertEqual(
+            self.s3_manager.upload_json_lines(
+                "export.jsonl.gz", ({"id": i} for i in range(1000)), "exports", compress=True
+            ),
+            0,
+        )
+
+        streamed = self.s3_manager.iter_json_lines("export.jsonl", "exports")
+        self.assertEqual([record["id"] for record in streamed], list(range(60_000)))
+        self.assertEqual(self.s3_client.calls["CreateMultipartUpload"], 0)
+        compressed = self.s3_manager.download_json("export.jsonl.gz", "exports")
+        self.assertEqual(compressed, [{"id": i} for i in range(1000)])
+
+    def test_line_splitting_across_chunks(self) -> None:
+        content = b"".join(encode_json_lines([{"a": i} for i in range(100)], compress=True))
+        chunks = [content[i : i + 7] for i in range(0, len(content), 7)]
+
+        lines = list(iter_lines(chunks))
+
+        self.assertEqual(len(lines), 100)
+        self.assertEqual(gzip.decompress(content).count(b"\n"), 100)
+        self.assertEqual(encode_json({"a": [1, 2]}), b'{"a":[1,2]}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Tests of the in-memory cache of decoded objects, against the in-memory S3 stand-in.
+"""
+# External imports
+import pickle  # nosec B403 - test data only
+import unittest
+from unittest.mock import patch
+
+from aws import S3Manager
+from aws.memo_cache import DecodedObjectCache
+from aws.testing import S3StubTestCase
+
+
+class TestDecodedObjectCache(S3StubTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.s3_client.add_object("models/model.pkl", pickle.dumps({"weights": [1, 2, 3]}))
+
+    def manager(self, ttl: float = 60, max_bytes: int = 1024**2) -> S3Manager:
+        return self.make_manager(memo_cache=DecodedObjectCache(max_bytes, ttl))
+
+    def test_memoized_call_decodes_once(self) -> None:
+        s3_manager = self.manager()
+        with patch("aws.codec_registry.pickle.loads", wraps=pickle.loads) as loads:
+            first = s3_manager.download_from_s3("model.pkl", "models", memoize=True)
+            second = s3_manager.download_from_s3("model.pkl", "models", memoize=True)
+
+        self.assertIs(first, second)
+        self.assertEqual(loads.call_count, 1)
+        self.assertEqual(self.s3_client.calls["GetObject"], 1)
+
+    def test_expired_entry_is_revalidated(self) -> None:
+        """
+        Past the TTL a conditional GET is sent; a 304 reuses the value, a new ETag does not.
+        """
+        s3_manager = self.manager(ttl=0)
+        first = s3_manager.download_from_s3("model.pkl", "models", memoize=True)
+        second = s3_manager.download_from_s3("model.pkl", "models", memoize=True)
+        self.s3_client.add_object("models/model.pkl", pickle.dumps({"weights": [4]}))
+        third = s3_manager.download_from_s3("model.pkl", "models", memoize=True)
+
+        self.assertIs(first, second)
+        self.assertEqual(third, {"weights": [4]})
+        self.assertEqual(self.s3_client.calls["GetObject"], 3)
+        self.assertEqual((s3_manager.memo_cache.hits, s3_manager.memo_cache.misses), (1, 2))
+
+    def test_memoize_folder(self) -> None:
+        s3_manager = self.manager()
+        self.s3_client.add_object("other/a.txt", b"a")
+        s3_manager.memoize_folder("models")
+
+        for _ in range(2):
+            s3_manager.download_from_s3("model.pkl", "models")
+            s3_manager.download_from_s3("a.txt", "other")
+
+        self.assertEqual(self.s3_client.calls["GetObject"], 3)
+
+    def test_memory_budget_evicts_least_recently_used(self) -> None:
+        cache = DecodedObjectCache(max_bytes=250, ttl=60)
+        cache.put("a", '"1"', "a" * 100, 100)
+        cache.put("b", '"2"', "b" * 100, 100)
+        cache.get("a")
+        cache.put("c", '"3"', "c" * 100, 100)
+        cache.put("d", '"4"', "d" * 1000, 1000)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNone(cache.get("d"))
+        self.assertEqual(cache.size, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
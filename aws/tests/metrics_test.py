@@ -0,0 +1,109 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Tests of the per-operation metrics of S3Manager, against the in-memory S3 stand-in.
+"""
+# External imports
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from aws.metrics import OperationRecord, S3Metrics
+from aws.testing import S3StubTestCase
+
+
+class TestS3Metrics(S3StubTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.records: list[OperationRecord] = []
+        self.metrics = S3Metrics(hooks=[self.records.append])
+        self.s3_manager = self.make_manager(metrics=self.metrics)
+
+    def test_calls_are_recorded_by_operation_and_status(self) -> None:
+        self.s3_manager.upload_to_s3("a.txt", b"x" * 5000, "data")
+        self.s3_manager.upload_to_s3("b.txt", b"y" * 100, "data")
+        self.s3_manager.download_from_s3("a.txt", "data")
+        self.s3_manager.download_from_s3("missing.txt", "data")
+        self.assertEqual(list(self.s3_manager.iter_files("data")), ["a.txt", "b.txt"])
+        self.s3_manager.rename_s3_folder("data", "moved")
+        self.s3_manager.delete_object_from_s3("a.txt", "moved")
+
+        snapshot = self.metrics.snapshot()
+
+        self.assertEqual(snapshot["upload_to_s3"]["calls"], {"ok": 2})
+        self.assertEqual(snapshot["upload_to_s3"]["bytes"], 5100)
+        self.assertEqual(snapshot["upload_to_s3"]["size_bytes"]["buckets"]["1024"], 1)
+        self.assertEqual(snapshot["download_from_s3"]["calls"], {"ok": 1, "error": 1})
+        self.assertEqual(snapshot["download_from_s3"]["bytes"], 5000)
+        self.assertEqual(snapshot["iter_files"]["calls"], {"ok": 1})
+        self.assertEqual(snapshot["rename_s3_folder"]["bytes"], 5100)
+        self.assertEqual(snapshot["delete_object_from_s3"]["calls"], {"ok": 1})
+        self.assertEqual(snapshot["upload_to_s3"]["latency_seconds"]["count"], 2)
+        # rename_s3_folder is recorded once, without the copy and delete it is made of
+        self.assertEqual(
+            [record.operation for record in self.records[-3:]],
+            ["iter_files", "rename_s3_folder", "delete_object_from_s3"],
+        )
+        self.assertNotIn("copy_s3_folder", snapshot)
+        self.assertGreater(self.records[0].started_at, 0)
+
+    @patch("aws.transfer.time.sleep")
+    def test_retries_are_counted(self, mock_sleep: MagicMock) -> None:
+        self.s3_client.transient_failures["data/a.txt"] = 2
+
+        self.assertEqual(self.s3_manager.upload_to_s3("a.txt", b"abc", "data"), 0)
+
+        self.assertEqual(self.records[-1].retries, 2)
+        self.assertEqual(self.metrics.snapshot()["upload_to_s3"]["retries"], 2)
+
+    @patch("aws.transfer.time.sleep")
+    def test_nested_calls_are_part_of_the_outer_one(self, mock_sleep: MagicMock) -> None:
+        for name in ("a.txt", "b.txt"):
+            self.s3_client.add_object(f"data/{name}", b"x" * 100)
+        self.s3_client.transient_failures["data/b.txt"] = 1
+
+        with tempfile.TemporaryDirectory() as local_dir:
+            self.assertTrue(self.s3_manager.download_folder(local_dir, "data").ok)
+
+        self.assertEqual([record.operation for record in self.records], ["download_folder"])
+        self.assertEqual(self.records[0].retries, 1)
+        self.assertEqual(self.records[0].size, 200)
+
+    def test_prometheus_export(self) -> None:
+        self.s3_manager.upload_to_s3("a.txt", b"abc", "data")
+        self.s3_manager.delete_object_from_s3("a.txt", "data")
+
+        text = self.metrics.to_prometheus()
+
+        self.assertIn("# TYPE s3_operation_duration_seconds histogram", text)
+        self.assertIn('s3_operations_total{operation="upload_to_s3",status="ok"} 1', text)
+        self.assertIn('s3_operation_retries_total{operation="upload_to_s3"} 0', text)
+        self.assertIn(
+            's3_operation_duration_seconds_bucket{operation="upload_to_s3",le="+Inf"} 1', text
+        )
+        self.assertIn('s3_operation_payload_bytes_sum{operation="upload_to_s3"} 3', text)
+
+    def test_slow_calls_are_logged_and_hooks_isolated(self) -> None:
+        self.metrics.slow_threshold = 0.0
+        self.metrics.add_hook(MagicMock(side_effect=RuntimeError("exporter down")))
+
+        with patch("aws.metrics.logger") as mock_logger:
+            result = self.s3_manager.upload_to_s3("a.txt", b"abc", "data")
+
+        self.assertEqual(result, 0)
+        self.assertIn("Slow S3 operation upload_to_s3", mock_logger.warning.call_args[0][0])
+        mock_logger.error.assert_called_once()
+        self.assertEqual(len(self.records), 1)
+
+    def test_disabled_metrics_record_nothing(self) -> None:
+        s3_manager = self.make_manager()
+        s3_manager.metrics = None
+
+        self.assertEqual(s3_manager.upload_to_s3("a.txt", b"abc", "data"), 0)
+        self.assertEqual(list(s3_manager.iter_files("data")), ["a.txt"])
+        self.assertEqual(self.records, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
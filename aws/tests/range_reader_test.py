@@ -0,0 +1,121 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Tests of the ranged reads of S3 objects, against the in-memory S3 stand-in.
+"""
+# External imports
+import io
+import unittest
+import zipfile
+from typing import IO, cast
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+from aws.range_reader import S3RangeReader
+from aws.testing import S3StubTestCase
+
+
+class TestS3RangeReader(S3StubTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.s3_client.add_object("logs/app.log", bytes(range(256)) * 4)
+
+    def test_seek_and_read_ranges(self) -> None:
+        reader = S3RangeReader(self.s3_client, "bucket", "logs/app.log", read_ahead_blocks=0)
+
+        self.assertEqual(reader.read(4), bytes([0, 1, 2, 3]))
+        reader.seek(-2, io.SEEK_END)
+        self.assertEqual(reader.read(), bytes([254, 255]))
+        self.assertEqual(reader.read(), b"")
+        reader.seek(256)
+        self.assertEqual(reader.read(1), b"\x00")
+        self.assertEqual(reader.tell(), 257)
+
+    def test_blocks_are_cached_and_read_ahead(self) -> None:
+        """
+        Small reads within a block cost one request, and sequential reads prefetch blocks.
+        """
+        reader = S3RangeReader(
+            self.s3_client, "bucket", "logs/app.log", block_size=64, read_ahead_blocks=2
+        )
+
+        chunks = [reader.read(16) for _ in range(4)]  # first block, fetched once
+        self.assertEqual(reader.requests, 1)
+        chunks.append(reader.read(64))  # sequential: blocks 1 to 3 in one request
+        chunks.append(reader.read(128))
+        self.assertEqual(reader.requests, 2)
+        self.assertEqual(b"".join(chunks), bytes(range(256)))
+
+        reader.seek(1000)
+        self.assertEqual(reader.read(), bytes(range(232, 256)))
+        self.assertEqual(reader.requests, 3)
+        self.assertEqual(reader.bytes_fetched, 256 + 64)
+
+    def test_large_reads_bypass_the_cache(self) -> None:
+        reader = S3RangeReader(
+            self.s3_client, "bucket", "logs/app.log", block_size=16, cache_blocks=4
+        )
+
+        self.assertEqual(reader.read(), bytes(range(256)) * 4)
+        self.assertEqual((reader.requests, reader.bytes_fetched), (1, 1024))
+
+    def test_cached_blocks_of_a_read_are_not_evicted_by_its_fetch(self) -> None:
+        reader = S3RangeReader(
+            self.s3_client,
+            "bucket",
+            "logs/app.log",
+            block_size=16,
+            cache_blocks=4,
+            read_ahead_blocks=0,
+        )
+        for index in (5, 10, 11, 12):
+            reader.seek(index * 16)
+            reader.read(1)
+
+        reader.seek(90)
+
+        self.assertEqual(reader.read(16), (bytes(range(256)) * 4)[90:106])
+
+    def test_replaced_object_is_not_mixed(self) -> None:
+        reader = S3RangeReader(self.s3_client, "bucket", "logs/app.log", block_size=16)
+        reader.read(10)
+        self.s3_client.add_object("logs/app.log", bytes(1024))
+
+        with self.assertRaises(ClientError):
+            reader.seek(512)
+            reader.read(10)
+
+    def test_read_range(self) -> None:
+        content = bytes(range(256)) * 4
+
+        self.assertEqual(self.s3_manager.read_range("app.log", "logs", 10, 20), content[10:20])
+        self.assertEqual(self.s3_manager.read_range("app.log", "logs", 1000), content[1000:])
+        self.assertEqual(self.s3_manager.read_range("app.log", "logs", -5), content[-5:])
+        self.assertEqual(self.s3_manager.read_range("app.log", "logs", 2000, 3000), b"")
+        self.assertIsNone(self.s3_manager.read_range("missing.log", "logs", 0, 10))
+
+    def test_libraries_read_through_the_reader(self) -> None:
+        """
+        zipfile and pandas read a member or a CSV straight from S3.
+        """
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("big.bin", bytes(2_000_000))
+            zf.writestr("small.csv", "a,b\n1,2\n")
+        self.s3_client.add_object("archives/a.zip", archive.getvalue())
+
+        reader = self.s3_manager.open_reader("a.zip", "archives", block_size=16 * 1024)
+        assert reader is not None
+        # A RawIOBase, which typeshed does not count as an IO[bytes]
+        with reader, zipfile.ZipFile(cast(IO[bytes], reader)) as zf, zf.open("small.csv") as f:
+            df = pd.read_csv(f)
+
+        self.assertEqual(df.to_dict("records"), [{"a": 1, "b": 2}])
+        self.assertLess(reader.bytes_fetched, 100_000)
+        self.assertIsNone(self.s3_manager.open_reader("missing.zip", "archives"))
+
+
+if __name__ == "__main__":
+    unittest.main()
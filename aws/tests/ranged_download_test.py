@@ -0,0 +1,120 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+
+Tests of the parallel ranged download of large objects, against the in-memory S3 stand-in.
+"""
+# External imports
+import os
+import tempfile
+import unittest
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from aws.multipart import multipart_upload
+from aws.ranged_download import expected_etag
+from aws.testing import S3StubTestCase, client_error
+
+RANGE_SIZE = 64 * 1024
+
+
+class TestRangedDownload(S3StubTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.payload = os.urandom(1_000_000)
+        self.s3_client.add_object("big/data.bin", self.payload)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.local_path = os.path.join(self.tmp_dir.name, "data.bin")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_download_in_ranges(self) -> None:
+        result = self.s3_manager.download_large_file(
+            "data.bin", "big", self.local_path, range_size=RANGE_SIZE
+        )
+
+        self.assertEqual(result, self.local_path)
+        with open(self.local_path, "rb") as f:
+            self.assertEqual(f.read(), self.payload)
+        self.assertEqual(self.s3_client.calls["GetObject"], 16)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["data.bin"])
+
+    def fail_first_ranges(self) -> Any:
+        """
+        Make the GETs of the first two ranges fail with a 503, whatever the retries.
+        """
+        get_object = self.s3_client.get_object
+
+        def flaky_get_object(**kwargs: Any) -> dict[str, Any]:
+            if str(kwargs.get("Range")).startswith(("bytes=0-", f"bytes={RANGE_SIZE}-")):
+                raise client_error("SlowDown", "GetObject", 503)
+            return get_object(**kwargs)
+
+        return patch.object(self.s3_client, "get_object", side_effect=flaky_get_object)
+
+    @patch("aws.transfer.time.sleep")
+    def test_interrupted_download_resumes(self, mock_sleep: MagicMock) -> None:
+        """
+        Ranges that failed after all retries are the only ones fetched by the next call.
+        """
+        with self.fail_first_ranges():
+            first = self.s3_manager.download_large_file(
+                "data.bin", "big", self.local_path, range_size=RANGE_SIZE
+            )
+        self.assertIsNone(first)
+        self.assertTrue(os.path.exists(self.local_path + ".part.json"))
+        self.s3_client.calls.clear()
+
+        second = self.s3_manager.download_large_file(
+            "data.bin", "big", self.local_path, range_size=RANGE_SIZE
+        )
+
+        self.assertEqual(second, self.local_path)
+        with open(self.local_path, "rb") as f:
+            self.assertEqual(f.read(), self.payload)
+        self.assertEqual(self.s3_client.calls["GetObject"], 2)
+
+    @patch("aws.transfer.time.sleep")
+    def test_changed_object_restarts(self, mock_sleep: MagicMock) -> None:
+        with self.fail_first_ranges():
+            self.s3_manager.download_large_file(
+                "data.bin", "big", self.local_path, range_size=RANGE_SIZE
+            )
+        new_payload = os.urandom(300_000)
+        self.s3_client.add_object("big/data.bin", new_payload)
+
+        self.s3_manager.download_large_file(
+            "data.bin", "big", self.local_path, range_size=RANGE_SIZE
+        )
+
+        with open(self.local_path, "rb") as f:
+            self.assertEqual(f.read(), new_payload)
+
+    def test_multipart_etag_is_verified(self) -> None:
+        part_size = 5 * 1024 * 1024
+        payload = os.urandom(2 * part_size + 1000)
+        parts = [payload[i : i + part_size] for i in range(0, len(payload), part_size)]
+        multipart_upload(self.s3_client, "bucket", "big/multi.bin", parts)
+
+        result = self.s3_manager.download_large_file(
+            "multi.bin", "big", self.local_path, range_size=4 * 1024 * 1024
+        )
+
+        self.assertEqual(result, self.local_path)
+        etag = self.s3_client.objects["big/multi.bin"]["ETag"]
+        self.assertEqual(expected_etag(self.local_path, etag), etag)
+
+    def test_etag_mismatch_fails(self) -> None:
+        self.s3_client.objects["big/data.bin"]["ETag"] = f'"{"0" * 32}"'
+
+        result = self.s3_manager.download_large_file(
+            "data.bin", "big", self.local_path, range_size=RANGE_SIZE
+        )
+
+        self.assertIsNone(result)
+        self.assertFalse(os.path.exists(self.local_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
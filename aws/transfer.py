@@ -0,0 +1,227 @@
+"""
+Created by Analitika at 18/10/2026
+contact@analitika.fr
+"""
+# External imports
+from __future__ import annotations
+
+import contextvars
+import itertools
+import random  # nosec B311 - Used only for retry jitter
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import botocore.exceptions
+from botocore.exceptions import ClientError
+from loguru import logger
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # seconds, doubled on every retry
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # bytes read from S3 at a time when streaming
+
+# S3 error codes of transient failures (throttling, timeouts, server errors): the same
+# request may succeed when sent again. Any other error, e.g. PreconditionFailed or
+# InvalidRange, fails again
+RETRYABLE_ERROR_CODES = {
+    "BandwidthLimitExceeded",
+    "InternalError",
+    "PriorRequestNotComplete",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "RequestTimeout",
+    "RequestTimeoutException",
+    "ServiceUnavailable",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+}
+# botocore errors of a request that never got a complete response
+RETRYABLE_BOTOCORE_ERRORS = (
+    botocore.exceptions.ConnectionError,
+    botocore.exceptions.HTTPClientError,
+    botocore.exceptions.IncompleteReadError,
+)
+
+# Called with the error of every retried attempt, by whoever wants retries counted (metrics)
+retry_listener: contextvars.ContextVar[
+    Callable[[Exception], None] | None
+] = contextvars.ContextVar("retry_listener", default=None)
+
+
+@dataclass
+class TransferProgress:
+    """
+    Snapshot of a running transfer, handed to progress callbacks.
+    """
+
+    completed: int
+    failed: int
+    total: int | None
+    bytes_transferred: int
+    elapsed: float
+    skipped: int = 0
+
+    @property
+    def objects_per_second(self) -> float:
+        done = self.completed + self.failed + self.skipped
+        return done / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_transferred / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class TransferReport:
+    """
+    Summary of a bulk transfer: which keys made it, which did not and why.
+    """
+
+    succeeded: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+    bytes_transferred: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+ProgressCallback = Callable[[TransferProgress], None]
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Tell whether an S3 error is transient (throttling, 5xx, network) and worth retrying.
+    :param error: The exception raised by boto3
+    :return: True if the request may succeed when sent again
+    """
+    if isinstance(error, ClientError):
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        code = error.response.get("Error", {}).get("Code")
+        return code in RETRYABLE_ERROR_CODES or status == 429 or status >= 500
+    return isinstance(error, (*RETRYABLE_BOTOCORE_ERRORS, ConnectionError, TimeoutError))
+
+
+def call_with_retry(
+    func: Callable[..., T],
+    *args: Any,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    **kwargs: Any,
+) -> T:
+    """
+    Call ``func`` and retry transient S3 errors with exponential backoff and jitter.
+    :param func: The callable to run
+    :param max_retries: How many times to retry after the first attempt
+    :param backoff: Base delay in seconds, doubled on every attempt
+    :return: Whatever ``func`` returns
+    """
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            listener = retry_listener.get()
+            if listener is not None:
+                listener(e)
+            delay = backoff * 2**attempt * (0.5 + random.random() / 2)  # nosec B311
+            logger.debug(f"Retrying in {delay:.2f}s after error: {e}")
+            time.sleep(delay)
+            attempt += 1
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """
+    Group items into lists of ``size`` elements (the last one may be shorter), lazily.
+    """
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _run_in_context(
+    context: contextvars.Context, worker: Callable[[T], int | None], item: T
+) -> int | None:
+    return context.run(worker, item)
+
+
+def run_concurrently(
+    items: Iterable[T],
+    worker: Callable[[T], int | None],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_in_flight: int | None = None,
+    progress_callback: ProgressCallback | None = None,
+    total: int | None = None,
+    describe: Callable[[T], str] = str,
+) -> TransferReport:
+    """
+    Run ``worker`` over ``items`` on a thread pool and collect a TransferReport.
+
+    Items are consumed lazily, so at most ``max_in_flight`` of them are submitted at any time.
+    This keeps memory flat when ``items`` is a generator over millions of keys. Workers run in
+    a copy of the caller's context, so context variables (e.g. the retry listener) follow them.
+    :param items: The work items (usually S3 keys)
+    :param worker: Callable processing one item and returning the number of bytes moved,
+        or None when the item was skipped because there was nothing to do
+    :param max_workers: Number of threads in the pool
+    :param max_in_flight: Cap on submitted but unfinished items (defaults to 2 * max_workers)
+    :param progress_callback: Called with a TransferProgress after every finished item
+    :param total: Number of items, if known, forwarded to the progress callback
+    :param describe: Maps an item to the name used in the report
+    :return: TransferReport with succeeded and failed items
+    """
+    max_in_flight = max_in_flight or 2 * max_workers
+    report = TransferReport()
+    start = time.perf_counter()
+    pending: dict[Future[int | None], str] = {}
+
+    def collect(done: set[Future[int | None]]) -> None:
+        for future in done:
+            name = pending.pop(future)
+            try:
+                transferred = future.result()
+            except Exception as e:
+                report.failed[name] = str(e)
+            else:
+                if transferred is None:
+                    report.skipped.append(name)
+                else:
+                    report.bytes_transferred += transferred
+                    report.succeeded.append(name)
+            if progress_callback is not None:
+                progress_callback(
+                    TransferProgress(
+                        completed=len(report.succeeded),
+                        failed=len(report.failed),
+                        total=total,
+                        bytes_transferred=report.bytes_transferred,
+                        elapsed=time.perf_counter() - start,
+                        skipped=len(report.skipped),
+                    )
+                )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for item in items:
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            context = contextvars.copy_context()
+            pending[executor.submit(_run_in_context, context, worker, item)] = describe(item)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    report.elapsed = time.perf_counter() - start
+    return report
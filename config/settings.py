@@ -37,6 +37,26 @@ AWS_SQS_QUEUE_NAME = os.getenv("AWS_SQS_QUEUE_NAME", None)
 AWS_REGION = os.getenv("AWS_REGION", None)
 AWS_FOLDER = os.getenv("AWS_FOLDER", None)
 S3_BUCKET_NAME = os.getenv("AWS_BUCKET", None)
+# S3 client tuning, shared by every S3Manager of the process
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", 50))
+S3_CONNECT_TIMEOUT = float(os.getenv("S3_CONNECT_TIMEOUT", 5))
+S3_READ_TIMEOUT = float(os.getenv("S3_READ_TIMEOUT", 60))
+# botocore attempts per request: 1, as S3Manager retries transient errors itself (call_with_retry)
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", 1))
+S3_RETRY_MODE = os.getenv("S3_RETRY_MODE", "adaptive")
+# Local read-through cache of downloads, disabled unless a directory is given
+S3_CACHE_DIR = os.getenv("S3_CACHE_DIR", None)
+S3_CACHE_MAX_BYTES = int(os.getenv("S3_CACHE_MAX_BYTES", 1024**3))
+# In-memory cache of decoded downloads, used for memoized calls and folders only
+S3_MEMO_MAX_BYTES = int(os.getenv("S3_MEMO_MAX_BYTES", 256 * 1024**2))
+S3_MEMO_TTL = float(os.getenv("S3_MEMO_TTL", 300))
+# Per-operation metrics of S3Manager, off unless enabled or a slow-call threshold is given
+S3_METRICS = os.getenv("S3_METRICS", "False").lower() in ("true", "1", "t", "yes", "y")
+S3_SLOW_OPERATION_SECONDS = (
+    float(os.environ["S3_SLOW_OPERATION_SECONDS"])
+    if os.getenv("S3_SLOW_OPERATION_SECONDS")
+    else None
+)
 
 # SES
 AWS_SES_USERNAME = os.getenv("AWS_SES_USERNAME", "")
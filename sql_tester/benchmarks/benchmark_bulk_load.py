@@ -0,0 +1,115 @@
+"""
+Compare the ways of loading a large TRANSACTIONS DataFrame: the former path (to_dict records,
+the str-key copy of initialise_db and insert_data) against bulk_insert_data, with and without
+the fast-load PRAGMAs and the deferred indexes, and from an Arrow table.
+
+Usage:
+    python -m sql_tester.benchmarks.benchmark_bulk_load [n_rows]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import Any
+
+# External imports
+import numpy as np
+import pandas as pd
+
+# Internal imports
+from sql_tester.benchmarks.timing import measure, results, show_results_only
+from sql_tester.bulk_load import FAST_LOAD_PRAGMAS
+from sql_tester.connection_pool import close_pools
+from sql_tester.dblite import (
+    bulk_insert_data,
+    execute_query,
+    execute_sql_file,
+    insert_data,
+    pooled_connection,
+)
+
+N_ROWS = 1_000_000
+CREATE_TABLES_DIR = Path(__file__).resolve().parent.parent / "create_tables"
+
+
+def create_database(db_path: Path) -> None:
+    execute_sql_file(CREATE_TABLES_DIR / "product_nomenclature.sql", db_path)
+    execute_sql_file(CREATE_TABLES_DIR / "transactions.sql", db_path)
+    execute_query(
+        "INSERT INTO PRODUCT_NOMENCLATURE VALUES (?, ?, ?)",
+        db_path,
+        fetch=False,
+        commit=True,
+        params=[(i, "DECO", f"product {i}") for i in range(100)],
+        many=True,
+    )
+
+
+def transactions(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "transaction_id": np.arange(n_rows),
+            "date": pd.Timestamp("2019-01-01") + pd.to_timedelta(np.arange(n_rows) % 365, "D"),
+            "order_id": np.arange(n_rows) // 3,
+            "client_id": rng.integers(0, 1000, n_rows),
+            "prod_id": rng.integers(0, 100, n_rows),
+            "prod_price": rng.uniform(1, 500, n_rows).round(2),
+            "prod_qty": rng.integers(1, 10, n_rows),
+        }
+    )
+
+
+def records_then_insert_data(df: pd.DataFrame, db_path: Path) -> None:
+    df = df.assign(date=df["date"].dt.strftime("%Y-%m-%d"))
+    # initialise_db and insert_transactions_sample_data each copied every record
+    records: list[dict[str | Hashable, Any]] = [
+        {str(k): v for k, v in record.items()} for record in df.to_dict(orient="records")
+    ]
+    records = [{str(k): v for k, v in record.items()} for record in records]
+    with pooled_connection(db_path) as conn:
+        insert_data(conn, "TRANSACTIONS", records)
+
+
+def load_into_new_database(
+    name: str, load: Callable[[pd.DataFrame, Path], object], df: pd.DataFrame
+) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "benchmark.sqlite3"
+        create_database(db_path)
+        measure(name, lambda: load(df, db_path), len(df), "rows")
+        close_pools()
+
+
+if __name__ == "__main__":
+    show_results_only()
+    data = transactions(int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS)
+    load_into_new_database("to_dict + insert_data (former)", records_then_insert_data, data)
+    load_into_new_database(
+        "bulk_insert_data, default settings",
+        lambda df, db_path: bulk_insert_data("TRANSACTIONS", df, db_path, defer_indexes=False),
+        data,
+    )
+    load_into_new_database(
+        "bulk_insert_data, fast load",
+        lambda df, db_path: bulk_insert_data(
+            "TRANSACTIONS", df, db_path, pragmas=FAST_LOAD_PRAGMAS
+        ),
+        data,
+    )
+    try:
+        import pyarrow as pa
+
+        arrow_table = pa.Table.from_pandas(data, preserve_index=False)
+        load_into_new_database(
+            "bulk_insert_data, Arrow table",
+            lambda df, db_path: bulk_insert_data(
+                "TRANSACTIONS", arrow_table, db_path, pragmas=FAST_LOAD_PRAGMAS
+            ),
+            data,
+        )
+    except ImportError:
+        results.info("pyarrow is not installed, Arrow table skipped")
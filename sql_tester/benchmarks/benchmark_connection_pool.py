@@ -0,0 +1,85 @@
+"""
+Compare the queries/s of opening a connection for every query, as dblite used to do, with
+borrowing one from the shared connection pool, from one thread and from several. Then
+compare, on pooled connections, queries whose values are formatted into the SQL text (a new
+statement to prepare every time) with the same queries using bound parameters.
+
+Usage:
+    python -m sql_tester.benchmarks.benchmark_connection_pool
+"""
+
+from __future__ import annotations
+
+import itertools
+import tempfile
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# External imports
+from loguru import logger
+
+# Internal imports
+from sql_tester.benchmarks.timing import measure, results, show_results_only
+from sql_tester.connection_pool import close_pools
+from sql_tester.dblite import (
+    execute_query,
+    get_connection,
+    initialise_db,
+    statement_cache_stats,
+)
+
+N_QUERIES = 2000
+N_THREADS = 4
+QUERY = "SELECT product_type, product_name FROM PRODUCT_NOMENCLATURE WHERE product_id = 490756"
+BOUND_QUERY = "SELECT product_type, product_name FROM PRODUCT_NOMENCLATURE WHERE product_id = ?"
+counter = itertools.count()
+
+
+def connect_per_query(db_path: Path) -> tuple[list, list[str]]:
+    """The former execute_query: connect, query, close."""
+    conn = get_connection(db_path)
+    cur = conn.cursor()
+    try:
+        cur.execute(QUERY)
+        rows = cur.fetchall()
+        columns = [desc[0] for desc in cur.description]
+        logger.info("Executed query successfully.")
+    finally:
+        conn.close()
+    return rows, columns
+
+
+def pooled_query(db_path: Path) -> None:
+    execute_query(QUERY, db_path)
+
+
+def formatted_query(db_path: Path) -> None:
+    execute_query(BOUND_QUERY.replace("?", str(next(counter))), db_path)
+
+
+def bound_query(db_path: Path) -> None:
+    execute_query(BOUND_QUERY, db_path, params=(next(counter),))
+
+
+def measure_threads(
+    name: str, run_query: Callable[[Path], object], db_path: Path, threads: int
+) -> None:
+    def run_all() -> None:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda _: run_query(db_path), range(N_QUERIES)))
+
+    measure(f"{name} x{threads}", run_all, N_QUERIES, "queries")
+
+
+if __name__ == "__main__":
+    show_results_only()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = initialise_db(local_dir=Path(tmp_dir))
+        for n_threads in (1, N_THREADS):
+            measure_threads("connection per query", connect_per_query, path, n_threads)
+            measure_threads("connection pool", pooled_query, path, n_threads)
+        measure_threads("values formatted into the SQL", formatted_query, path, 1)
+        measure_threads("bound parameters", bound_query, path, 1)
+        results.info(f"Statement cache hit rate: {statement_cache_stats(path).hit_rate:.1%}")
+        close_pools()
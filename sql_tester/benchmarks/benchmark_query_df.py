@@ -0,0 +1,88 @@
+"""
+Compare the ways of getting a large TRANSACTIONS table into typed columns: the former
+path (execute_query, pd.DataFrame over the sqlite3.Row list, then convert_to_date applied
+row by row) against execute_query_df and its NumPy and Arrow variants.
+
+Usage:
+    python -m sql_tester.benchmarks.benchmark_query_df
+"""
+
+from __future__ import annotations
+
+import random  # nosec B311 - synthetic benchmark data only
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+# External imports
+import pandas as pd
+
+# Internal imports
+from sql_tester.benchmarks.timing import measure, show_results_only
+from sql_tester.connection_pool import close_pools
+from sql_tester.dblite import (
+    convert_to_date,
+    execute_query,
+    execute_query_arrays,
+    execute_query_arrow,
+    execute_query_df,
+    execute_sql_file,
+)
+
+N_ROWS = 500_000
+QUERY = "SELECT * FROM TRANSACTIONS"
+CREATE_TABLES_DIR = Path(__file__).resolve().parent.parent / "create_tables"
+
+
+def create_database(db_path: Path) -> None:
+    execute_sql_file(CREATE_TABLES_DIR / "product_nomenclature.sql", db_path)
+    execute_sql_file(CREATE_TABLES_DIR / "transactions.sql", db_path)
+    execute_query(
+        "INSERT INTO PRODUCT_NOMENCLATURE VALUES (?, ?, ?)",
+        db_path,
+        fetch=False,
+        commit=True,
+        params=[(i, "DECO", f"product {i}") for i in range(100)],
+        many=True,
+    )
+    start = date(2019, 1, 1)
+    execute_query(
+        "INSERT INTO TRANSACTIONS VALUES (?, ?, ?, ?, ?, ?, ?)",
+        db_path,
+        fetch=False,
+        commit=True,
+        params=(
+            (
+                i,
+                (start + timedelta(days=i % 365)).isoformat(),
+                i // 3,
+                random.randrange(1000),  # nosec B311
+                random.randrange(100),  # nosec B311
+                round(random.uniform(1, 500), 2),  # nosec B311
+                random.randrange(1, 10),  # nosec B311
+            )
+            for i in range(N_ROWS)
+        ),
+        many=True,
+    )
+
+
+def rows_then_dataframe(db_path: Path) -> pd.DataFrame:
+    res = execute_query(QUERY, db_path)
+    df = pd.DataFrame(res[0], columns=res[1])
+    df["date"] = df["date"].apply(convert_to_date)
+    return df
+
+
+if __name__ == "__main__":
+    show_results_only()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "benchmark.sqlite3"
+        create_database(path)
+        measure(
+            "rows + DataFrame + apply (former)", lambda: rows_then_dataframe(path), N_ROWS, "rows"
+        )
+        measure("execute_query_df", lambda: execute_query_df(QUERY, path), N_ROWS, "rows")
+        measure("execute_query_arrays", lambda: execute_query_arrays(QUERY, path), N_ROWS, "rows")
+        measure("execute_query_arrow", lambda: execute_query_arrow(QUERY, path), N_ROWS, "rows")
+        close_pools()
@@ -0,0 +1,46 @@
+"""
+Timing and output helpers shared by the sql_tester benchmarks.
+
+The code measured logs every query it runs; benchmarks log their results with ``results``
+and call ``show_results_only`` first, so that only those lines are printed.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+# External imports
+from loguru import logger
+
+results = logger.bind(benchmark=True)
+
+
+def show_results_only() -> None:
+    """Print the benchmark results, without the logs of the code they measure."""
+    logger.remove()
+    logger.add(
+        lambda message: print(message, end=""),
+        level="INFO",
+        filter=lambda record: record["extra"].get("benchmark", False),
+    )
+
+
+def measure(name: str, run: Callable[[], object], count: int, unit: str) -> float:
+    """
+    Time a single call and log its duration and rate.
+
+    Parameters:
+    - name: Label of the measured variant.
+    - run: The code to time.
+    - count: Number of units (rows, queries) processed by the call, for the rate.
+    - unit: Name of the unit in the output.
+
+    Returns:
+    - The elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    results.info(f"{name:<40} {elapsed:>7.3f}s {count / elapsed:>12.0f} {unit}/s")
+    return elapsed
@@ -0,0 +1,232 @@
+"""
+Bulk loading of rows into SQLite tables.
+
+insert_data takes a list of dicts and inserts it in one executemany, with the database
+settings tuned for safe small writes and every index updated row by row. For large loads
+this module takes the data as it usually comes, a DataFrame, a pyarrow Table or any
+iterable of tuples, converts it chunk by chunk to plain Python values without building a
+dict per row, and inserts every chunk with executemany in a single transaction. During the
+load it can:
+- relax the durability PRAGMAs (WAL journal, synchronous=OFF, a larger page cache), which
+  are restored afterwards. A crash during the load may then corrupt the database, so use
+  it for databases that can be rebuilt, like these test databases;
+- drop the table's non-unique indexes and create them again once the data is in, which
+  sorts each index once instead of updating it for every row. Unique indexes are kept, they
+  are what rejects a duplicate row, and the drop, the inserts and the new CREATE INDEX run
+  in the same transaction, so a failed load leaves the schema as it was.
+"""
+
+from __future__ import annotations
+
+# External imports
+import gc
+import itertools
+import re
+import sqlite3
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+import pandas as pd
+from loguru import logger
+
+DEFAULT_BULK_CHUNK_SIZE = 50_000  # rows per executemany call
+# PRAGMA name -> value applied during the load
+FAST_LOAD_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "WAL",
+    "synchronous": "OFF",
+    "cache_size": -256 * 1024,  # negative values are in KiB: 256 MiB
+    "temp_store": "MEMORY",
+}
+ALLOWED_PRAGMAS = {"journal_mode", "synchronous", "cache_size", "temp_store", "locking_mode"}
+_PRAGMA_VALUE = re.compile(r"^(-?\d+|[A-Za-z_]+)$")
+
+
+def canonical_table_name(conn: sqlite3.Connection, table_name: str) -> str:
+    """
+    Return the name of a table as declared in the schema, matched case-insensitively like
+    SQLite does, raising ValueError if the table does not exist.
+    """
+    row = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ? COLLATE NOCASE",
+        (table_name,),
+    ).fetchone()
+    if row is None:
+        raise ValueError(f"Unknown table: {table_name}")
+    name: str = row[0]
+    return name
+
+
+def table_columns(conn: sqlite3.Connection, table_name: str) -> list[str]:
+    """
+    Return the columns of a table, raising ValueError if the table does not exist.
+    """
+    columns = [
+        row[0] for row in conn.execute("SELECT name FROM pragma_table_info(?)", (table_name,))
+    ]
+    if not columns:
+        raise ValueError(f"Unknown table: {table_name}")
+    return columns
+
+
+def _python_values(column: pd.Series) -> list[Any]:
+    """Convert a DataFrame column to values sqlite3 can bind, NULLs as None."""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        column = column.astype(str)  # ISO 8601, dates alone for midnight timestamps
+    if column.hasnans and not pd.api.types.is_float_dtype(column):
+        return column.astype(object).where(column.notna(), None).tolist()
+    return column.tolist()  # NumPy scalars become Python ones; NaN floats are stored as NULL
+
+
+def _dataframe_chunks(df: pd.DataFrame, chunk_size: int) -> Iterator[list[tuple]]:
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start : start + chunk_size]
+        yield list(zip(*(_python_values(chunk[name]) for name in chunk.columns)))
+
+
+def _arrow_chunks(table: Any, chunk_size: int) -> Iterator[list[tuple]]:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for batch in table.to_batches(max_chunksize=chunk_size):
+        columns = []
+        for array in batch.columns:
+            if pa.types.is_temporal(array.type):
+                array = pc.cast(array, pa.string())
+            columns.append(array.to_pylist())
+        yield list(zip(*columns))
+
+
+def _tuple_chunks(rows: Iterable[tuple], chunk_size: int) -> Iterator[list[tuple]]:
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
+
+
+def row_chunks(data: Any, chunk_size: int) -> tuple[list[str] | None, Iterator[list[tuple]]]:
+    """
+    Split the data to load into chunks of plain tuples.
+
+    Returns:
+    - The column names carried by the data (None for plain tuples) and the chunks.
+    """
+    if isinstance(data, pd.DataFrame):
+        return [str(name) for name in data.columns], _dataframe_chunks(data, chunk_size)
+    if hasattr(data, "to_batches") and hasattr(data, "column_names"):  # pyarrow Table
+        return list(data.column_names), _arrow_chunks(data, chunk_size)
+    return None, _tuple_chunks(data, chunk_size)
+
+
+def _apply_pragmas(conn: sqlite3.Connection, pragmas: Mapping[str, str | int]) -> dict[str, Any]:
+    """Apply PRAGMAs and return the values they had before."""
+    for name, value in pragmas.items():
+        if name not in ALLOWED_PRAGMAS or not _PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f"Unsupported PRAGMA {name} = {value}")
+    previous = {}
+    for name, value in pragmas.items():
+        previous[name] = conn.execute(f"PRAGMA {name}").fetchone()[0]
+        conn.execute(f"PRAGMA {name} = {value}")
+    return previous
+
+
+def _restore_pragmas(conn: sqlite3.Connection, previous: Mapping[str, Any]) -> None:
+    for name, value in previous.items():
+        try:
+            conn.execute(f"PRAGMA {name} = {value}")
+        except sqlite3.Error as e:  # e.g. leaving WAL while another connection reads
+            logger.warning(f"Could not restore PRAGMA {name} = {value}: {e}")
+
+
+def _drop_indexes(conn: sqlite3.Connection, table_name: str) -> list[str]:
+    """
+    Drop the non-unique, explicitly created indexes of a table, within the current
+    transaction, and return their CREATE statements. Unique indexes and the ones backing
+    PRIMARY KEY and UNIQUE constraints are kept.
+    """
+    indexes = conn.execute(
+        "SELECT il.name, m.sql FROM pragma_index_list(?) AS il "
+        "JOIN sqlite_master AS m ON m.type = 'index' AND m.name = il.name "
+        "WHERE il.origin = 'c' AND NOT il.\"unique\"",
+        (table_name,),
+    ).fetchall()
+    for name, _ in indexes:
+        conn.execute(f'DROP INDEX "{name}"')
+    return [sql for _, sql in indexes]
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Pause the cyclic garbage collector: the millions of row tuples built during a load hold
+    no cycles, but every one of them triggers and is scanned by its collections.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def bulk_insert(
+    conn: sqlite3.Connection,
+    table_name: str,
+    data: Any,
+    columns: Sequence[str] | None = None,
+    chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    pragmas: Mapping[str, str | int] | None = None,
+    defer_indexes: bool = True,
+) -> int:
+    """
+    Insert rows into a table in chunks, within one transaction.
+
+    Parameters:
+    - conn: SQLite database connection object, not in a transaction.
+    - table_name: Name of an existing table.
+    - data: A DataFrame, a pyarrow Table or an iterable of tuples.
+    - columns: Columns the values are for; by default the DataFrame's or Table's columns,
+      and all the table's columns, in order, for tuples.
+    - chunk_size: Number of rows per executemany call.
+    - pragmas: PRAGMAs applied during the load and restored afterwards, e.g.
+      FAST_LOAD_PRAGMAS for a database that can be rebuilt; None keeps the current settings.
+    - defer_indexes: Drop the table's non-unique indexes during the load and create them
+      again at the end, in the same transaction.
+
+    Returns:
+    - The number of rows inserted. On error the transaction is rolled back, so nothing is
+      inserted and no index is lost, and the PRAGMAs are restored.
+    """
+    # Indexes are looked up by the declared name, whatever the case it is given in
+    table_name = canonical_table_name(conn, table_name)
+    known_columns = table_columns(conn, table_name)
+    data_columns, chunks = row_chunks(data, chunk_size)
+    columns = list(columns or data_columns or known_columns)
+    unknown = set(columns) - set(known_columns)
+    if unknown:
+        raise ValueError(f"Unknown columns for {table_name}: {sorted(unknown)}")
+
+    if conn.in_transaction:
+        raise ValueError("bulk_insert needs a connection without an open transaction")
+
+    # Table and column names are checked against the schema above, safe to use in the query
+    column_list = ", ".join(f'"{name}"' for name in columns)
+    placeholders = ", ".join(["?"] * len(columns))
+    query = f'INSERT INTO "{table_name}" ({column_list}) VALUES ({placeholders})'  # nosec B608
+    # journal_mode cannot change within a transaction, the PRAGMAs are applied before it
+    previous = _apply_pragmas(conn, pragmas or {})
+    inserted = 0
+    try:
+        # sqlite3 only opens a transaction implicitly before DML, DROP INDEX needs BEGIN
+        with _gc_paused(), conn:
+            conn.execute("BEGIN")
+            index_sql = _drop_indexes(conn, table_name) if defer_indexes else []
+            for chunk in chunks:
+                conn.executemany(query, chunk)
+                inserted += len(chunk)
+            for sql in index_sql:
+                conn.execute(sql)
+    finally:
+        _restore_pragmas(conn, previous)
+    logger.info(f"Bulk inserted {inserted} rows into {table_name}.")
+    return inserted
@@ -0,0 +1,159 @@
+"""
+Columnar conversion of SQLite query results.
+
+Building a DataFrame from a list of sqlite3.Row objects transposes the result cell by cell
+and leaves pandas to guess every dtype from Python objects, after which dates still have to
+be parsed row by row. Here rows are fetched as plain tuples, transposed once with zip, and
+each column is converted in one call to the type declared for it in the schema:
+
+    INTEGER -> int64 (Int64 when it has NULLs)     REAL / FLOAT / DOUBLE -> float64
+    DATE / DATETIME / TIMESTAMP -> datetime64       BOOLEAN -> bool
+    TEXT / CHAR / CLOB -> strings                    anything else -> inferred by pandas
+
+The declared type of a result column is looked up by its name among the columns of the
+database's tables, so computed or renamed columns (``date AS transaction_date``) are
+inferred unless their type is given explicitly. Since a name can match a table column while
+holding something else (``AVG(prod_qty) AS prod_qty``), the values are checked before a
+column is cast: when they do not fit the declared type, pandas infers it from them.
+"""
+
+from __future__ import annotations
+
+# External imports
+import sqlite3
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+ColumnKind = str  # "integer", "real", "datetime", "boolean", "text" or "other"
+
+# schema_version is bumped by SQLite on every schema change, but starts over in a database
+# recreated at the same path: close_pools clears the entries of the files it closes
+_declared_types_cache: dict[tuple[Path, int], dict[str, str]] = {}
+
+
+def column_kind(declared_type: str | None) -> ColumnKind:
+    """
+    Classify a declared SQL type, following SQLite's affinity rules for the numeric ones.
+    """
+    declared = (declared_type or "").upper()
+    if "DATE" in declared or "TIME" in declared:
+        return "datetime"
+    if "INT" in declared:
+        return "integer"
+    if "BOOL" in declared:
+        return "boolean"
+    if any(name in declared for name in ("CHAR", "CLOB", "TEXT")):
+        return "text"
+    if any(name in declared for name in ("REAL", "FLOA", "DOUB")):
+        return "real"
+    return "other"
+
+
+def declared_types(conn: sqlite3.Connection, db_path: Path) -> dict[str, str]:
+    """
+    Map the column names of every table to their declared type. Names declared with
+    different types in different tables are left out, since they cannot be resolved by name.
+
+    Parameters:
+    - conn: Connection to the database.
+    - db_path: Path of the database file, to cache the result per schema version.
+    """
+    version = conn.execute("PRAGMA schema_version").fetchone()[0]
+    key = (Path(db_path).resolve(), version)
+    if key not in _declared_types_cache:
+        types: dict[str, str] = {}
+        ambiguous: set[str] = set()
+        tables = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        for (table,) in tables:
+            for column in conn.execute("SELECT name, type FROM pragma_table_info(?)", (table,)):
+                name, declared = column[0].lower(), column[1]
+                if types.setdefault(name, declared) != declared:
+                    ambiguous.add(name)
+        _declared_types_cache[key] = {k: v for k, v in types.items() if k not in ambiguous}
+    return _declared_types_cache[key]
+
+
+def forget_declared_types(db_path: Path | None = None) -> None:
+    """
+    Drop the cached declared types of a database file, or of all of them.
+    """
+    path = None if db_path is None else Path(db_path).resolve()
+    for key in [key for key in _declared_types_cache if path is None or key[0] == path]:
+        _declared_types_cache.pop(key, None)
+
+
+def to_array(values: Sequence[Any], kind: ColumnKind) -> Any:
+    """
+    Convert the values of one column to a typed array in a single call, if they fit the
+    declared kind; otherwise the dtype is inferred from the values.
+
+    Returns:
+    - A NumPy array, or a pandas array for strings, undeclared values and integers with NULLs.
+    """
+    types = set(map(type, values))
+    types.discard(type(None))
+    if kind == "integer" and types <= {int}:
+        if None in values:
+            return pd.array(values, dtype="Int64")
+        return np.fromiter(values, dtype=np.int64, count=len(values))
+    if kind == "real" and types <= {int, float}:
+        return np.array(values, dtype=np.float64)  # NULLs become NaN
+    if kind == "datetime" and types <= {str}:
+        try:
+            return pd.to_datetime(np.array(values, dtype=object), format="ISO8601").to_numpy()
+        except ValueError:  # not dates after all
+            pass
+    if kind == "boolean" and types <= {int} and None not in values and set(values) <= {0, 1}:
+        return np.array(values, dtype=bool)
+    # Text, undeclared and mismatching columns get pandas' own inference, as with
+    # pd.DataFrame(rows)
+    return pd.Series(values).array
+
+
+def rows_to_columns(
+    rows: list[tuple],
+    names: list[str],
+    types: Mapping[str, str],
+) -> dict[str, Any]:
+    """
+    Transpose rows of plain tuples into typed columns.
+
+    Parameters:
+    - rows: The fetched rows.
+    - names: The result column names, in order.
+    - types: Declared SQL type by lower-cased column name; columns not found are inferred.
+    """
+    columns = list(zip(*rows)) if rows else [() for _ in names]
+    return {
+        name: to_array(values, column_kind(types.get(name.lower())))
+        for name, values in zip(names, columns)
+    }
+
+
+def to_numpy_arrays(columns: Mapping[str, Any]) -> dict[str, np.ndarray]:
+    """
+    Convert typed columns to NumPy arrays: integers with NULLs become float64 with NaN,
+    strings and mixed values object arrays.
+    """
+    return {
+        name: (
+            values.to_numpy(dtype=np.float64, na_value=np.nan)
+            if isinstance(values, pd.arrays.IntegerArray)
+            else np.asarray(values)
+        )
+        for name, values in columns.items()
+    }
+
+
+def to_arrow_table(columns: Mapping[str, Any]) -> Any:
+    """
+    Build a pyarrow Table from typed columns, without copying the numeric ones.
+    pyarrow is imported on first use.
+    """
+    import pyarrow as pa
+
+    return pa.table({name: pa.array(values) for name, values in columns.items()})
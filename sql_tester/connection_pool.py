@@ -0,0 +1,317 @@
+"""
+Pool of reusable SQLite connections for the dblite helpers.
+
+Opening a connection costs a file open, the schema parsing and the PRAGMA setup, and closing
+it throws away the page cache warmed by the previous queries. The pool keeps up to
+``max_connections`` connections per database open and hands them out to one thread at a
+time. A thread asking again while it already holds one (nested helpers) gets the same
+connection back, and a connection returned with a transaction still open is rolled back,
+which is what closing it used to do.
+
+Each connection keeps up to ``statement_cache_size`` prepared statements (sqlite3's
+``cached_statements``), so a query run again with other bound parameters skips parsing and
+planning. sqlite3 does not report how well that cache works: the pool mirrors it with an LRU
+of the SQL texts executed through ``execute``, whose hit rate tells how to size the cache.
+
+Usage:
+    with ConnectionPool(db_path, max_connections=4) as pool:
+        with pool.connection() as conn:
+            conn.execute("SELECT 1")
+
+The dblite helpers use one shared pool per database file, see get_pool and close_pools.
+"""
+
+from __future__ import annotations
+
+# External imports
+import atexit
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+# Internal imports
+from sql_tester.columnar import forget_declared_types
+
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_TIMEOUT = 30.0  # seconds to wait for a free connection
+DEFAULT_STATEMENT_CACHE_SIZE = 128  # prepared statements kept per connection
+
+Params = Sequence[Any] | Mapping[str, Any]
+
+
+@dataclass
+class StatementCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class PoolClosedError(RuntimeError):
+    """Raised when a connection is requested from a closed pool."""
+
+
+def open_connection(
+    db_path: Path, statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE
+) -> sqlite3.Connection:
+    """
+    Open a connection configured like every dblite connection.
+
+    Parameters:
+    - db_path: Path to the SQLite database file.
+    - statement_cache_size: Number of prepared statements kept by the connection.
+
+    Returns:
+    - A connection with foreign keys enabled and dictionary-like rows, usable from any
+      thread (the pool makes sure only one thread uses it at a time).
+    """
+    conn = sqlite3.connect(
+        db_path, check_same_thread=False, cached_statements=statement_cache_size
+    )
+    # Enable foreign keys
+    conn.execute("PRAGMA foreign_keys = ON")
+    # Return dictionary-like rows
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        db_path: Path,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT,
+        statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE,
+    ) -> None:
+        """
+        Create an empty pool, connections are opened on demand.
+
+        Parameters:
+        - db_path: Path to the SQLite database file.
+        - max_connections: Maximum number of connections open at the same time.
+        - timeout: Seconds to wait for a connection when all of them are in use.
+        - statement_cache_size: Number of prepared statements kept by each connection.
+        """
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+        self.db_path = Path(db_path)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.statement_cache_size = statement_cache_size
+        self.statement_stats = StatementCacheStats()
+        self.opened = 0  # connections opened over the pool's lifetime
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: set[sqlite3.Connection] = set()
+        # connection -> SQL texts of its cached statements, least recently used first
+        self._statements: dict[sqlite3.Connection, OrderedDict[str, None]] = {}
+        self._closed = False
+
+    def __enter__(self) -> ConnectionPool:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Number of connections currently open."""
+        return len(self._all)
+
+    @property
+    def idle(self) -> int:
+        """Number of open connections not borrowed at the moment."""
+        return self._idle.qsize()
+
+    @contextmanager
+    def connection(self, dedicated: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection for the duration of the with block.
+
+        Parameters:
+        - dedicated: Take a connection of its own, neither shared with the calling thread's
+          nested calls nor tied to that thread; for iterators, which may be suspended
+          between other queries or finished by another thread.
+
+        Returns:
+        - The connection already held by the calling thread if any, otherwise the most
+          recently used idle one (its page cache is the warmest) or a new one.
+        """
+        if dedicated:
+            conn = self._acquire()
+            try:
+                yield conn
+            finally:
+                self._release(conn)
+            return
+
+        held = getattr(self._local, "held", None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self._acquire()
+        self._local.held = conn
+        try:
+            yield conn
+        finally:
+            self._local.held = None
+            self._release(conn)
+
+    def execute(
+        self,
+        conn: sqlite3.Connection,
+        query: str,
+        params: Params | Iterable[Params] | None = None,
+        many: bool = False,
+    ) -> sqlite3.Cursor:
+        """
+        Execute a query on a connection of the pool, with bound parameters.
+
+        Parameters:
+        - conn: A connection borrowed from this pool.
+        - query: SQL query with ? or :name placeholders.
+        - params: Values bound to the placeholders, or with many=True an iterable of them.
+        - many: Run the query once per set of parameters, with a single preparation.
+
+        Returns:
+        - The cursor of the executed query.
+        """
+        self._record_statement(conn, query)
+        cur = conn.cursor()
+        try:
+            if many:
+                cur.executemany(query, params or [])
+            elif params is not None:
+                # Without many, params is a single set of values
+                cur.execute(query, cast(Params, params))
+            else:
+                cur.execute(query)
+        except Exception:
+            cur.close()
+            raise
+        return cur
+
+    def _record_statement(self, conn: sqlite3.Connection, query: str) -> None:
+        """Count a lookup in the statement cache of a connection, the way sqlite3 does it."""
+        with self._lock:
+            statements = self._statements.setdefault(conn, OrderedDict())
+            if query in statements:
+                statements.move_to_end(query)
+                self.statement_stats.hits += 1
+                return
+            self.statement_stats.misses += 1
+            if self.statement_cache_size > 0:
+                statements[query] = None
+                if len(statements) > self.statement_cache_size:
+                    statements.popitem(last=False)
+
+    def _acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise PoolClosedError(f"The connection pool of {self.db_path} is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(
+                f"No connection to {self.db_path} freed within {self.timeout}s "
+                f"({self.max_connections} in use)"
+            )
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            conn = open_connection(self.db_path, self.statement_cache_size)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._all.add(conn)
+            self.opened += 1
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        try:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                reusable = True
+            except sqlite3.Error:
+                reusable = False
+            with self._lock:
+                if reusable and not self._closed:
+                    self._idle.put(conn)
+                    return
+                self._all.discard(conn)
+                self._statements.pop(conn, None)
+            conn.close()
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """
+        Close the idle connections now and the borrowed ones when they are given back.
+        """
+        idle = []
+        with self._lock:
+            self._closed = True
+            while not self._idle.empty():
+                idle.append(self._idle.get_nowait())
+            self._all.difference_update(idle)
+            for conn in idle:
+                self._statements.pop(conn, None)
+        for conn in idle:
+            conn.close()
+
+
+_pools: dict[Path, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(
+    db_path: Path,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE,
+) -> ConnectionPool:
+    """
+    Return the shared pool of a database file, created on first use.
+
+    Parameters:
+    - db_path: Path to the SQLite database file.
+    - max_connections: Size of the pool if it has to be created.
+    - statement_cache_size: Prepared statements kept per connection if it has to be created.
+    """
+    key = Path(db_path).resolve()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(
+                key, max_connections, statement_cache_size=statement_cache_size
+            )
+        return pool
+
+
+def close_pools(db_path: Path | None = None) -> None:
+    """
+    Close the shared pool of a database file, or all of them. Call it before deleting or
+    replacing a database file, so no connection keeps pointing to the old one.
+    """
+    with _pools_lock:
+        keys = list(_pools) if db_path is None else [Path(db_path).resolve()]
+        pools = [_pools.pop(key) for key in keys if key in _pools]
+    for pool in pools:
+        pool.close()
+    # The file may be replaced by a new database whose schema_version starts over
+    forget_declared_types(db_path)
+
+
+atexit.register(close_pools)
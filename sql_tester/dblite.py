@@ -2,6 +2,8 @@
 This file is a to-tool for testing the SQLite database  .
 It is used to create the database and the tables.
 It is also used to execute the SQL scripts.
+Connections are taken from a pool shared per database file (see connection_pool), so
+repeated calls reuse open connections and their warm page cache.
 """
 
 from __future__ import annotations
@@ -11,16 +13,29 @@ import os
 
 # External imports
 import sqlite3
-from collections.abc import Hashable
+from collections.abc import Generator, Hashable, Iterable, Mapping
+from contextlib import AbstractContextManager
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 # Internal imports
+from sql_tester.bulk_load import DEFAULT_BULK_CHUNK_SIZE, FAST_LOAD_PRAGMAS, bulk_insert
+from sql_tester.columnar import declared_types, rows_to_columns, to_arrow_table, to_numpy_arrays
+from sql_tester.connection_pool import (
+    Params,
+    StatementCacheStats,
+    close_pools,
+    get_pool,
+    open_connection,
+)
 from sql_tester.synthetic_data import fake_it
 
+DEFAULT_FETCH_SIZE = 10_000  # rows fetched at a time by the streaming queries
+
 
 # Setup SQLite Database in a specific local directory
 def get_paths() -> tuple[Path, Path]:
@@ -32,44 +47,73 @@ def get_paths() -> tuple[Path, Path]:
     return local_dir, db_path
 
 
-# Setup SQLite Database
-def get_connection(db_path: Path | None = None) -> sqlite3.Connection:
-    """Create and return a database connection"""
+def _default_path(db_path: Path | None) -> Path:
     if db_path is None:
         _, db_path = get_paths()
+    return db_path
 
-    conn = sqlite3.connect(db_path)
-    # Enable foreign keys
-    conn.execute("PRAGMA foreign_keys = ON")
-    # Return dictionary-like rows
-    conn.row_factory = sqlite3.Row
-    return conn
 
+# Setup SQLite Database
+def get_connection(db_path: Path | None = None) -> sqlite3.Connection:
+    """Create and return a database connection"""
+    return open_connection(_default_path(db_path))
 
-def request(query: str, args: Any = None, fetch: bool = True, commit: bool = False) -> Any:
-    """Execute a database query with optional parameters"""
-    conn = get_connection()
-    cur = conn.cursor()
 
-    if args:
-        cur.execute(query, args)
-    else:
-        cur.execute(query)
+def pooled_connection(db_path: Path | None = None) -> AbstractContextManager[sqlite3.Connection]:
+    """
+    Borrow a connection from the shared pool of a database for the duration of a with block.
 
-    if fetch:
-        rows = cur.fetchall()
-        columns = [desc[0] for desc in cur.description]
-        result = rows, columns
-    else:
-        result = None
+    Parameters:
+    - db_path: Path to the SQLite database file, the default database if None.
+    """
+    return get_pool(_default_path(db_path)).connection()
 
-    if commit:
-        conn.commit()
 
-    conn.close()
+def _run_query(
+    query: str,
+    db_path: Path | None,
+    params: Params | Iterable[Params] | None,
+    many: bool,
+    fetch: bool,
+    commit: bool,
+) -> Any:
+    """Execute a query on a pooled connection, returning (rows, columns) if fetch is True."""
+    pool = get_pool(_default_path(db_path))
+    with pool.connection() as conn:
+        cur = pool.execute(conn, query, params, many)
+        try:
+            if fetch:
+                rows = cur.fetchall()
+                columns = [desc[0] for desc in cur.description or ()]
+                result = rows, columns
+            else:
+                result = None
+
+            if commit:
+                conn.commit()
+        finally:
+            cur.close()
+
     return result
 
 
+def request(
+    query: str, args: Any = None, fetch: bool = True, commit: bool = False, many: bool = False
+) -> Any:
+    """Execute a database query with optional parameters, or once per set of them if many"""
+    return _run_query(query, None, args, many, fetch, commit)
+
+
+def statement_cache_stats(db_path: Path | None = None) -> StatementCacheStats:
+    """
+    Return the hits and misses of the prepared-statement caches of a database's connections.
+
+    Parameters:
+    - db_path: Path to the SQLite database file, the default database if None.
+    """
+    return get_pool(_default_path(db_path)).statement_stats
+
+
 def execute_sql_file(sql_file_path: Path, db_path: Path) -> None:
     """
     Execute SQL commands from a file using sqlite3.
@@ -77,9 +121,7 @@ def execute_sql_file(sql_file_path: Path, db_path: Path) -> None:
     Parameters:
     - sql_file_path: Path to the SQL file containing commands.
     """
-    conn = get_connection(db_path)
-
-    try:
+    with pooled_connection(db_path) as conn:
         with open(sql_file_path) as sql_file:
             sql_commands = sql_file.read()
 
@@ -97,8 +139,6 @@ def execute_sql_file(sql_file_path: Path, db_path: Path) -> None:
             # raise
         finally:
             cursor.close()
-    finally:
-        conn.close()
 
 
 def __create_database_if_not_exists(db_path: Path) -> None:
@@ -108,6 +148,8 @@ def __create_database_if_not_exists(db_path: Path) -> None:
     # check if the database exists
     files_exist = os.path.isfile(db_path)
     if not files_exist:
+        # Pooled connections may still point to a deleted file at the same path
+        close_pools(db_path)
         # create the database
         conn = get_connection(db_path)
         conn.close()
@@ -126,7 +168,9 @@ def __create_tables(db_path: Path) -> None:
     execute_sql_file(queries_dir / "transactions.sql", db_path)
 
 
-def insert_data(conn: sqlite3.Connection, table_name: str, data: list[dict[str, Any]]) -> None:
+def insert_data(
+    conn: sqlite3.Connection, table_name: str, data: list[dict[str | Hashable, Any]]
+) -> None:
     """
     Insert data into a specified table in the SQLite database.
 
@@ -148,7 +192,7 @@ def insert_data(conn: sqlite3.Connection, table_name: str, data: list[dict[str,
     placeholders = ", ".join(["?"] * len(columns))  # Create placeholders for values
     # Table name is validated above, safe to use in query
     query = f"""
-    INSERT INTO {table_name} ({", ".join(columns)})
+    INSERT INTO {table_name} ({", ".join(map(str, columns))})
     VALUES ({placeholders})
     """  # nosec B608
     values = [
@@ -175,18 +219,10 @@ def insert_product_nomenclature_sample_data(
     #     {"product_id": 293718, "product_type": "DECO", "product_name": "Mug"},
     # ]
 
-    # Get a connection to the database
-    conn = get_connection(db_path)
-
-    try:
+    # Borrow a connection to the database
+    with pooled_connection(db_path) as conn:
         # Insert the sample data into the PRODUCT_NOMENCLATURE table
-        product_nomenclature_data = [
-            {str(k): v for k, v in record.items()} for record in sample_data
-        ]
-        insert_data(conn, "PRODUCT_NOMENCLATURE", product_nomenclature_data)
-    finally:
-        # Close the connection
-        conn.close()
+        insert_data(conn, "PRODUCT_NOMENCLATURE", sample_data)
 
 
 def insert_transactions_sample_data(
@@ -202,58 +238,245 @@ def insert_transactions_sample_data(
     #     {"date": "2020-01-01", "order_id": 3456, "client_id": 845, "prod_id": 293718, "prod_price": 10, "prod_qty": 6},
     # ]
 
-    # Get a connection to the database
-    conn = get_connection(db_path)
-
-    try:
+    # Borrow a connection to the database
+    with pooled_connection(db_path) as conn:
         # Insert the sample data into the TRANSACTIONS table
-        transaction_data = [{str(k): v for k, v in record.items()} for record in sample_data]
-        insert_data(conn, "TRANSACTIONS", transaction_data)
-    finally:
-        # Close the connection
-        conn.close()
+        insert_data(conn, "TRANSACTIONS", sample_data)
+
+
+def bulk_insert_data(
+    table_name: str,
+    data: Any,
+    db_path: Path | None = None,
+    columns: list[str] | None = None,
+    chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    pragmas: Mapping[str, str | int] | None = None,
+    defer_indexes: bool = True,
+) -> int:
+    """
+    Load a large amount of rows into a table, see bulk_load.bulk_insert.
+
+    Parameters:
+    - table_name: Name of an existing table.
+    - data: A DataFrame, a pyarrow Table or an iterable of tuples, converted chunk by chunk
+      without building a dict per row.
+    - db_path: Path to the SQLite database file, the default database if None.
+    - columns: Columns the values are for; by default the DataFrame's or Table's columns,
+      and all the table's columns, in order, for tuples.
+    - chunk_size: Number of rows per executemany call.
+    - pragmas: PRAGMAs applied during the load and restored afterwards; None keeps the
+      current settings. FAST_LOAD_PRAGMAS (WAL, synchronous=OFF, a 256 MiB cache) speeds the
+      load up, at the risk of a corrupt database after a crash: for rebuildable databases.
+    - defer_indexes: Drop the table's non-unique indexes during the load and create them
+      again at the end, in the same transaction.
+
+    Returns:
+    - The number of rows inserted.
+    """
+    with pooled_connection(db_path) as conn:
+        return bulk_insert(conn, table_name, data, columns, chunk_size, pragmas, defer_indexes)
 
 
 def execute_query(
-    query: str, db_path: Path | None = None, fetch: bool = True, commit: bool = False
+    query: str,
+    db_path: Path | None = None,
+    fetch: bool = True,
+    commit: bool = False,
+    params: Params | Iterable[Params] | None = None,
+    many: bool = False,
 ) -> Any:
     """
     Execute a query on a specified table in the SQLite database.
 
     Parameters:
-    - query: SQL query to execute.
+    - query: SQL query to execute, with ? or :name placeholders for the values.
     - fetch: Boolean indicating whether to fetch results.
     - commit: Boolean indicating whether to commit the transaction.
+    - params: Values bound to the placeholders; with many=True, an iterable of them.
+    - many: Boolean indicating whether to run the query once per set of params (executemany).
+
+    Bind values rather than formatting them into the SQL text: the statement is then prepared
+    once per connection and reused from its cache (see statement_cache_stats).
 
     Returns:
     - If fetch is True, returns a tuple of (rows, columns).
     - If fetch is False, returns None.
     """
-    conn = get_connection(db_path)  # if None, it uses the default db_path
-    cur = conn.cursor()
-
     try:
-        cur.execute(query)
-        if fetch:
-            rows = cur.fetchall()
-            columns = [desc[0] for desc in cur.description]
-            result = rows, columns
-        else:
-            result = None
-
-        if commit:
-            conn.commit()
-
+        result = _run_query(query, db_path, params, many, fetch, commit)
         logger.info("Executed query successfully.")
     except Exception as e:
         logger.error(f"Failed to execute query. Error: {e}")
         raise
-    finally:
-        conn.close()
 
     return result
 
 
+def _fetch_columns(
+    query: str,
+    db_path: Path | None,
+    params: Params | None,
+    column_types: Mapping[str, str] | None,
+) -> dict[str, Any]:
+    """Execute a query and return its result as typed columns (see sql_tester.columnar)."""
+    db_path = _default_path(db_path)
+    pool = get_pool(db_path)
+    try:
+        with pool.connection() as conn:
+            types = dict(declared_types(conn, db_path))
+            types.update(
+                (name.lower(), sql_type) for name, sql_type in (column_types or {}).items()
+            )
+            cur = pool.execute(conn, query, params)
+            try:
+                cur.row_factory = None  # plain tuples, transposed with zip
+                rows = cur.fetchall()
+                names = [desc[0] for desc in cur.description or ()]
+            finally:
+                cur.close()
+        columns = rows_to_columns(rows, names, types)
+        logger.info("Executed query successfully.")
+    except Exception as e:
+        logger.error(f"Failed to execute query. Error: {e}")
+        raise
+    return columns
+
+
+def execute_query_df(
+    query: str,
+    db_path: Path | None = None,
+    params: Params | None = None,
+    column_types: Mapping[str, str] | None = None,
+) -> pd.DataFrame:
+    """
+    Execute a query and return its result as a DataFrame with typed columns, built from
+    the cursor column by column instead of from a list of rows.
+
+    Parameters:
+    - query: SQL query to execute, with ? or :name placeholders for the values.
+    - params: Values bound to the placeholders.
+    - column_types: SQL types of result columns whose type cannot be found in the schema by
+      name, e.g. {"transaction_date": "DATE"} for ``date AS transaction_date``.
+
+    Returns:
+    - A DataFrame whose dtypes follow the declared column types: DATE columns are
+      datetime64, INTEGER columns int64, REAL columns float64.
+    """
+    return pd.DataFrame(_fetch_columns(query, db_path, params, column_types), copy=False)
+
+
+def execute_query_arrays(
+    query: str,
+    db_path: Path | None = None,
+    params: Params | None = None,
+    column_types: Mapping[str, str] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Execute a query and return its result as one NumPy array per column, typed like
+    execute_query_df (integer columns with NULLs become float64 with NaN).
+    """
+    return to_numpy_arrays(_fetch_columns(query, db_path, params, column_types))
+
+
+def execute_query_arrow(
+    query: str,
+    db_path: Path | None = None,
+    params: Params | None = None,
+    column_types: Mapping[str, str] | None = None,
+) -> Any:
+    """
+    Execute a query and return its result as a pyarrow Table, typed like execute_query_df.
+    """
+    return to_arrow_table(_fetch_columns(query, db_path, params, column_types))
+
+
+def _iter_batches(
+    query: str,
+    db_path: Path | None,
+    params: Params | None,
+    batch_size: int,
+    plain_rows: bool = False,
+) -> Generator[tuple[list[str], list[Any]], None, None]:
+    """
+    Yield the result of a query as (columns, rows) batches fetched with fetchmany, on a
+    connection borrowed from the pool until the iteration ends or the iterator is closed.
+    """
+    pool = get_pool(_default_path(db_path))
+    with pool.connection(dedicated=True) as conn:
+        cur = pool.execute(conn, query, params)
+        try:
+            if plain_rows:
+                cur.row_factory = None  # tuples are lighter than sqlite3.Row
+            columns = [desc[0] for desc in cur.description or ()]
+            while rows := cur.fetchmany(batch_size):
+                yield columns, rows
+        finally:
+            cur.close()
+
+
+def iter_query(
+    query: str,
+    db_path: Path | None = None,
+    params: Params | None = None,
+    batch_size: int = DEFAULT_FETCH_SIZE,
+) -> Generator[sqlite3.Row, None, None]:
+    """
+    Stream the rows of a query instead of loading them all, for large result sets.
+
+    Parameters:
+    - query: SQL query to execute, with ? or :name placeholders for the values.
+    - params: Values bound to the placeholders.
+    - batch_size: Number of rows fetched from SQLite at a time.
+
+    Returns:
+    - An iterator over the rows. Its connection stays borrowed from the pool until the
+      iterator is exhausted or closed, so close it (or use contextlib.closing) when stopping
+      early.
+    """
+    for _, rows in _iter_batches(query, db_path, params, batch_size):
+        yield from rows
+
+
+def iter_query_batches(
+    query: str,
+    db_path: Path | None = None,
+    params: Params | None = None,
+    batch_size: int = DEFAULT_FETCH_SIZE,
+) -> Generator[list[sqlite3.Row], None, None]:
+    """
+    Stream the rows of a query as lists of at most batch_size rows.
+
+    Parameters:
+    - query: SQL query to execute, with ? or :name placeholders for the values.
+    - params: Values bound to the placeholders.
+    - batch_size: Number of rows in each list, the last one may be shorter.
+    """
+    for _, rows in _iter_batches(query, db_path, params, batch_size):
+        yield rows
+
+
+def iter_query_df(
+    query: str,
+    db_path: Path | None = None,
+    params: Params | None = None,
+    chunk_size: int = DEFAULT_FETCH_SIZE,
+) -> Generator[pd.DataFrame, None, None]:
+    """
+    Stream the result of a query as DataFrames of at most chunk_size rows, so a large table
+    can be processed in constant memory.
+
+    Parameters:
+    - query: SQL query to execute, with ? or :name placeholders for the values.
+    - params: Values bound to the placeholders.
+    - chunk_size: Number of rows of each DataFrame, the last one may be shorter.
+
+    Returns:
+    - An iterator over DataFrames with the query's columns. An empty result yields nothing.
+    """
+    for columns, rows in _iter_batches(query, db_path, params, chunk_size, plain_rows=True):
+        yield pd.DataFrame.from_records(rows, columns=columns)
+
+
 def convert_to_date(date_str: str) -> datetime.date:
     return datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
 
@@ -290,41 +513,37 @@ def initialise_db(local_dir: Path | None = None, from_file: bool = False) -> Pat
             raise FileNotFoundError(f"File not found: {transaction_file}")
 
         # Load data if files exist
-        product_nomenclature_data = pd.read_csv(product_nomenclature_file).to_dict(
-            orient="records"
-        )
-        transaction_data = pd.read_csv(transaction_file).to_dict(orient="records")
+        product_nomenclature_df = pd.read_csv(product_nomenclature_file)
+        transaction_df = pd.read_csv(transaction_file)
     else:
         product_nomenclature_data, transaction_data = fake_it()
-
-    product_nomenclature_data = [
-        {str(k): v for k, v in record.items()} for record in product_nomenclature_data
-    ]
-    transaction_data = [{str(k): v for k, v in record.items()} for record in transaction_data]
-
-    insert_product_nomenclature_sample_data(product_nomenclature_data, db_path)
-    insert_transactions_sample_data(transaction_data, db_path)
+        product_nomenclature_df = pd.DataFrame(product_nomenclature_data)
+        transaction_df = pd.DataFrame(transaction_data)
+
+    # The database is rebuilt from scratch if a crash corrupts it, so the load can be unsafe
+    bulk_insert_data(
+        "PRODUCT_NOMENCLATURE", product_nomenclature_df, db_path, pragmas=FAST_LOAD_PRAGMAS
+    )
+    bulk_insert_data("TRANSACTIONS", transaction_df, db_path, pragmas=FAST_LOAD_PRAGMAS)
     return db_path
 
 
 if __name__ == "__main__":
     db_path = initialise_db()
     logger.info(f"Database initialised: {db_path}")
-    # res = execute_query("SELECT * FROM TRANSACTIONS")
-    # df = pd.DataFrame(res[0], columns=res[1])
-    # df["date"] = df["date"].apply(convert_to_date)
+    # Dates are parsed from the declared DATE type of TRANSACTIONS.date
+    # df = execute_query_df("SELECT * FROM TRANSACTIONS")
     # print(df)
 
     local_dir, _ = get_paths()
     sql_file_path = local_dir / "queries"
     with open(sql_file_path / "revenue_query_with_alias.sql") as sql_file:
         sql_commands = sql_file.read()
-    res = execute_query(sql_commands)
-    df = pd.DataFrame(res[0], columns=res[1])
+    df = execute_query_df(sql_commands, column_types={"transaction_date": "DATE"})
 
     with open(sql_file_path / "client_sales_query.sql") as sql_file:
         sql_commands = sql_file.read()
-    res = execute_query(sql_commands)
-    df = pd.DataFrame(res[0], columns=res[1])
+    df = execute_query_df(sql_commands)
+    close_pools(db_path)
     os.remove(db_path)
     logger.info(f"Database deleted: {db_path}")
@@ -0,0 +1,112 @@
+"""
+Unit tests of the SQLite connection pool used by the dblite helpers.
+
+Usage:
+    python -m unittest sql_tester/tests/connection_pool_test.py
+"""
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Internal imports
+from sql_tester.connection_pool import ConnectionPool, PoolClosedError, close_pools, get_pool
+from sql_tester.dblite import execute_query
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp_dir.name) / "pool.sqlite3"
+        self.pool = ConnectionPool(self.db_path, max_connections=2, timeout=0.1)
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.commit()
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        close_pools()
+        self.tmp_dir.cleanup()
+
+    def test_connection_is_reused(self) -> None:
+        with self.pool.connection() as first:
+            pass
+        with self.pool.connection() as second:
+            # Nested calls of the same thread get the connection it already holds
+            with self.pool.connection() as nested:
+                self.assertIs(nested, second)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.pool.opened, 1)
+
+    def test_threads_get_their_own_connection(self) -> None:
+        barrier = threading.Barrier(2)
+        seen = []
+
+        def work() -> None:
+            with self.pool.connection() as conn:
+                barrier.wait()
+                seen.append(conn)
+                conn.execute("SELECT count(*) FROM items").fetchone()
+
+        threads = [threading.Thread(target=work) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIsNot(seen[0], seen[1])
+        self.assertEqual(self.pool.size, 2)
+
+    def test_pool_size_is_bounded(self) -> None:
+        held = threading.Event()
+        done = threading.Event()
+
+        def hold() -> None:
+            with self.pool.connection():
+                held.set()
+                done.wait()
+
+        threads = [threading.Thread(target=hold) for _ in range(2)]
+        for thread in threads:
+            held.clear()
+            thread.start()
+            held.wait()
+        with self.assertRaises(TimeoutError):
+            with self.pool.connection():
+                pass
+        done.set()
+        for thread in threads:
+            thread.join()
+
+    def test_uncommitted_work_is_rolled_back(self) -> None:
+        with self.pool.connection() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('lost')")
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT count(*) FROM items").fetchone()[0], 0)
+
+    def test_closed_pool(self) -> None:
+        with self.pool.connection() as conn:
+            self.pool.close()
+            conn.execute("SELECT 1")
+
+        self.assertEqual(self.pool.size, 0)
+        with self.assertRaises(PoolClosedError):
+            with self.pool.connection():
+                pass
+
+    def test_dblite_helpers_share_a_pool(self) -> None:
+        execute_query(
+            "INSERT INTO items (name) VALUES ('a')", self.db_path, fetch=False, commit=True
+        )
+        rows, columns = execute_query("SELECT name FROM items", self.db_path)
+        execute_query("SELECT 1", self.db_path)
+
+        self.assertEqual([tuple(row) for row in rows], [("a",)])
+        self.assertEqual(columns, ["name"])
+        self.assertEqual(get_pool(self.db_path).opened, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,382 @@
+"""
+Unit tests of the dblite query helpers on a temporary database.
+
+Usage:
+    python -m unittest sql_tester/tests/dblite_test.py
+"""
+
+import importlib.util
+import sqlite3
+import tempfile
+import tracemalloc
+import unittest
+from collections.abc import Iterator
+from pathlib import Path
+
+# External imports
+import numpy as np
+import pandas as pd
+
+# Internal imports
+from sql_tester.bulk_load import FAST_LOAD_PRAGMAS
+from sql_tester.connection_pool import ConnectionPool, close_pools, get_pool
+from sql_tester.dblite import (
+    bulk_insert_data,
+    execute_query,
+    execute_query_arrays,
+    execute_query_arrow,
+    execute_query_df,
+    iter_query,
+    iter_query_batches,
+    iter_query_df,
+    pooled_connection,
+    statement_cache_stats,
+)
+
+
+class TestExecuteQuery(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp_dir.name) / "dblite.sqlite3"
+        execute_query(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price REAL)",
+            self.db_path,
+            fetch=False,
+        )
+
+    def tearDown(self) -> None:
+        close_pools()
+        self.tmp_dir.cleanup()
+
+    def test_bound_parameters(self) -> None:
+        execute_query(
+            "INSERT INTO items (name, price) VALUES (?, ?)",
+            self.db_path,
+            fetch=False,
+            commit=True,
+            params=[("chair", 50.0), ("mug", 10.0), ("it's", 1.0)],
+            many=True,
+        )
+
+        rows, columns = execute_query(
+            "SELECT name FROM items WHERE price >= :low ORDER BY name",
+            self.db_path,
+            params={"low": 5},
+        )
+        quoted, _ = execute_query(
+            "SELECT id FROM items WHERE name = ?", self.db_path, params=("it's",)
+        )
+
+        self.assertEqual([row["name"] for row in rows], ["chair", "mug"])
+        self.assertEqual(columns, ["name"])
+        self.assertEqual(len(quoted), 1)
+
+    def test_repeated_queries_hit_the_statement_cache(self) -> None:
+        stats = statement_cache_stats(self.db_path)
+        hits, misses = stats.hits, stats.misses
+
+        for product_id in range(10):
+            execute_query(
+                "SELECT name FROM items WHERE id = ?", self.db_path, params=(product_id,)
+            )
+
+        self.assertEqual(stats.misses - misses, 1)
+        self.assertEqual(stats.hits - hits, 9)
+        self.assertGreater(stats.hit_rate, 0.5)
+
+    def test_statement_cache_is_bounded(self) -> None:
+        with ConnectionPool(self.db_path, statement_cache_size=2) as pool:
+            with pool.connection() as conn:
+                for query in ("SELECT 1", "SELECT 2", "SELECT 3", "SELECT 1", "SELECT 3"):
+                    pool.execute(conn, query).close()
+
+        # SELECT 1 was evicted by SELECT 3, which was still cached when run again
+        self.assertEqual((pool.statement_stats.hits, pool.statement_stats.misses), (1, 4))
+
+
+class TestStreamingQueries(unittest.TestCase):
+    N_ROWS = 50_000
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp_dir.name) / "stream.sqlite3"
+        execute_query(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price REAL)",
+            self.db_path,
+            fetch=False,
+        )
+        execute_query(
+            "INSERT INTO items (id, name, price) VALUES (?, ?, ?)",
+            self.db_path,
+            fetch=False,
+            commit=True,
+            params=((i, f"item {i}", i / 10) for i in range(self.N_ROWS)),
+            many=True,
+        )
+
+    def tearDown(self) -> None:
+        close_pools()
+        self.tmp_dir.cleanup()
+
+    def test_rows_and_batches(self) -> None:
+        rows = iter_query("SELECT id, name FROM items WHERE id < ?", self.db_path, params=(2500,))
+        batches = iter_query_batches("SELECT id FROM items", self.db_path, batch_size=20_000)
+
+        self.assertEqual([row["id"] for row in rows], list(range(2500)))
+        self.assertEqual([len(batch) for batch in batches], [20_000, 20_000, 10_000])
+        self.assertEqual(get_pool(self.db_path).size, get_pool(self.db_path).idle)
+
+    def test_dataframe_chunks(self) -> None:
+        chunks = list(iter_query_df("SELECT * FROM items", self.db_path, chunk_size=15_000))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [15_000, 15_000, 15_000, 5_000])
+        self.assertEqual(list(chunks[0].columns), ["id", "name", "price"])
+        self.assertEqual(pd.concat(chunks)["id"].tolist(), list(range(self.N_ROWS)))
+        self.assertEqual(list(iter_query_df("SELECT * FROM items WHERE id < 0", self.db_path)), [])
+
+    def test_closed_iterator_returns_its_connection(self) -> None:
+        pool = get_pool(self.db_path)
+        rows = iter_query("SELECT id FROM items", self.db_path, batch_size=100)
+        next(rows)
+        # Other queries of the same thread run while the iterator is suspended
+        self.assertEqual(
+            execute_query("SELECT count(*) FROM items", self.db_path)[0][0][0], 50_000
+        )
+        self.assertEqual(pool.idle, pool.size - 1)
+
+        rows.close()
+
+        self.assertEqual(pool.idle, pool.size)
+
+    def test_chunks_use_constant_memory(self) -> None:
+        tracemalloc.start()
+        execute_query("SELECT * FROM items", self.db_path)
+        full_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        for _ in iter_query_df("SELECT * FROM items", self.db_path, chunk_size=1000):
+            pass
+        chunked_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        self.assertLess(chunked_peak, full_peak / 5)
+
+
+class TestColumnarQueries(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp_dir.name) / "columnar.sqlite3"
+        execute_query(
+            "CREATE TABLE sales (id INTEGER PRIMARY KEY, date DATE, qty INTEGER, "
+            "price REAL, label TEXT)",
+            self.db_path,
+            fetch=False,
+        )
+        execute_query(
+            "INSERT INTO sales VALUES (?, ?, ?, ?, ?)",
+            self.db_path,
+            fetch=False,
+            commit=True,
+            params=[(1, "2019-01-01", 2, 9.5, "a"), (2, "2019-02-01", None, 1.0, None)],
+            many=True,
+        )
+
+    def tearDown(self) -> None:
+        close_pools()
+        self.tmp_dir.cleanup()
+
+    def test_dtypes_follow_declared_types(self) -> None:
+        df = execute_query_df("SELECT * FROM sales ORDER BY id", self.db_path)
+
+        self.assertEqual(df["id"].dtype, np.int64)
+        self.assertEqual(df["date"].dtype.kind, "M")
+        self.assertEqual(df["date"].iloc[1], pd.Timestamp("2019-02-01"))
+        self.assertEqual(str(df["qty"].dtype), "Int64")
+        self.assertTrue(pd.isna(df["qty"].iloc[1]))
+        self.assertEqual(df["price"].dtype, np.float64)
+        self.assertEqual(df["label"].tolist()[0], "a")
+
+    def test_renamed_and_computed_columns(self) -> None:
+        df = execute_query_df(
+            "SELECT date AS day, price * 2 AS double_price FROM sales WHERE id = ?",
+            self.db_path,
+            params=(1,),
+            column_types={"day": "DATE"},
+        )
+        empty = execute_query_df("SELECT id, date FROM sales WHERE id < 0", self.db_path)
+
+        self.assertEqual(df["day"].dtype.kind, "M")
+        self.assertEqual(df["double_price"].dtype, np.float64)
+        self.assertEqual(list(empty.columns), ["id", "date"])
+        self.assertEqual(len(empty), 0)
+
+    def test_values_not_matching_the_declared_type(self) -> None:
+        execute_query(
+            "INSERT INTO sales VALUES (3, 'unknown', 3, 2.0, 'b')",
+            self.db_path,
+            fetch=False,
+            commit=True,
+        )
+
+        df = execute_query_df(
+            "SELECT label, AVG(qty) AS qty, date FROM sales WHERE qty IS NOT NULL "
+            "GROUP BY label ORDER BY label",
+            self.db_path,
+        )
+
+        self.assertEqual(df["qty"].dtype, np.float64)
+        self.assertEqual(df["qty"].tolist(), [2.0, 3.0])
+        self.assertEqual(df["date"].tolist(), ["2019-01-01", "unknown"])
+
+    def test_database_recreated_at_the_same_path(self) -> None:
+        execute_query_df("SELECT * FROM sales", self.db_path)
+        close_pools(self.db_path)
+        self.db_path.unlink()
+        execute_query("CREATE TABLE sales (date TEXT)", self.db_path, fetch=False)
+        execute_query(
+            "INSERT INTO sales VALUES ('2019-01-01')", self.db_path, fetch=False, commit=True
+        )
+
+        df = execute_query_df("SELECT date FROM sales", self.db_path)
+
+        self.assertEqual(df["date"].tolist(), ["2019-01-01"])
+
+    def test_numpy_arrays(self) -> None:
+        arrays = execute_query_arrays("SELECT id, qty, date FROM sales ORDER BY id", self.db_path)
+
+        self.assertEqual(arrays["id"].tolist(), [1, 2])
+        self.assertTrue(np.isnan(arrays["qty"][1]))
+        self.assertEqual(arrays["date"].dtype.kind, "M")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_arrow_table(self) -> None:
+        table = execute_query_arrow("SELECT id, date, label FROM sales", self.db_path)
+
+        self.assertEqual(str(table.schema.field("id").type), "int64")
+        self.assertTrue(str(table.schema.field("date").type).startswith("timestamp"))
+        self.assertEqual(table.num_rows, 2)
+
+
+class TestBulkInsert(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp_dir.name) / "bulk.sqlite3"
+        execute_query(
+            "CREATE TABLE sales (id INTEGER PRIMARY KEY, date DATE, qty INTEGER, label TEXT)",
+            self.db_path,
+            fetch=False,
+        )
+        execute_query("CREATE INDEX idx_sales_date ON sales(date)", self.db_path, fetch=False)
+
+    def tearDown(self) -> None:
+        close_pools()
+        self.tmp_dir.cleanup()
+
+    def _state(self) -> tuple[list, str]:
+        indexes, _ = execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'index'", self.db_path
+        )
+        (journal_mode,), _ = execute_query("PRAGMA journal_mode", self.db_path)
+        return [row[0] for row in indexes], journal_mode[0]
+
+    def test_dataframe_in_chunks(self) -> None:
+        df = pd.DataFrame(
+            {
+                "id": range(1, 1001),
+                "date": pd.date_range("2019-01-01", periods=1000),
+                "qty": pd.array([None] + list(range(999)), dtype="Int64"),
+                "label": [None] + ["x"] * 999,
+            }
+        )
+
+        inserted = bulk_insert_data(
+            "sales", df, self.db_path, chunk_size=64, pragmas=FAST_LOAD_PRAGMAS
+        )
+        rows, _ = execute_query("SELECT * FROM sales WHERE id IN (1, 2) ORDER BY id", self.db_path)
+
+        self.assertEqual(inserted, 1000)
+        self.assertEqual(
+            [tuple(row) for row in rows],
+            [(1, "2019-01-01", None, None), (2, "2019-01-02", 0, "x")],
+        )
+        self.assertEqual(self._state(), (["idx_sales_date"], "delete"))
+
+    def test_tuples_and_selected_columns(self) -> None:
+        rows = ((f"2019-01-{day:02d}", day) for day in range(1, 31))
+
+        inserted = bulk_insert_data(
+            "sales", rows, self.db_path, columns=["date", "qty"], chunk_size=7, pragmas=None
+        )
+        (total,), _ = execute_query("SELECT count(*), sum(qty) FROM sales", self.db_path)
+
+        self.assertEqual(inserted, 30)
+        self.assertEqual(tuple(total), (30, 465))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_arrow_table(self) -> None:
+        import pyarrow as pa
+
+        table = pa.table({"id": [1, 2], "date": pa.array([0, 1], pa.date32()), "qty": [3, None]})
+
+        bulk_insert_data("sales", table, self.db_path, chunk_size=1)
+        rows, _ = execute_query("SELECT id, date, qty FROM sales ORDER BY id", self.db_path)
+
+        self.assertEqual(
+            [tuple(row) for row in rows], [(1, "1970-01-01", 3), (2, "1970-01-02", None)]
+        )
+
+    def test_table_name_in_another_case(self) -> None:
+        dropped: list[str] = []
+        with pooled_connection(self.db_path) as conn:
+            conn.set_trace_callback(dropped.append)
+            bulk_insert_data("SALES", [(1, "2019-01-01", 1, "a")], self.db_path)
+            conn.set_trace_callback(None)
+
+        self.assertIn('DROP INDEX "idx_sales_date"', dropped)
+        self.assertEqual(self._state(), (["idx_sales_date"], "delete"))
+
+    def test_failed_load_is_rolled_back(self) -> None:
+        rows = [(1, "2019-01-01", 1, "a"), (1, "2019-01-02", 2, "b")]  # duplicate key
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            bulk_insert_data("sales", rows, self.db_path, pragmas=FAST_LOAD_PRAGMAS)
+        (count,), _ = execute_query("SELECT count(*) FROM sales", self.db_path)
+
+        self.assertEqual(count[0], 0)
+        self.assertEqual(self._state(), (["idx_sales_date"], "delete"))
+
+    def test_unique_index_is_kept(self) -> None:
+        execute_query(
+            "CREATE UNIQUE INDEX ux_sales_label ON sales(label)", self.db_path, fetch=False
+        )
+        rows = [(1, "2019-01-01", 1, "a"), (2, "2019-01-02", 2, "a")]  # duplicate label
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            bulk_insert_data("sales", rows, self.db_path)
+        (count,), _ = execute_query("SELECT count(*) FROM sales", self.db_path)
+
+        self.assertEqual(count[0], 0)
+        self.assertEqual(sorted(self._state()[0]), ["idx_sales_date", "ux_sales_label"])
+
+    def test_indexes_survive_an_interrupted_load(self) -> None:
+        def rows() -> Iterator[tuple]:
+            yield (1, "2019-01-01", 1, "a")
+            raise RuntimeError("source failed")
+
+        with self.assertRaises(RuntimeError):
+            bulk_insert_data("sales", rows(), self.db_path, chunk_size=1)
+        (count,), _ = execute_query("SELECT count(*) FROM sales", self.db_path)
+
+        self.assertEqual(count[0], 0)
+        self.assertEqual(self._state(), (["idx_sales_date"], "delete"))
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            bulk_insert_data("missing", [(1,)], self.db_path)
+        with self.assertRaises(ValueError):
+            bulk_insert_data("sales", [(1,)], self.db_path, columns=["id; DROP TABLE sales"])
+        with self.assertRaises(ValueError):
+            bulk_insert_data("sales", [(1,)], self.db_path, pragmas={"writable_schema": "ON"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -25,7 +25,8 @@ import pandas.testing as pdt
 from loguru import logger
 
 # Internal imports
-from sql_tester.dblite import execute_query, initialise_db
+from sql_tester.connection_pool import close_pools
+from sql_tester.dblite import execute_query_df, initialise_db
 
 # import sys
 # sys.path.append(Path(__file__).resolve().parent)
@@ -68,6 +69,7 @@ class TestSQLQueries(unittest.TestCase):
         This method removes the database file to ensure no residual data
         affects subsequent test runs.
         """
+        close_pools(cls.db_path)
         if cls.db_path.exists():
             os.remove(cls.db_path)
             logger.info("Database file removed after testing.")
@@ -83,8 +85,7 @@ class TestSQLQueries(unittest.TestCase):
         with open(sql_file_path) as sql_file:
             sql_commands = sql_file.read()
 
-        res = execute_query(sql_commands, self.db_path)
-        df = pd.DataFrame(res[0], columns=res[1])
+        df = execute_query_df(sql_commands, self.db_path)
         test_csv = self.test_dir / "data" / "revenue_query_with_alias.csv"
         df_test = pd.read_csv(test_csv)
 
@@ -106,8 +107,7 @@ class TestSQLQueries(unittest.TestCase):
         with open(sql_file_path) as sql_file:
             sql_commands = sql_file.read()
 
-        res = execute_query(sql_commands, self.db_path)
-        df = pd.DataFrame(res[0], columns=res[1])
+        df = execute_query_df(sql_commands, self.db_path)
         test_csv = self.test_dir / "data" / "client_sales_query.csv"
         df_test = pd.read_csv(test_csv)
 